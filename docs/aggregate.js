@@ -0,0 +1,103 @@
+/*
+ * Agregações da página interativa (docs/index.html).
+ *
+ * Roda como Web Worker: recebe data.json uma única vez, guarda tudo em typed
+ * arrays contíguos (um bloco por jogador, indexado por `offsets`) e responde a
+ * cada mudança de filtro com KPIs, ranking, ordem da tabela e apenas as séries
+ * que a página ainda não tem desenhadas. Se o navegador não deixar criar o
+ * worker (ex.: página aberta via file://), o mesmo código é carregado como
+ * script comum e exposto em `self.Goal500Agg`.
+ */
+(function (scope) {
+  const GOAL = 500;
+  let P = null;
+
+  function load(data) {
+    const players = data.players;
+    const n = players.length;
+    const offsets = new Int32Array(n + 1);
+    players.forEach((p, i) => { offsets[i + 1] = offsets[i] + p.years.length; });
+    const m = offsets[n];
+    const years = new Int32Array(m);
+    const club = new Int32Array(m);
+    const intl = new Int32Array(m);
+    const totals = { club: new Int32Array(n), international: new Int32Array(n), total: new Int32Array(n) };
+    const firstYear = new Int32Array(n);
+    players.forEach((p, i) => {
+      const o = offsets[i];
+      years.set(p.years, o);
+      club.set(p.club, o);
+      intl.set(p.international, o);
+      totals.club[i] = p.total_club;
+      totals.international[i] = p.total_international;
+      totals.total[i] = p.total;
+      firstYear[i] = p.first_year;
+    });
+    P = { n, offsets, years, club, intl, totals, firstYear };
+    return { players: n, points: m };
+  }
+
+  // Séries [x, y] de um jogador: acumulado e por temporada.
+  function playerSeries(i, kind, xmode) {
+    const o0 = P.offsets[i], o1 = P.offsets[i + 1];
+    const base = xmode === "year" ? 0 : P.firstYear[i];
+    const cum = new Array(o1 - o0);
+    const per = new Array(o1 - o0);
+    let s = 0;
+    for (let k = o0; k < o1; k++) {
+      const v = kind === "club" ? P.club[k]
+        : kind === "international" ? P.intl[k]
+        : P.club[k] + P.intl[k];
+      const x = P.years[k] - base;
+      s += v;
+      cum[k - o0] = [x, s];
+      per[k - o0] = [x, v];
+    }
+    return { cum, per };
+  }
+
+  // q = { type, xmode, selected: [índices na ordem de data.json], need: [índices] }
+  function compute(q) {
+    const tot = P.totals[q.type];
+    let total = 0, seasons = 0, top = -1, chaser = -1;
+    for (const i of q.selected) {
+      const t = tot[i];
+      total += t;
+      seasons += P.offsets[i + 1] - P.offsets[i];
+      if (top < 0 || t > tot[top]) top = i;
+      if (t < GOAL && (chaser < 0 || t > tot[chaser])) chaser = i;
+    }
+    const series = {};
+    for (const i of q.need) series[i] = playerSeries(i, q.type, q.xmode);
+    return {
+      kpis: {
+        total, seasons, count: q.selected.length,
+        top, topTotal: top < 0 ? 0 : tot[top],
+        chaser, chaserTotal: chaser < 0 ? 0 : tot[chaser],
+      },
+      // Ranking em ordem crescente (o eixo de categorias desenha de baixo p/ cima).
+      ranking: q.selected.slice().sort((a, b) => tot[a] - tot[b]).map((i) => [i, tot[i]]),
+      table: q.selected.slice().sort((a, b) => P.totals.total[b] - P.totals.total[a]),
+      series,
+    };
+  }
+
+  function handle(msg) {
+    if (msg.cmd === "load") return load(msg.data);
+    if (msg.cmd === "compute") return compute(msg.query);
+    throw new Error("comando desconhecido: " + msg.cmd);
+  }
+
+  if (typeof WorkerGlobalScope !== "undefined" && scope instanceof WorkerGlobalScope) {
+    scope.onmessage = (e) => {
+      const { id, msg } = e.data;
+      try {
+        scope.postMessage({ id, result: handle(msg) });
+      } catch (err) {
+        scope.postMessage({ id, error: String(err && err.message || err) });
+      }
+    };
+  } else {
+    scope.Goal500Agg = { handle };
+  }
+})(self);
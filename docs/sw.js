@@ -0,0 +1,50 @@
+// Gerado por goal500.site.write_site_data — não edite à mão.
+const CACHE = "goal500-data";
+const DATA_URL = new URL("data.json", self.registration.scope).href;
+const VERSION_URL = new URL("version.json", self.registration.scope).href;
+const VERSION_HEADER = "X-Goal500-Version";
+
+self.addEventListener("install", () => self.skipWaiting());
+self.addEventListener("activate", (event) => event.waitUntil(self.clients.claim()));
+
+self.addEventListener("fetch", (event) => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== "GET" || url.origin + url.pathname !== DATA_URL) return;
+  event.respondWith(staleWhileRevalidate(event));
+});
+
+async function staleWhileRevalidate(event) {
+  const cache = await caches.open(CACHE);
+  const cached = await cache.match(DATA_URL);
+  const refresh = revalidate(cache, cached);
+  if (cached) {
+    event.waitUntil(refresh.catch(() => null));
+    return cached;
+  }
+  try {
+    return (await refresh) || fetch(event.request);
+  } catch (e) {
+    return fetch(event.request);
+  }
+}
+
+async function revalidate(cache, cached) {
+  const res = await fetch(VERSION_URL, { cache: "no-store" });
+  if (!res.ok) throw new Error("version.json HTTP " + res.status);
+  const { version } = await res.json();
+  if (cached && cached.headers.get(VERSION_HEADER) === version) return null;
+
+  // A query string com a versão fura caches intermediários (CDN do Pages).
+  const fresh = await fetch(DATA_URL + "?v=" + version);
+  if (!fresh.ok) throw new Error("data.json HTTP " + fresh.status);
+  const headers = new Headers(fresh.headers);
+  headers.set(VERSION_HEADER, version);
+  const stamped = new Response(await fresh.blob(), { status: 200, headers });
+  await cache.put(DATA_URL, stamped.clone());
+
+  if (cached) {
+    const clients = await self.clients.matchAll({ type: "window" });
+    clients.forEach((c) => c.postMessage({ type: "goal500-data-updated", version }));
+  }
+  return stamped;
+}
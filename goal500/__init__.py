@@ -2,15 +2,40 @@
 goal500 - Extrai dados de gols acumulados por ano de jogadores de futebol da Wikipedia
 """
 
-from goal500.scrapers.wikipedia import get_player_stats
-from goal500.visualization.plots import plot_cumulative_goals, create_animation
-from goal500.site import build_site_data, write_site_data
+import importlib
 
 __version__ = "0.1.0"
+
+# As funções públicas são importadas só no primeiro acesso, para que
+# `import goal500` (e a CLI) não carregue pandas, matplotlib e requests à toa.
+_LAZY_ATTRIBUTES = {
+    "get_player_stats": "goal500.scrapers.wikipedia",
+    "get_player_datasets": "goal500.scrapers.wikipedia",
+    "plot_cumulative_goals": "goal500.visualization.plots",
+    "plot_batch": "goal500.visualization.plots",
+    "create_animation": "goal500.visualization.plots",
+    "build_site_data": "goal500.site",
+    "write_site_data": "goal500.site",
+}
+
 __all__ = [
     "get_player_stats",
+    "get_player_datasets",
     "plot_cumulative_goals",
+    "plot_batch",
     "create_animation",
     "build_site_data",
     "write_site_data",
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
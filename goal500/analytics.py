@@ -0,0 +1,251 @@
+"""
+Consultas analíticas com cache (LRU) indexado pela impressão digital dos dados.
+
+As consultas (top N, totais por tipo, comparação de jogadores e curvas
+acumuladas) recebem o DataFrame bruto, no formato de get_player_stats. O
+resultado de cada consulta fica num cache LRU cuja chave é a consulta, os
+argumentos e uma impressão digital barata do conteúdo do DataFrame: um hash
+vetorizado das linhas (pd.util.hash_pandas_object) somado módulo 2**64,
+junto com o número de linhas e as colunas. A ordem das linhas não muda a
+impressão digital — nenhuma consulta depende dela.
+
+A impressão digital é recalculada a cada consulta (uma passada vetorizada
+pelas linhas, bem mais barata que as consultas): um DataFrame alterado no
+lugar gera outra chave e é recalculado. Os resultados são compartilhados
+entre chamadas e não devem ser alterados.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from goal500.utils.data_processing import clean_data, prepare_visualization_data
+
+GOAL_TYPES = ("club", "international")
+
+
+def fingerprint(df):
+    """
+    Impressão digital do conteúdo de um DataFrame.
+
+    Returns:
+        str: "<linhas>:<colunas>:<hash>", igual para DataFrames com as mesmas
+        linhas em qualquer ordem.
+    """
+    columns = sorted(df.columns)
+    rows = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    # Soma com estouro (módulo 2**64): não depende da ordem das linhas.
+    digest = int(np.add.reduce(rows, dtype=np.uint64)) if len(rows) else 0
+    return f"{len(df)}:{','.join(map(str, columns))}:{digest:016x}"
+
+
+def _sizeof(value):
+    """Estimativa barata, em bytes, do tamanho de um resultado."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(index=True, deep=False).sum()
+                   if isinstance(value, pd.DataFrame) else value.memory_usage(index=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Cache LRU com limite de entradas e de bytes, e contadores de acertos/faltas.
+
+    Args:
+        max_entries (int, optional): número máximo de resultados guardados.
+        max_bytes (int, optional): soma máxima do tamanho estimado dos resultados;
+            um resultado maior que o limite sozinho não é guardado.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        self.bytes = 0
+
+    def get(self, key):
+        """Retorna (True, valor) num acerto e (False, None) numa falta."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        size = _sizeof(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (value, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Contadores e ocupação do cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._data), "bytes": self.bytes,
+                    "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+
+_cache = LRUCache()
+
+
+def cache_info():
+    """Contadores (hits, misses, evictions) e ocupação do cache das consultas."""
+    return _cache.info()
+
+
+def cache_clear():
+    """Esvazia o cache e zera os contadores."""
+    _cache.clear()
+
+
+def configure_cache(max_entries=256, max_bytes=64 * 2**20):
+    """Troca os limites do cache (esvaziando-o)."""
+    global _cache
+    _cache = LRUCache(max_entries, max_bytes)
+
+
+def _cached(query, data, args, compute):
+    key = (query, fingerprint(data), args)
+    hit, value = _cache.get(key)
+    if hit:
+        return value
+    value = compute()
+    _cache.put(key, value)
+    return value
+
+
+def totals_by_type(data):
+    """
+    Gols de clube, de seleção e totais de cada jogador.
+
+    Args:
+        data (pd.DataFrame): DataFrame bruto com colunas name/year/total/type.
+
+    Returns:
+        pd.DataFrame: índice 'name', colunas 'club', 'international' e 'total'
+        (inteiros), ordenado por total (desc) e nome.
+    """
+    def compute():
+        clean = clean_data(data.copy())
+        table = (
+            clean.groupby(["name", "type"])["total"].sum()
+            .unstack("type", fill_value=0)
+            .reindex(columns=list(GOAL_TYPES), fill_value=0)
+            .astype(np.int64)
+        )
+        table["total"] = table["club"] + table["international"]
+        table.columns.name = None
+        return table.reset_index().sort_values(["total", "name"], ascending=[False, True],
+                                               kind="stable").set_index("name")
+
+    return _cached("totals_by_type", data, (), compute)
+
+
+def top_players(data, n=10, kind="total"):
+    """
+    Os N jogadores com mais gols.
+
+    Args:
+        data (pd.DataFrame): DataFrame bruto.
+        n (int, optional): quantos jogadores.
+        kind (str, optional): "total", "club" ou "international".
+
+    Returns:
+        list: dicionários {"name", "total"}, do maior para o menor (empates por nome).
+    """
+    if kind not in ("total", *GOAL_TYPES):
+        raise ValueError(f"Tipo inválido: {kind!r} (use total, club ou international).")
+
+    def compute():
+        column = totals_by_type(data)[kind]
+        ordered = column.reset_index().sort_values([kind, "name"], ascending=[False, True],
+                                                    kind="stable").head(n)
+        return [{"name": name, "total": int(total)} for name, total in zip(ordered["name"], ordered[kind])]
+
+    return _cached("top_players", data, (n, kind), compute)
+
+
+def cumulative_curves(data):
+    """
+    Gols acumulados por jogador e ano (prepare_visualization_data), com cache.
+
+    Returns:
+        pd.DataFrame: colunas name, year, total, years_active, cumulative_goals
+        e player_label.
+    """
+    return _cached("cumulative_curves", data, (),
+                   lambda: prepare_visualization_data(data.copy()))
+
+
+def compare_players(data, names):
+    """
+    Compara jogadores lado a lado.
+
+    Args:
+        data (pd.DataFrame): DataFrame bruto.
+        names (list): jogadores a comparar, na ordem desejada.
+
+    Returns:
+        list: um dicionário por jogador com name, club, international, total,
+        seasons, first_year, last_year, best_year, best_year_goals e
+        goals_per_season.
+
+    Raises:
+        ValueError: jogadores que não estão nos dados.
+    """
+    names = tuple(names)
+
+    def compute():
+        totals = totals_by_type(data)
+        unknown = [name for name in names if name not in totals.index]
+        if unknown:
+            raise ValueError(f"Jogadores desconhecidos: {', '.join(unknown)}.")
+        curves = cumulative_curves(data)
+        rows = []
+        for name in names:
+            yearly = curves[curves["name"] == name]
+            best = yearly.loc[yearly["total"].idxmax()]
+            seasons = len(yearly)
+            total = int(totals.at[name, "total"])
+            rows.append({
+                "name": name,
+                "club": int(totals.at[name, "club"]),
+                "international": int(totals.at[name, "international"]),
+                "total": total,
+                "seasons": seasons,
+                "first_year": int(yearly["year"].min()),
+                "last_year": int(yearly["year"].max()),
+                "best_year": int(best["year"]),
+                "best_year_goals": int(best["total"]),
+                "goals_per_season": total / seasons,
+            })
+        return rows
+
+    return _cached("compare_players", data, names, compute)
@@ -0,0 +1,408 @@
+"""
+Benchmarks das etapas do pacote com dados sintéticos (`goal500 bench`).
+
+Gera, a partir de uma semente, estatísticas de N jogadores com carreiras de
+tamanho configurável e páginas HTML no formato da Wikipedia, mede cada etapa
+com repetições (tempo) e numa execução separada com tracemalloc (pico de
+memória), grava os resultados em JSON e compara com uma linha de base.
+"""
+
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from goal500 import __version__
+
+# Etapas medidas, na ordem do relatório.
+STAGES = (
+    "parse_html",
+    "clean_data",
+    "calculate_cumulative_goals",
+    "build_site_data",
+    "plot_cumulative_goals",
+    "create_animation",
+)
+
+# Páginas HTML sintéticas analisadas por tamanho (o parser mede por página,
+# não precisa de uma página por jogador).
+MAX_PAGES = 50
+
+
+def parse_size(text):
+    """Converte tamanhos como "10", "1k" ou "2m" em inteiros."""
+    text = str(text).strip().lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def synthetic_stats(n_players, career=(8, 20), seed=0):
+    """
+    Gera estatísticas sintéticas no formato de get_player_stats.
+
+    Cada jogador tem uma carreira de `career[0]` a `career[1]` temporadas, com
+    gols de clube e de seleção sorteados por temporada.
+
+    Args:
+        n_players (int): número de jogadores.
+        career (tuple, optional): tamanho mínimo e máximo da carreira, em anos.
+        seed (int, optional): semente do gerador.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'name', 'year', 'total' e 'type'.
+    """
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(career[0], career[1] + 1, n_players)
+    first_year = rng.integers(1995, 2015, n_players)
+    player = np.repeat(np.arange(n_players), lengths)
+    offset = np.arange(len(player)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    years = first_year[player] + offset
+    names = np.array([f"Jogador {i:06d}" for i in range(n_players)])[player]
+
+    club = pd.DataFrame({"name": names, "year": years,
+                         "total": rng.poisson(22, len(player)), "type": "club"})
+    international = pd.DataFrame({"name": names, "year": years,
+                                  "total": rng.poisson(5, len(player)), "type": "international"})
+    return pd.concat([club, international], ignore_index=True)
+
+
+def synthetic_wikipedia_html(seasons=20, seed=0):
+    """
+    Gera uma página HTML com as tabelas "Career statistics" no formato da Wikipedia.
+
+    A tabela de clube tem cabeçalho em dois níveis (League/Cup/Continental/Total
+    x Apps/Goals) e linhas de subtotal; a de seleção tem as colunas Year/Apps/Goals.
+
+    Args:
+        seasons (int, optional): número de temporadas (linhas) de cada tabela.
+        seed (int, optional): semente do gerador.
+
+    Returns:
+        str: o HTML da página.
+    """
+    rng = np.random.default_rng(seed)
+    groups = ["League", "Cup", "Continental"]
+    head = ('<tr><th rowspan="2">Club</th><th rowspan="2">Season</th>'
+            + "".join(f'<th colspan="2">{g}</th>' for g in groups + ["Total"]) + "</tr>"
+            + "<tr>" + "<th>Apps</th><th>Goals</th>" * (len(groups) + 1) + "</tr>")
+    rows = []
+    for i in range(seasons):
+        apps = rng.integers(0, 40, len(groups))
+        goals = rng.integers(0, 30, len(groups))
+        cells = "".join(f"<td>{a}</td><td>{g}</td>" for a, g in zip(apps, goals))
+        note = "[a]" if i % 7 == 3 else ""
+        rows.append(f"<tr><td>Clube {i // 4}</td><td>{2000 + i}–{(i + 1) % 100:02d}</td>{cells}"
+                    f"<td>{apps.sum()}</td><td>{goals.sum()}{note}</td></tr>")
+        if i % 4 == 3:
+            rows.append(f'<tr><th colspan="2">Total</th>{"<td>0</td>" * 8}</tr>')
+    club = f'<table class="wikitable">{head}{"".join(rows)}</table>'
+
+    intl_rows = "".join(
+        f"<tr><td>Seleção</td><td>{2000 + i}</td><td>{rng.integers(0, 15)}</td>"
+        f"<td>{rng.integers(0, 10)}</td></tr>"
+        for i in range(seasons)
+    )
+    international = ('<table class="wikitable"><tr><th>National team</th><th>Year</th>'
+                     f"<th>Apps</th><th>Goals</th></tr>{intl_rows}"
+                     '<tr><th colspan="2">Total</th><td>0</td><td>0</td></tr></table>')
+    return (f"<html><body><h2>Career statistics</h2><h3>Club</h3>{club}"
+            f"<h3>International</h3>{international}</body></html>")
+
+
+def _stage_functions(data, pages, tmpdir):
+    """Funções sem argumentos de cada etapa, já com os dados de entrada prontos."""
+    from goal500.scrapers.wikipedia import parse_career_tables
+    from goal500.site import build_site_data
+    from goal500.utils.data_processing import calculate_cumulative_goals, clean_data
+
+    clean = clean_data(data.copy())
+
+    def parse_html():
+        for page in pages:
+            parse_career_tables(page)
+
+    def plot():
+        from goal500.visualization.plots import plot_cumulative_goals
+
+        plot_cumulative_goals(data).canvas.draw()
+
+    def animate():
+        from goal500.visualization.plots import create_animation
+
+        create_animation(data, os.path.join(tmpdir, "bench.gif"), duration=1)
+
+    return {
+        "parse_html": parse_html,
+        "clean_data": lambda: clean_data(data.copy()),
+        "calculate_cumulative_goals": lambda: calculate_cumulative_goals(clean),
+        "build_site_data": lambda: build_site_data(data),
+        "plot_cumulative_goals": plot,
+        "create_animation": animate,
+    }
+
+
+def measure(func, repeats=3, memory=True):
+    """
+    Mede uma função: tempo de `repeats` execuções e, à parte, o pico de memória.
+
+    O pico vem de uma execução extra sob tracemalloc, para que o custo do
+    rastreamento não entre nos tempos. Se o rastreamento já estava ligado, ele
+    continua ligado ao final e o pico é medido acima da memória já rastreada.
+
+    Returns:
+        dict: min_s, median_s, mean_s, repeats e peak_mb (None sem `memory`).
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func()
+            peak_mb = (tracemalloc.get_traced_memory()[1] - baseline) / 2**20
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    return {"min_s": min(times), "median_s": statistics.median(times),
+            "mean_s": statistics.fmean(times), "repeats": repeats, "peak_mb": peak_mb}
+
+
+def _over_budget(entry, last, budget, minimum=0.0):
+    """
+    Medição pulada, se o tempo estimado para `entry` passa de `budget` segundos.
+
+    A estimativa é o tempo da última medição da mesma etapa (`last`: etapa ->
+    (jogadores, mediana)) extrapolado linearmente, e nunca fica abaixo de
+    `minimum`, um limite inferior conhecido antes de medir (que vale também
+    para o primeiro tamanho).
+
+    Returns:
+        dict or None: o resultado pulado (tempos None e "skipped" com o
+        motivo), ou None se a medição cabe no orçamento.
+    """
+    estimate = minimum
+    if entry["stage"] in last:
+        previous_players, previous_median = last[entry["stage"]]
+        estimate = max(estimate, previous_median * entry["players"] / previous_players)
+    if estimate <= budget:
+        return None
+    print(f"Pulando {entry['stage']} com {entry['players']} jogadores "
+          f"(estimativa {estimate:.0f} s > {budget:.0f} s)")
+    return {**entry, "min_s": None, "median_s": None, "mean_s": None, "repeats": 0,
+            "peak_mb": None, "skipped": f"estimativa de {estimate:.0f} s acima do limite"}
+
+
+def _meta(seed, career, budget, **extra):
+    """Metadados comuns dos resultados (versões, data, semente e orçamento)."""
+    return {
+        "goal500": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seed": seed,
+        "career": list(career),
+        **extra,
+        "budget_s": budget,
+    }
+
+
+def run_benchmarks(sizes=(10, 1_000), stages=STAGES, repeats=3, career=(8, 20), seed=0,
+                   memory=True, budget=60.0):
+    """
+    Executa os benchmarks para cada tamanho e etapa.
+
+    Os tamanhos rodam em ordem crescente. Antes de medir uma etapa num tamanho
+    maior, o tempo do tamanho anterior é extrapolado linearmente; se a
+    estimativa passar de `budget` segundos, a medição é pulada e registrada
+    como tal (etapas quadráticas não travam o benchmark em 100k jogadores).
+
+    Args:
+        sizes (iterable, optional): números de jogadores.
+        stages (iterable, optional): etapas a medir (subconjunto de STAGES).
+        repeats (int, optional): repetições cronometradas por etapa.
+        career (tuple, optional): tamanho mínimo e máximo das carreiras.
+        seed (int, optional): semente dos dados sintéticos.
+        memory (bool, optional): mede também o pico de memória.
+        budget (float, optional): tempo máximo estimado por execução, em segundos.
+
+    Returns:
+        dict: {"meta": {...}, "results": [{"stage", "players", "rows", "min_s", ...}]}.
+        Medições puladas têm "skipped" com o motivo e tempos None.
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Etapas desconhecidas: {', '.join(sorted(unknown))}.")
+
+    results = []
+    last = {}  # etapa -> (jogadores, mediana) da última medição feita
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_players in sorted(sizes):
+            data = synthetic_stats(n_players, career, seed)
+            pages = [synthetic_wikipedia_html(career[1], seed + i)
+                     for i in range(min(n_players, MAX_PAGES))]
+            functions = _stage_functions(data, pages, tmpdir)
+            for stage in STAGES:
+                if stage not in stages:
+                    continue
+                rows = len(pages) if stage == "parse_html" else len(data)
+                entry = {"stage": stage, "players": n_players, "rows": rows}
+
+                skipped = _over_budget(entry, last, budget)
+                if skipped:
+                    results.append(skipped)
+                    continue
+
+                print(f"Medindo {stage} com {n_players} jogadores...")
+                result = measure(functions[stage], repeats, memory)
+                last[stage] = (n_players, result["median_s"])
+                results.append({**entry, **result})
+
+    return {"meta": _meta(seed, career, budget, repeats=repeats), "results": results}
+
+
+def _rows(data):
+    """Linhas (name, type, year, total) ordenadas, para comparar extrações."""
+    return sorted(zip(data["name"], data["type"], data["year"].astype(int), data["total"].astype(int)))
+
+
+def run_scrape_benchmark(sizes=(100,), workers=(1, 8), latency=0.05, error_rate=0.0,
+                         career=(8, 20), seed=0, budget=60.0):
+    """
+    Mede get_player_stats de ponta a ponta contra a Wikipedia local.
+
+    O orçamento segue run_benchmarks; além da extrapolação do tamanho anterior,
+    a latência do servidor dá um tempo mínimo (páginas x latency / workers),
+    que já pode pular o primeiro tamanho.
+
+    Para cada tamanho, gera as páginas dos jogadores sintéticos, sobe o servidor
+    de goal500.bench_fixtures com a latência e a taxa de respostas 429
+    pedidas e extrai todos os jogadores com cada número de workers. Cada
+    execução confere se os dados extraídos são os dados gerados.
+
+    Args:
+        sizes (iterable, optional): números de jogadores (páginas).
+        workers (iterable, optional): números de workers medidos.
+        latency (float, optional): atraso de cada resposta do servidor, em segundos.
+        error_rate (float, optional): fração das respostas com 429.
+        career (tuple, optional): tamanho mínimo e máximo das carreiras.
+        seed (int, optional): semente dos dados e das falhas.
+        budget (float, optional): tempo máximo estimado por execução, em segundos.
+
+    Returns:
+        dict: como run_benchmarks, com a etapa "scrape_w<workers>" e, por
+        medição, pages_per_s, requests (incluindo novas tentativas) e correct.
+    """
+    import contextlib
+    import io
+
+    from goal500.scrapers.wikipedia import get_player_stats
+    from goal500 import bench_fixtures
+
+    results = []
+    last = {}
+    for n_players in sorted(sizes):
+        data = synthetic_stats(n_players, career, seed)
+        names = data["name"].unique()
+        titles = [name.replace(" ", "_") for name in names]
+        pages = bench_fixtures.fixture_pages(data, pd.DataFrame({"name": names, "link": titles}))
+        expected = _rows(data)
+        for n_workers in workers:
+            stage = f"scrape_w{n_workers}"
+            entry = {"stage": stage, "players": n_players, "rows": n_players, "workers": n_workers}
+            # Cada página custa ao menos uma resposta com `latency`, dividida entre os workers.
+            skipped = _over_budget(entry, last, budget, minimum=n_players * latency / n_workers)
+            if skipped:
+                results.append(skipped)
+                continue
+
+            print(f"Medindo {stage} com {n_players} jogadores...")
+            with bench_fixtures.running(pages, latency=latency, error_rate=error_rate,
+                                        seed=seed) as wiki:
+                players = pd.DataFrame({"name": names, "link": [bench_fixtures.page_link(
+                    wiki.base_url, title) for title in titles]})
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    scraped = get_player_stats(workers=n_workers, retries=10, players=players)
+                elapsed = time.perf_counter() - start
+                requests_made = wiki.stats()["requests"]
+
+            correct = _rows(scraped) == expected
+            last[stage] = (n_players, elapsed)
+            results.append({**entry, "min_s": elapsed, "median_s": elapsed, "mean_s": elapsed,
+                            "repeats": 1, "peak_mb": None, "pages_per_s": n_players / elapsed,
+                            "requests": requests_made, "correct": correct})
+
+    return {"meta": _meta(seed, career, budget, latency_s=latency, error_rate=error_rate),
+            "results": results}
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compara resultados com uma linha de base pela mediana de cada (etapa, jogadores).
+
+    Args:
+        results (dict): saída de run_benchmarks.
+        baseline (dict): saída de run_benchmarks gravada anteriormente.
+        threshold (float, optional): aumento relativo tolerado (0.2 = 20%).
+
+    Returns:
+        list: um dicionário por medição presente nas duas execuções, com
+        stage, players, baseline_s, median_s, ratio e regression.
+    """
+    previous = {(r["stage"], r["players"]): r for r in baseline.get("results", [])}
+    rows = []
+    for result in results["results"]:
+        base = previous.get((result["stage"], result["players"]))
+        if base is None or result["median_s"] is None or base["median_s"] is None:
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        rows.append({"stage": result["stage"], "players": result["players"],
+                     "baseline_s": base["median_s"], "median_s": result["median_s"],
+                     "ratio": ratio, "regression": ratio > 1 + threshold})
+    return rows
+
+
+def print_report(results, comparison=None):
+    """Imprime a tabela de resultados (e a comparação com a linha de base, se houver)."""
+    versus = {(row["stage"], row["players"]): row for row in comparison or []}
+    print(f"{'etapa':<28}{'jogadores':>10}{'linhas':>10}{'mediana (s)':>13}"
+          f"{'mín (s)':>10}{'pico (MB)':>11}{'vs base':>10}")
+    for r in results["results"]:
+        if r["median_s"] is None:
+            print(f"{r['stage']:<28}{r['players']:>10}{r['rows']:>10}  pulado: {r['skipped']}")
+            continue
+        peak = f"{r['peak_mb']:.1f}" if r["peak_mb"] is not None else "-"
+        row = versus.get((r["stage"], r["players"]))
+        mark = f"{row['ratio']:.2f}x{' !' if row['regression'] else ''}" if row else "-"
+        print(f"{r['stage']:<28}{r['players']:>10}{r['rows']:>10}{r['median_s']:>13.4f}"
+              f"{r['min_s']:>10.4f}{peak:>11}{mark:>10}")
+
+
+def save_results(results, output_file):
+    """Grava os resultados em JSON."""
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+        fh.write("\n")
+
+
+def load_results(path):
+    """Lê resultados (ou uma linha de base) gravados por save_results."""
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
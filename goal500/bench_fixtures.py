@@ -0,0 +1,423 @@
+"""
+Servidor HTTP local que imita a Wikipedia, para benchmarks e testes do scraper.
+
+Usado por goal500.bench (run_scrape_benchmark) e pelos testes. Serve páginas
+de jogadores a partir de um dicionário título -> HTML (as fixtures dos
+testes, em goal500/tests/fixtures/wikipedia, ou páginas geradas com
+render_player_page) nos mesmos caminhos da Wikipedia:
+
+- ``/wiki/<título>``: o HTML da página, com ETag (revalidação com
+  ``If-None-Match`` recebe 304);
+- ``/w/api.php?action=parse&page=<título>&format=json``: o HTML da página no
+  formato da API do MediaWiki (``parse.text["*"]``, com ``revid``);
+- ``/w/api.php?action=query&prop=revisions&titles=A|B&format=json``: a
+  revisão atual de cada página, com ``normalized`` (sublinhados viram
+  espaços) e, com ``redirects=1``, ``redirects`` (redirecionamentos seguidos).
+
+Redirecionamentos (set_redirect) são servidos como na Wikipedia: o caminho
+do redirecionamento devolve o HTML da página de destino.
+
+Para testar o scraper sob condições reais, o servidor pode atrasar cada
+resposta (``latency`` mais um sorteio de até ``jitter`` segundos) e responder
+uma fração das requisições com 429 (com Retry-After) ou 503. Os sorteios usam
+uma semente, e os contadores de requisições por status ficam em stats().
+
+As fixtures não são páginas gravadas da Wikipedia: são geradas a partir de
+data/player_stats.csv no formato das tabelas "Career statistics" (cabeçalho em
+dois níveis, linhas de subtotal, notas nas células). A divisão dos gols entre
+liga, copa e competições continentais, as partidas e os nomes dos clubes são
+fictícios; os gols totais por temporada e as datas de nascimento são reais.
+
+Uso: python -m goal500.bench_fixtures --fixtures goal500/tests/fixtures/wikipedia --latency 0.1
+e depois goal500 extract --base-url http://127.0.0.1:8001.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from goal500.scrapers.wikipedia import page_title
+
+# Datas de nascimento dos jogadores acompanhados (infobox, <span class="bday">).
+BIRTH_DATES = {
+    "Cristiano Ronaldo": "1985-02-05",
+    "Lionel Messi": "1987-06-24",
+    "Robert Lewandowski": "1988-08-21",
+    "Neymar Jr": "1992-02-05",
+    "Erling Haaland": "2000-07-21",
+    "Kylian Mbappé": "1998-12-20",
+    "Harry Kane": "1993-07-28",
+    "Luis Suárez": "1987-01-24",
+}
+
+COMPETITIONS = ("League", "Cup", "Continental", "Other")
+
+
+def _split_goals(total, year):
+    """Divide os gols de uma temporada entre as competições (fictício, mas determinístico)."""
+    cup = total // 8
+    continental = total // 5 if year % 3 else 0
+    other = 1 if total > 40 and year % 2 else 0
+    return [total - cup - continental - other, cup, continental, other]
+
+
+def render_player_page(name, stats, birth_date=None):
+    """
+    Gera a página de um jogador no formato da Wikipedia.
+
+    Args:
+        name (str): nome do jogador.
+        stats (pd.DataFrame): linhas do jogador no formato de get_player_stats
+            (year, total, type); cada linha vira uma linha da tabela, na ordem.
+        birth_date (str, optional): data de nascimento (AAAA-MM-DD) no infobox.
+
+    Returns:
+        str: o HTML da página.
+    """
+    infobox = ""
+    if birth_date:
+        infobox = ('<table class="infobox vcard"><tr><th>Date of birth</th><td>'
+                   f'<span style="display:none">(<span class="bday">{birth_date}</span>)</span>'
+                   f"{birth_date}</td></tr></table>")
+
+    head = ('<tr><th rowspan="2">Club</th><th rowspan="2">Season</th>'
+            + "".join(f'<th colspan="2">{c}</th>' for c in COMPETITIONS + ("Total",)) + "</tr>"
+            + "<tr>" + "<th>Apps</th><th>Goals</th>" * (len(COMPETITIONS) + 1) + "</tr>")
+    rows = []
+    club = stats[stats["type"] == "club"]
+    for i, (year, total) in enumerate(zip(club["year"].astype(int), club["total"].astype(int))):
+        goals = _split_goals(total, year)
+        apps = [25 + year % 13, 3 + year % 4, 6 + year % 5 if goals[2] else 0, 1 if goals[3] else 0]
+        cells = "".join(f"<td>{a}</td><td>{g}</td>" for a, g in zip(apps, goals))
+        note = "[a]" if i % 5 == 2 else ""
+        rows.append(f"<tr><td>Club {i // 5 + 1}</td><td>{year}–{(year + 1) % 100:02d}</td>{cells}"
+                    f"<td>{sum(apps)}</td><td>{total}{note}</td></tr>")
+        if i % 5 == 4:
+            rows.append(f'<tr><th colspan="2">Total</th>{"<td>0</td>" * 10}</tr>')
+    rows.append(f'<tr><th colspan="2">Career total</th>{"<td>0</td>" * 10}</tr>')
+    club_table = f'<table class="wikitable">{head}{"".join(rows)}</table>'
+
+    international = stats[stats["type"] == "international"]
+    intl_rows = "".join(
+        f"<tr><td>National team</td><td>{year}</td><td>{8 + year % 7}</td><td>{total}</td></tr>"
+        for year, total in zip(international["year"].astype(int), international["total"].astype(int))
+    )
+    intl_table = ('<table class="wikitable"><tr><th>National team</th><th>Year</th>'
+                  f"<th>Apps</th><th>Goals</th></tr>{intl_rows}"
+                  '<tr><th colspan="2">Total</th><td>0</td><td>0</td></tr></table>')
+
+    return (f"<!DOCTYPE html><html><head><title>{escape(name)} - Wikipedia</title></head><body>"
+            f"<h1>{escape(name)}</h1>{infobox}<h2>Career statistics</h2><h3>Club</h3>{club_table}"
+            f"<h3>International</h3>{intl_table}</body></html>\n")
+
+
+def fixture_pages(stats, players):
+    """
+    Gera as páginas dos jogadores (título -> HTML).
+
+    Args:
+        stats (pd.DataFrame): dados no formato de get_player_stats.
+        players (pd.DataFrame): colunas name e link (ex.: get_active_players()).
+    """
+    by_name = dict(tuple(stats.groupby("name", sort=False)))
+    pages = {}
+    for name, link in zip(players["name"], players["link"]):
+        player_stats = by_name.get(name, stats.iloc[:0])
+        pages[page_title(link)] = render_player_page(name, player_stats, BIRTH_DATES.get(name))
+    return pages
+
+
+def write_fixtures(pages, directory):
+    """Grava as páginas como <título>.html em `directory`."""
+    os.makedirs(directory, exist_ok=True)
+    for title, html in pages.items():
+        with open(os.path.join(directory, f"{title}.html"), "w", encoding="utf-8") as fh:
+            fh.write(html)
+
+
+def load_fixtures(directory):
+    """Lê as páginas gravadas por write_fixtures (título -> HTML)."""
+    pages = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".html"):
+            with open(os.path.join(directory, filename), encoding="utf-8") as fh:
+                pages[filename[:-len(".html")]] = fh.read()
+    return pages
+
+
+class FakeWikipedia:
+    """
+    Estado do servidor: páginas, revisões, injeção de falhas e contadores.
+
+    Args:
+        pages (dict): título (com sublinhados) -> HTML.
+        latency (float, optional): atraso fixo de cada resposta, em segundos.
+        jitter (float, optional): atraso extra sorteado entre 0 e `jitter`.
+        error_rate (float, optional): fração das requisições respondidas com 429.
+        server_error_rate (float, optional): fração respondida com 503.
+        retry_after (float, optional): valor do Retry-After das respostas 429.
+        seed (int, optional): semente dos sorteios.
+    """
+
+    def __init__(self, pages, latency=0.0, jitter=0.0, error_rate=0.0, server_error_rate=0.0,
+                 retry_after=0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.server_error_rate = server_error_rate
+        self.retry_after = retry_after
+        self.base_url = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._next_revid = 1000
+        self._counts = {}
+        self._in_flight = self._max_in_flight = 0
+        for title, html in pages.items():
+            self.set_page(title, html)
+
+    def set_page(self, title, html):
+        """Cria ou altera uma página (nova revisão e novo ETag)."""
+        title = title.replace(" ", "_")
+        body = html.encode("utf-8")
+        with self._lock:
+            self._next_revid += 1
+            previous = self._pages.get(title)
+            self._pages[title] = {
+                "body": body,
+                "revid": self._next_revid,
+                "pageid": previous["pageid"] if previous else len(self._pages) + 1,
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "etag": f'"{self._next_revid}-{hashlib.sha256(body).hexdigest()[:12]}"',
+            }
+
+    def set_redirect(self, title, target):
+        """Cria uma página que redireciona para `target` (com revisão própria, fixa)."""
+        target = target.replace(" ", "_")
+        self.set_page(title, f"#REDIRECT [[{target.replace('_', ' ')}]]")
+        with self._lock:
+            self._pages[title.replace(" ", "_")]["redirect"] = target
+
+    def _resolve(self, title):
+        """Segue redirecionamentos; retorna (título final, página ou None)."""
+        title = title.replace(" ", "_")
+        page = self._pages.get(title)
+        for _ in range(10):
+            if page is None or "redirect" not in page:
+                break
+            title = page["redirect"]
+            page = self._pages.get(title)
+        return title, page
+
+    def stats(self):
+        """Contadores: requisições, respostas por status e máximo de requisições simultâneas."""
+        with self._lock:
+            return {"requests": sum(self._counts.values()), "status": dict(self._counts),
+                    "max_in_flight": self._max_in_flight}
+
+    def _draw_fault(self):
+        with self._lock:
+            draw = self._random.random()
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if draw < self.error_rate:
+            return 429, delay
+        if draw < self.error_rate + self.server_error_rate:
+            return 503, delay
+        return None, delay
+
+    def handle(self, path, query, headers):
+        """
+        Responde uma requisição GET.
+
+        Returns:
+            tuple: (status, cabeçalhos, corpo em bytes).
+        """
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        status = 500
+        try:
+            fault, delay = self._draw_fault()
+            if delay:
+                time.sleep(delay)
+            if fault == 429:
+                status, extra, body = 429, {"Retry-After": str(self.retry_after)}, b"Too Many Requests"
+            elif fault == 503:
+                status, extra, body = 503, {}, b"Service Unavailable"
+            elif path.startswith("/wiki/"):
+                status, extra, body = self._page(unquote(path[len("/wiki/"):]), headers)
+            elif path == "/w/api.php":
+                status, extra, body = self._api(parse_qs(query))
+            else:
+                status, extra, body = 404, {}, b"Not Found"
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._counts[status] = self._counts.get(status, 0) + 1
+        return status, extra, body
+
+    def _page(self, title, headers):
+        with self._lock:
+            _, page = self._resolve(title)
+        if page is None:
+            return 404, {}, b"Not Found"
+        extra = {"ETag": page["etag"], "Content-Type": "text/html; charset=UTF-8",
+                 "Cache-Control": "private, s-maxage=0, max-age=0, must-revalidate"}
+        if page["etag"] in headers.get("If-None-Match", ""):
+            return 304, extra, b""
+        return 200, extra, page["body"]
+
+    def _api(self, params):
+        action = params.get("action", [""])[0]
+        if action == "parse":
+            title = params.get("page", [""])[0].replace(" ", "_")
+            with self._lock:
+                page = self._pages.get(title)
+            if page is None:
+                result = {"error": {"code": "missingtitle",
+                                    "info": "The page you specified doesn't exist."}}
+            else:
+                result = {"parse": {"title": title.replace("_", " "), "pageid": page["pageid"],
+                                    "revid": page["revid"],
+                                    "text": {"*": page["body"].decode("utf-8")}}}
+        elif action == "query":
+            titles = params.get("titles", [""])[0].split("|")
+            follow = params.get("redirects", ["0"])[0] not in ("0", "")
+            pages, normalized, redirects = {}, [], []
+            with self._lock:
+                for missing, title in enumerate(titles, start=1):
+                    name = title.replace("_", " ")
+                    if name != title:
+                        normalized.append({"from": title, "to": name})
+                    page = self._pages.get(title.replace(" ", "_"))
+                    if follow and page is not None and "redirect" in page:
+                        target, page = self._resolve(title)
+                        redirects.append({"from": name, "to": target.replace("_", " ")})
+                        name = target.replace("_", " ")
+                    if page is None:
+                        pages[str(-missing)] = {"ns": 0, "title": name, "missing": ""}
+                    else:
+                        pages[str(page["pageid"])] = {
+                            "pageid": page["pageid"], "ns": 0, "title": name,
+                            "revisions": [{"revid": page["revid"], "timestamp": page["timestamp"]}],
+                        }
+            query = {"pages": pages}
+            if normalized:
+                query["normalized"] = normalized
+            if redirects:
+                query["redirects"] = redirects
+            result = {"batchcomplete": "", "query": query}
+        else:
+            result = {"error": {"code": "badvalue",
+                                "info": f'Unrecognized value for parameter "action": {action}.'}}
+        body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        return 200, {"Content-Type": "application/json; charset=utf-8"}, body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "fake-wikipedia"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        status, extra, body = self.server.wiki.handle(url.path, url.query, self.headers)
+        self.send_response(status)
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _Server(ThreadingHTTPServer):
+    # Muitos workers conectando ao mesmo tempo não cabem na fila padrão (5).
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_server(pages, host="127.0.0.1", port=0, verbose=False, **options):
+    """
+    Cria o servidor (sem iniciá-lo).
+
+    Args:
+        pages (dict): título -> HTML (ver load_fixtures e fixture_pages).
+        host (str, optional): endereço de escuta.
+        port (int, optional): porta (0 escolhe uma livre).
+        verbose (bool, optional): registra cada requisição no terminal.
+        **options: latência e falhas (ver FakeWikipedia).
+
+    Returns:
+        ThreadingHTTPServer: servidor com o atributo `wiki` (FakeWikipedia),
+        cujo base_url aponta para o servidor.
+    """
+    server = _Server((host, port), _Handler)
+    server.verbose = verbose
+    server.wiki = FakeWikipedia(pages, **options)
+    host, port = server.server_address[:2]
+    server.wiki.base_url = f"http://{host}:{port}"
+    return server
+
+
+@contextmanager
+def running(pages, **options):
+    """
+    Roda o servidor numa thread enquanto o bloco with executa.
+
+    Yields:
+        FakeWikipedia: o estado do servidor (base_url, set_page, stats).
+    """
+    server = make_server(pages, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.wiki
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def page_link(base_url, title):
+    """Link de uma página no servidor (título com sublinhados)."""
+    return f"{base_url}/wiki/{quote(title)}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local que imita a Wikipedia")
+    parser.add_argument("--fixtures", required=True,
+                        help="Diretório com as páginas .html (ex.: goal500/tests/fixtures/wikipedia)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso de cada resposta (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Atraso extra sorteado (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 429")
+    parser.add_argument("--server-error-rate", type=float, default=0.0,
+                        help="Fração de respostas 503")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = make_server(load_fixtures(args.fixtures), args.host, args.port, args.verbose,
+                         latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         server_error_rate=args.server_error_rate)
+    print(f"Wikipedia local em {server.wiki.base_url}/wiki/ "
+          f"({len(server.wiki._pages)} páginas)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando o servidor.")
+    finally:
+        server.server_close()
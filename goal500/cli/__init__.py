@@ -3,12 +3,86 @@ Módulo de interface de linha de comando para o pacote goal500.
 """
 
 import argparse
+import importlib
 import sys
-import pandas as pd
 
-from goal500.scrapers.wikipedia import get_player_stats
-from goal500.visualization.plots import plot_cumulative_goals, create_animation
-from goal500.site import write_site_data
+from goal500.utils import instrument
+
+# Dependências pesadas de cada subcomando, importadas só quando o subcomando
+# roda: `goal500 --help` e `goal500 site` não carregam matplotlib/requests.
+# Nome no módulo -> (módulo, atributo); atributo None é o próprio módulo.
+_LAZY_ATTRIBUTES = {
+    "pd": ("pandas", None),
+    "get_player_stats": ("goal500.scrapers.wikipedia", "get_player_stats"),
+    "get_player_datasets": ("goal500.scrapers.wikipedia", "get_player_datasets"),
+    "plot_cumulative_goals": ("goal500.visualization.plots", "plot_cumulative_goals"),
+    "create_animation": ("goal500.visualization.plots", "create_animation"),
+    "write_site_data": ("goal500.site", "write_site_data"),
+    "aggregate_csv": ("goal500.utils.data_processing", "aggregate_csv"),
+    "run_pipeline": ("goal500.pipeline", "run_pipeline"),
+    "bench": ("goal500.bench", None),
+    "serve": ("goal500.server", "serve"),
+    "watch": ("goal500.watch", "watch"),
+    "storage": ("goal500.storage", None),
+    "snapshots": ("goal500.snapshots", None),
+    "refresher": ("goal500.refresher", None),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name)
+    if attribute:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def _load(name):
+    """Resolve uma dependência preguiçosa pelo atributo do módulo (respeita mocks nos testes)."""
+    return getattr(sys.modules[__name__], name)
+
+
+def _add_read_arguments(subparser):
+    """Opções de leitura dos dados: do banco SQLite em vez do CSV, ou do CSV em blocos."""
+    subparser.add_argument(
+        "--db",
+        help="Banco SQLite com as estatísticas (substitui --input)",
+        default=None
+    )
+    subparser.add_argument(
+        "--top",
+        help="Com --db, usa só os N jogadores com mais gols",
+        type=int,
+        default=None
+    )
+    subparser.add_argument(
+        "--chunksize",
+        help="Lê o CSV em blocos de N linhas, somando gols por jogador/ano/tipo (arquivos grandes; não vale com --db)",
+        type=int,
+        default=None
+    )
+
+
+def _read_stats(args):
+    """
+    Lê os dados do CSV (--input) ou, com --db, só os jogadores pedidos do banco.
+
+    Com --chunksize, o CSV é lido em blocos e já chega somado por (name, year,
+    type) (ver aggregate_csv): as saídas são as mesmas, em memória limitada.
+    """
+    if args.db:
+        storage = _load("storage")
+        conn = storage.connect(args.db, create=False)
+        try:
+            return storage.load_stats(conn, top=args.top)
+        finally:
+            conn.close()
+    if args.chunksize:
+        return _load("aggregate_csv")(args.input, args.chunksize)
+    return _load("pd").read_csv(args.input)
 
 
 def main():
@@ -19,14 +93,62 @@ def main():
         description="Extrai e visualiza dados de gols acumulados de jogadores de futebol."
     )
     
+    parser.add_argument(
+        "--profile",
+        metavar="ARQUIVO",
+        help="Roda o comando sob o cProfile e grava as estatísticas (pstats) em ARQUIVO"
+    )
+    parser.add_argument(
+        "--instrument",
+        help="Mede tempo, CPU e pico de memória de cada etapa e imprime um resumo",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--instrument-json",
+        metavar="ARQUIVO",
+        help="Como --instrument, gravando também o resumo em JSON"
+    )
+    
     subparsers = parser.add_subparsers(dest="command", help="Comandos disponíveis")
     
     # Comando extract
     extract_parser = subparsers.add_parser("extract", help="Extrai dados da Wikipedia")
     extract_parser.add_argument(
         "--output", "-o", 
-        help="Arquivo CSV para salvar os dados extraídos",
-        default="player_stats.csv"
+        help="Arquivo CSV para salvar os dados extraídos (padrão: player_stats.csv, ou nenhum com --db)",
+        default=None
+    )
+    extract_parser.add_argument(
+        "--db",
+        help="Banco SQLite onde cada jogador é gravado assim que extraído",
+        default=None
+    )
+    extract_parser.add_argument(
+        "--workers", "-w",
+        help="Páginas baixadas ao mesmo tempo",
+        type=int,
+        default=1
+    )
+    extract_parser.add_argument(
+        "--retries",
+        help="Novas tentativas por página após 429/5xx ou falha de rede",
+        type=int,
+        default=3
+    )
+    extract_parser.add_argument(
+        "--base-url",
+        help="Servidor no lugar da Wikipedia (ex.: python -m goal500.bench_fixtures)",
+        default=None
+    )
+    extract_parser.add_argument(
+        "--competitions",
+        help="CSV com partidas e gols por temporada e competição (liga, copa, continental...)",
+        default=None
+    )
+    extract_parser.add_argument(
+        "--players-info",
+        help="CSV com os dados do infobox de cada jogador (data de nascimento)",
+        default=None
     )
     
     # Comando plot
@@ -51,6 +173,12 @@ def main():
         help="Subtítulo do gráfico",
         default="Active players with most goals"
     )
+    plot_parser.add_argument(
+        "--manifest",
+        help="Manifesto de build (JSON); mantém o gráfico se os dados não mudaram",
+        default=None
+    )
+    _add_read_arguments(plot_parser)
     
     # Comando animate
     animate_parser = subparsers.add_parser("animate", help="Cria animação dos dados")
@@ -61,7 +189,7 @@ def main():
     )
     animate_parser.add_argument(
         "--output", "-o", 
-        help="Arquivo GIF para salvar a animação",
+        help="Arquivo da animação; o formato vem da extensão (.gif, .webp, .apng, .mp4)",
         default="cumulative_goals.gif"
     )
     animate_parser.add_argument(
@@ -76,6 +204,24 @@ def main():
         type=int,
         default=5
     )
+    animate_parser.add_argument(
+        "--workers", "-w",
+        help="Número de processos para desenhar os frames",
+        type=int,
+        default=1
+    )
+    animate_parser.add_argument(
+        "--tween",
+        help="Frames interpolados entre anos consecutivos (animação mais suave)",
+        type=int,
+        default=0
+    )
+    animate_parser.add_argument(
+        "--manifest",
+        help="Manifesto de build (JSON); mantém a animação se os dados não mudaram",
+        default=None
+    )
+    _add_read_arguments(animate_parser)
 
     # Comando site
     site_parser = subparsers.add_parser(
@@ -91,41 +237,619 @@ def main():
         help="Arquivo JSON de saída consumido pela página",
         default="docs/data.json"
     )
+    site_parser.add_argument(
+        "--forecast",
+        metavar="GOLS",
+        help="Inclui a projeção (Monte Carlo) de quando cada jogador chega a GOLS (padrão: 500)",
+        type=int,
+        nargs="?",
+        const=500
+    )
+    site_parser.add_argument(
+        "--simulations",
+        help="Carreiras simuladas por jogador na projeção",
+        type=int,
+        default=20_000
+    )
+    site_parser.add_argument(
+        "--birth-dates",
+        metavar="CSV",
+        help="CSV com name e birth_date (ex.: o de extract --players-info) para a projeção"
+    )
+    site_parser.add_argument(
+        "--manifest",
+        help="Manifesto de build (JSON); mantém os dados do site se os dados não mudaram",
+        default=None
+    )
+    _add_read_arguments(site_parser)
+
+    # Comando import
+    import_parser = subparsers.add_parser(
+        "import", help="Grava um CSV de estatísticas no banco SQLite"
+    )
+    import_parser.add_argument(
+        "--input", "-i",
+        help="Arquivo CSV com os dados extraídos",
+        default="data/player_stats.csv"
+    )
+    import_parser.add_argument(
+        "--db",
+        help="Banco SQLite de destino (criado se não existir)",
+        default="data/goal500.db"
+    )
+
+    # Comando pipeline
+    pipeline_parser = subparsers.add_parser(
+        "pipeline", help="Gera site, gráfico e animação num único processo"
+    )
+    pipeline_parser.add_argument(
+        "--input", "-i",
+        help="Arquivo CSV com os dados (destino dos dados extraídos, com --extract)",
+        default="data/player_stats.csv"
+    )
+    pipeline_parser.add_argument(
+        "--extract",
+        help="Extrai os dados da Wikipedia antes de gerar os artefatos",
+        action="store_true"
+    )
+    pipeline_parser.add_argument(
+        "--stages",
+        help="Etapas a executar, separadas por vírgula (padrão: site,plot,animate)",
+        default="site,plot,animate"
+    )
+    pipeline_parser.add_argument(
+        "--site-output",
+        help="Arquivo JSON de dados da página",
+        default="docs/data.json"
+    )
+    pipeline_parser.add_argument(
+        "--plot-output",
+        help="Arquivo do gráfico estático",
+        default="images/cumulative_goals.png"
+    )
+    pipeline_parser.add_argument(
+        "--animation-output",
+        help="Arquivo da animação; o formato vem da extensão",
+        default="images/cumulative_goals.gif"
+    )
+    pipeline_parser.add_argument(
+        "--workers", "-w",
+        help="Número de processos para desenhar os frames da animação",
+        type=int,
+        default=1
+    )
+    pipeline_parser.add_argument(
+        "--jobs", "-j",
+        help="Número de processos para as etapas independentes (site, gráfico, animação)",
+        type=int,
+        default=1
+    )
+    pipeline_parser.add_argument(
+        "--manifest",
+        help="Manifesto de build (JSON); pula as etapas cujos dados não mudaram",
+        default=None
+    )
+
+    # Comando serve
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serve os dados em memória por HTTP, com consultas filtradas e recarga automática"
+    )
+    serve_parser.add_argument(
+        "--input", "-i",
+        help="Arquivo CSV com os dados extraídos (recarregado quando muda)",
+        default="data/player_stats.csv"
+    )
+    serve_parser.add_argument(
+        "--host",
+        help="Endereço de escuta",
+        default="127.0.0.1"
+    )
+    serve_parser.add_argument(
+        "--port", "-p",
+        help="Porta de escuta",
+        type=int,
+        default=8000
+    )
+    serve_parser.add_argument(
+        "--static",
+        help="Diretório servido nos demais caminhos (ex.: docs, para abrir o painel)",
+        default=None
+    )
+    serve_parser.add_argument(
+        "--reload-interval",
+        help="Intervalo mínimo (s) entre verificações de mudança no arquivo",
+        type=float,
+        default=1.0
+    )
+    serve_parser.add_argument(
+        "--verbose", "-v",
+        help="Registra cada requisição no terminal",
+        action="store_true"
+    )
+
+    # Comando snapshot
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="Grava os dados atuais no histórico (delta em relação ao anterior)"
+    )
+    snapshot_parser.add_argument(
+        "--input", "-i",
+        help="Arquivo CSV com os dados extraídos",
+        default="data/player_stats.csv"
+    )
+    snapshot_parser.add_argument(
+        "--store",
+        help="Diretório do histórico de snapshots",
+        default="data/snapshots"
+    )
+    snapshot_parser.add_argument(
+        "--label",
+        help="Rótulo do snapshot (padrão: data atual)",
+        default=None
+    )
+    snapshot_parser.add_argument(
+        "--checkpoint-every",
+        help="A cada quantos snapshots gravar a tabela completa",
+        type=int,
+        default=10
+    )
+    snapshot_parser.add_argument(
+        "--list",
+        help="Lista os snapshots em vez de gravar",
+        action="store_true"
+    )
+
+    # Comando diff
+    diff_parser = subparsers.add_parser(
+        "diff", help="Mostra o que mudou entre dois snapshots (ou arquivos CSV)"
+    )
+    diff_parser.add_argument(
+        "old",
+        help="Snapshot antigo: id, rótulo, posição negativa ou CSV (padrão: penúltimo)",
+        nargs="?",
+        default="-2"
+    )
+    diff_parser.add_argument(
+        "new",
+        help="Snapshot novo (padrão: último)",
+        nargs="?",
+        default="-1"
+    )
+    diff_parser.add_argument(
+        "--store",
+        help="Diretório do histórico de snapshots",
+        default="data/snapshots"
+    )
+    diff_parser.add_argument(
+        "--rows",
+        help="Mostra também cada linha (jogador, ano, tipo) alterada",
+        action="store_true"
+    )
+
+    # Comando watch
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Observa o CSV e refaz só as saídas dos jogadores alterados"
+    )
+    watch_parser.add_argument(
+        "--input", "-i",
+        help="Arquivo CSV observado",
+        default="data/player_stats.csv"
+    )
+    watch_parser.add_argument(
+        "--stages",
+        help="Saídas mantidas, separadas por vírgula: site, plot, charts, animate",
+        default="site,plot"
+    )
+    watch_parser.add_argument(
+        "--site-output",
+        help="Arquivo JSON de dados da página",
+        default="docs/data.json"
+    )
+    watch_parser.add_argument(
+        "--plot-output",
+        help="Arquivo do gráfico combinado",
+        default="images/cumulative_goals.png"
+    )
+    watch_parser.add_argument(
+        "--charts-dir",
+        help="Diretório dos gráficos individuais (etapa charts)",
+        default="images/players"
+    )
+    watch_parser.add_argument(
+        "--animation-output",
+        help="Arquivo da animação (etapa animate)",
+        default="images/cumulative_goals.gif"
+    )
+    watch_parser.add_argument(
+        "--interval",
+        help="Intervalo (s) entre verificações do arquivo",
+        type=float,
+        default=0.5
+    )
+
+    # Comando refresh-daemon
+    refresh_parser = subparsers.add_parser(
+        "refresh-daemon",
+        help="Reextrai os jogadores continuamente, os mais ativos com mais frequência"
+    )
+    refresh_parser.add_argument(
+        "--db",
+        help="Banco SQLite atualizado (criado se não existir)",
+        default="data/goal500.db"
+    )
+    refresh_parser.add_argument(
+        "--schedule",
+        help="Arquivo JSON com a agenda (mantida entre reinícios)",
+        default="data/refresh_schedule.json"
+    )
+    refresh_parser.add_argument(
+        "--budget",
+        help="Máximo de requisições HTTP por hora",
+        type=float,
+        default=60
+    )
+    refresh_parser.add_argument(
+        "--base-url",
+        help="Outro servidor no lugar da Wikipedia (ex.: a Wikipedia local dos testes)",
+        default=None
+    )
+    refresh_parser.add_argument(
+        "--snapshots",
+        metavar="DIR",
+        help="Grava um snapshot no histórico quando os dados mudam",
+        default=None
+    )
+    refresh_parser.add_argument(
+        "--output", "-o",
+        help="Reescreve este CSV quando os dados mudam (para watch/serve)",
+        default=None
+    )
+    refresh_parser.add_argument(
+        "--once",
+        help="Executa um único ciclo e sai",
+        action="store_true"
+    )
+    refresh_parser.add_argument(
+        "--list",
+        help="Mostra a agenda (próxima atualização de cada jogador) e sai",
+        action="store_true"
+    )
+
+    # Comando bench
+    bench_parser = subparsers.add_parser(
+        "bench", help="Mede o desempenho das etapas com dados sintéticos"
+    )
+    bench_parser.add_argument(
+        "--sizes",
+        help="Números de jogadores separados por vírgula (aceita k/m, ex.: 10,1k,100k)",
+        default="10,1k"
+    )
+    bench_parser.add_argument(
+        "--stages",
+        help="Etapas a medir, separadas por vírgula (padrão: todas)",
+        default=None
+    )
+    bench_parser.add_argument(
+        "--repeats", "-r",
+        help="Repetições cronometradas de cada etapa",
+        type=int,
+        default=3
+    )
+    bench_parser.add_argument(
+        "--career",
+        help="Tamanho mínimo e máximo das carreiras, em anos (ex.: 8-20)",
+        default="8-20"
+    )
+    bench_parser.add_argument(
+        "--seed",
+        help="Semente dos dados sintéticos",
+        type=int,
+        default=0
+    )
+    bench_parser.add_argument(
+        "--no-memory",
+        help="Não mede o pico de memória (tracemalloc)",
+        action="store_true"
+    )
+    bench_parser.add_argument(
+        "--budget",
+        help="Tempo máximo estimado (s) de uma execução; medições acima disso são puladas",
+        type=float,
+        default=60.0
+    )
+    bench_parser.add_argument(
+        "--output", "-o",
+        help="Arquivo JSON para salvar os resultados",
+        default=None
+    )
+    bench_parser.add_argument(
+        "--baseline", "-b",
+        help="Resultados anteriores (JSON) para comparação",
+        default=None
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        help="Aumento relativo da mediana tolerado antes de acusar regressão (0.2 = 20%%)",
+        type=float,
+        default=0.2
+    )
+    bench_parser.add_argument(
+        "--scrape",
+        help="Mede a extração de ponta a ponta contra uma Wikipedia local (--sizes = páginas)",
+        action="store_true"
+    )
+    bench_parser.add_argument(
+        "--workers",
+        help="Com --scrape: números de workers medidos, separados por vírgula",
+        default="1,8"
+    )
+    bench_parser.add_argument(
+        "--latency",
+        help="Com --scrape: atraso de cada resposta do servidor local, em segundos",
+        type=float,
+        default=0.05
+    )
+    bench_parser.add_argument(
+        "--error-rate",
+        help="Com --scrape: fração das respostas com 429 (Too Many Requests)",
+        type=float,
+        default=0.0
+    )
 
     args = parser.parse_args()
+    if getattr(args, "chunksize", None) and getattr(args, "db", None):
+        print("Erro: --chunksize vale só para o CSV (--input) e não pode ser usado com --db.")
+        sys.exit(1)
+
+    if args.instrument or args.instrument_json:
+        instrument.enable(memory=True)
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        _run_command(args, parser)
+    finally:
+        if args.profile:
+            profiler.disable()
+            _write_profile(profiler, args.profile)
+        if args.instrument or args.instrument_json:
+            instrument.print_summary()
+            if args.instrument_json:
+                instrument.write_json(args.instrument_json)
+                print(f"Instrumentação salva em: {args.instrument_json}")
+            instrument.disable()
+
+
+def _write_profile(profiler, output_file):
+    """Grava o perfil do cProfile (abrível com pstats/snakeviz) e imprime as funções mais caras."""
+    import pstats
+
+    profiler.dump_stats(output_file)
+    print(f"Perfil salvo em: {output_file}")
+    pstats.Stats(output_file).sort_stats("cumulative").print_stats(15)
+
+
+def _run_command(args, parser):
+    """Executa o subcomando escolhido."""
     
     if args.command == "extract":
         print("Extraindo dados da Wikipedia...")
-        data = get_player_stats()
-        data.to_csv(args.output, index=False)
-        print(f"Dados salvos em: {args.output}")
+        options = {"workers": args.workers, "retries": args.retries, "base_url": args.base_url}
+        if args.db:
+            options["db"] = args.db
+        if args.competitions or args.players_info:
+            # Uma leitura por página para todos os conjuntos de dados.
+            datasets = _load("get_player_datasets")(**options)
+            data = datasets["goals"]
+            for path, key in ((args.competitions, "competitions"), (args.players_info, "players")):
+                if path:
+                    datasets[key].to_csv(path, index=False)
+                    print(f"Dados salvos em: {path}")
+        else:
+            data = _load("get_player_stats")(**options)
+        if args.db:
+            print(f"Dados gravados em: {args.db}")
+        output = args.output or (None if args.db else "player_stats.csv")
+        if output:
+            data.to_csv(output, index=False)
+            print(f"Dados salvos em: {output}")
         
     elif args.command == "plot":
-        print(f"Criando visualização a partir de: {args.input}")
+        print(f"Criando visualização a partir de: {args.db or args.input}")
         try:
-            data = pd.read_csv(args.input)
-            plot_cumulative_goals(data, args.output, args.title, args.subtitle)
+            data = _read_stats(args)
+            _load("plot_cumulative_goals")(data, args.output, args.title, args.subtitle,
+                                           manifest=args.manifest)
         except FileNotFoundError:
-            print(f"Erro: Arquivo {args.input} não encontrado.")
+            print(f"Erro: Arquivo {args.db or args.input} não encontrado.")
             sys.exit(1)
             
     elif args.command == "animate":
-        print(f"Criando animação a partir de: {args.input}")
+        print(f"Criando animação a partir de: {args.db or args.input}")
         try:
-            data = pd.read_csv(args.input)
-            create_animation(data, args.output, args.fps, args.duration)
+            data = _read_stats(args)
+            _load("create_animation")(data, args.output, args.fps, args.duration, args.workers, args.tween,
+                                      manifest=args.manifest)
         except FileNotFoundError:
-            print(f"Erro: Arquivo {args.input} não encontrado.")
+            print(f"Erro: Arquivo {args.db or args.input} não encontrado.")
+            sys.exit(1)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
             sys.exit(1)
 
     elif args.command == "site":
-        print(f"Gerando dados do site a partir de: {args.input}")
+        if args.forecast is not None and args.forecast <= 0:
+            print("Erro: --forecast deve ser um número de gols positivo.")
+            sys.exit(1)
+        forecast = None
+        if args.forecast is not None:
+            forecast = {"target": args.forecast, "n_sims": args.simulations}
+            if args.birth_dates:
+                try:
+                    info = _load("pd").read_csv(args.birth_dates)
+                except FileNotFoundError:
+                    print(f"Erro: Arquivo {args.birth_dates} não encontrado.")
+                    sys.exit(1)
+                missing = {"name", "birth_date"} - set(info.columns)
+                if missing:
+                    print(f"Erro: {args.birth_dates} não tem as colunas: {', '.join(sorted(missing))}.")
+                    sys.exit(1)
+                info = info.dropna(subset=["birth_date"])
+                forecast["birth_dates"] = dict(zip(info["name"], info["birth_date"]))
+        print(f"Gerando dados do site a partir de: {args.db or args.input}")
         try:
-            data = pd.read_csv(args.input)
-            write_site_data(data, args.output)
+            data = _read_stats(args)
+            _load("write_site_data")(data, args.output, args.manifest, forecast=forecast)
+        except FileNotFoundError:
+            print(f"Erro: Arquivo {args.db or args.input} não encontrado.")
+            sys.exit(1)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
+            sys.exit(1)
+
+    elif args.command == "import":
+        storage = _load("storage")
+        try:
+            data = _load("pd").read_csv(args.input)
         except FileNotFoundError:
             print(f"Erro: Arquivo {args.input} não encontrado.")
             sys.exit(1)
+        conn = storage.connect(args.db)
+        try:
+            count = storage.import_dataframe(conn, data)
+        finally:
+            conn.close()
+        print(f"{count} jogadores gravados em: {args.db}")
+
+    elif args.command == "pipeline":
+        stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+        try:
+            _load("run_pipeline")(
+                args.input, args.extract, stages, args.site_output,
+                args.plot_output, args.animation_output, workers=args.workers,
+                jobs=args.jobs, manifest=args.manifest,
+            )
+        except FileNotFoundError:
+            print(f"Erro: Arquivo {args.input} não encontrado.")
+            sys.exit(1)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
+            sys.exit(1)
+
+    elif args.command == "bench":
+        bench = _load("bench")
+        try:
+            sizes = [bench.parse_size(size) for size in args.sizes.split(",") if size.strip()]
+            career = tuple(int(value) for value in args.career.split("-", 1))
+            stages = args.stages.split(",") if args.stages else bench.STAGES
+            baseline = bench.load_results(args.baseline) if args.baseline else None
+            if args.scrape:
+                workers = [int(value) for value in args.workers.split(",") if value.strip()]
+                results = bench.run_scrape_benchmark(sizes, workers, args.latency, args.error_rate,
+                                                     career, args.seed, args.budget)
+            else:
+                results = bench.run_benchmarks(sizes, stages, args.repeats, career, args.seed,
+                                               memory=not args.no_memory, budget=args.budget)
+        except FileNotFoundError:
+            print(f"Erro: Arquivo {args.baseline} não encontrado.")
+            sys.exit(1)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
+            sys.exit(1)
+
+        comparison = bench.compare(results, baseline, args.threshold) if baseline else None
+        bench.print_report(results, comparison)
+        if args.output:
+            bench.save_results(results, args.output)
+            print(f"Resultados salvos em: {args.output}")
+        wrong = [r for r in results["results"] if r.get("correct") is False]
+        if wrong:
+            print("Erro: extração diferente dos dados gerados em "
+                  + ", ".join(f"{r['stage']} ({r['players']} jogadores)" for r in wrong))
+            sys.exit(1)
+        regressions = [row for row in comparison or [] if row["regression"]]
+        if regressions:
+            print(f"Regressões acima de {args.threshold:.0%}: "
+                  + ", ".join(f"{row['stage']} ({row['players']} jogadores)" for row in regressions))
+            sys.exit(1)
+
+    elif args.command == "snapshot":
+        snapshots = _load("snapshots")
+        if args.list:
+            entries = snapshots.list_snapshots(args.store)
+            if not entries:
+                print(f"Nenhum snapshot em: {args.store}")
+            for entry in entries:
+                print(f"{entry['id']:>4}  {entry['label']:<12} {entry['kind']:<10} "
+                      f"{entry['rows']:>7} linhas {entry['changes']:>7} alterações")
+            return
+        try:
+            data = _load("pd").read_csv(args.input)
+        except FileNotFoundError:
+            print(f"Erro: Arquivo {args.input} não encontrado.")
+            sys.exit(1)
+        entry = snapshots.save_snapshot(data, args.store, args.label, args.checkpoint_every)
+        print(f"Snapshot {entry['id']} ({entry['label']}, {entry['kind']}, "
+              f"{entry['changes']} alterações) em: {args.store}")
+
+    elif args.command == "diff":
+        snapshots = _load("snapshots")
+        try:
+            changes = snapshots.diff_snapshots(args.old, args.new, args.store)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
+            sys.exit(1)
+        print(f"Diferenças entre {args.old} e {args.new}: {len(changes)} linhas alteradas")
+        if not changes.empty:
+            summary = snapshots.goals_by_player(changes)
+            print(summary.rename(columns={"name": "jogador", "delta": "gols", "rows": "linhas"})
+                  .to_string(index=False))
+            if args.rows:
+                print()
+                print(changes.to_string(index=False))
+
+    elif args.command == "watch":
+        stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+        try:
+            _load("watch")(args.input, stages, args.site_output, args.plot_output,
+                           args.charts_dir, args.animation_output, args.interval)
+        except FileNotFoundError:
+            print(f"Erro: Arquivo {args.input} não encontrado.")
+            sys.exit(1)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
+            sys.exit(1)
+
+    elif args.command == "refresh-daemon":
+        refresher = _load("refresher")
+        if args.list:
+            try:
+                table = refresher.schedule_table(args.schedule)
+            except FileNotFoundError:
+                print(f"Nenhuma agenda em: {args.schedule}")
+                return
+            print(table.to_string(index=False))
+            return
+        try:
+            refresher.refresh_daemon(args.db, args.schedule, args.budget, args.base_url,
+                                     args.snapshots, args.output, args.once)
+        except ValueError as exc:
+            print(f"Erro: {exc}")
+            sys.exit(1)
+
+    elif args.command == "serve":
+        try:
+            _load("serve")(args.input, args.host, args.port, args.static,
+                           args.reload_interval, args.verbose)
+        except FileNotFoundError:
+            print(f"Erro: Arquivo {args.input} não encontrado.")
+            sys.exit(1)
+        except OSError as exc:
+            print(f"Erro: {exc}")
+            sys.exit(1)
 
     else:
         parser.print_help()
@@ -14,6 +14,9 @@ Funções:
     get_active_players(): Retorna uma lista de jogadores ativos com seus nomes e links.
     extract_goals_by_year(url): Extrai os gols por ano de um jogador a partir da sua página.
     get_player_stats(): Obtém estatísticas de gols por ano para todos os jogadores ativos.
+    parse_player_page(html): Extrai gols, detalhamento por competição e data de nascimento numa leitura.
+    get_player_datasets(): Como get_player_stats, com o detalhamento por competição e o infobox.
+    get_revisions(titles, base_url): Revisão atual de várias páginas numa única consulta à API.
 """
 
 # Documentação para o módulo utils.data_processing
@@ -31,7 +34,8 @@ Funções:
 Módulo para visualização dos dados de gols acumulados.
 
 Funções:
-    plot_cumulative_goals(data, output_file, title, subtitle): Cria um gráfico de gols acumulados.
+    plot_cumulative_goals(data, output_file, title, subtitle, large, max_labels, markers): Cria um gráfico de gols acumulados.
+    plot_batch(data, output_dir, by, fmt, workers, processes, dpi, title): Cria um gráfico por grupo, em paralelo.
     create_animation(data, output_file, fps, duration): Cria uma animação GIF dos gols acumulados.
 """
 
@@ -56,18 +60,23 @@ Exemplo de uso do pacote goal500:
 
 ```python
 import goal500
-import matplotlib.pyplot as plt
 
 # Extrair dados de jogadores
 dados = goal500.get_player_stats()
 
 # Visualizar dados
-fig = goal500.plot_cumulative_goals(dados)
-plt.show()
+fig = goal500.plot_cumulative_goals(dados)  # matplotlib.figure.Figure, sem pyplot
 
 # Salvar visualização
 goal500.plot_cumulative_goals(dados, output_file="gols_acumulados.png")
 
+# Um gráfico por jogador, desenhados em paralelo (threads)
+goal500.plot_batch(dados, "graficos/", by="name", workers=4)
+
+# Milhares de jogadores: linhas num único LineCollection e só os 30 rótulos
+# mais altos que não se sobrepõem (automático acima de 50 jogadores)
+goal500.plot_cumulative_goals(dados, large=True, max_labels=30)
+
 # Criar animação
 goal500.create_animation(dados, output_file="animacao_gols.gif")
 ```
@@ -0,0 +1,267 @@
+"""
+Projeção (Monte Carlo) de quando cada jogador chega a N gols na carreira.
+
+Para cada jogador são simuladas dezenas de milhares de carreiras futuras de
+uma vez, com arrays NumPy de forma (jogadores, simulações, anos). O modelo é
+simples e explícito:
+
+- o ritmo de cada tipo de gol (clube e seleção) é a média ponderada dos
+  últimos WINDOW anos completos (pesos 1..WINDOW, o mais recente pesa mais);
+- cada carreira simulada sorteia uma "forma" (Gama com média 1) que multiplica
+  o ritmo, e um declínio anual (normal em torno de DECLINE) aplicado a cada ano
+  projetado;
+- a cada ano o jogador pode se aposentar, com risco logístico que cresce com a
+  idade (se a data de nascimento for conhecida) ou com o tempo de carreira;
+  da seleção ele pode se aposentar antes;
+- os gols de cada ano são Poisson com o ritmo resultante. O ano corrente (o
+  último dos dados) já tem os gols marcados até agora: só o que falta para o
+  ritmo esperado é sorteado.
+
+Os anos projetados são anos-calendário a partir do último ano dos dados (as
+temporadas de clube contam pelo ano de início). O resultado depende da semente
+e do conjunto de jogadores simulados juntos; com os mesmos dados e a mesma
+semente, é sempre o mesmo.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from goal500.utils import instrument
+
+WINDOW = 4
+DECLINE = 0.93
+DECLINE_SD = 0.04
+FORM_SHAPE = 10.0
+# Risco de aposentadoria: logística centrada nestas idades / anos de carreira.
+RETIREMENT_AGE = {"club": 37.0, "international": 35.0}
+RETIREMENT_CAREER = {"club": 20.0, "international": 17.0}
+RETIREMENT_SCALE = 1.5
+# Elementos por array (jogadores x simulações x anos) em cada bloco de jogadores.
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+def _rates(entries, start_year):
+    """Ritmo recente (clube e seleção) e gols já marcados no ano corrente."""
+    weights = np.arange(1, WINDOW + 1, dtype=float)
+    window = np.arange(start_year - WINDOW, start_year)
+    rates = np.zeros((len(entries), 2))
+    current = np.zeros((len(entries), 2))
+    for i, entry in enumerate(entries):
+        by_year = dict(zip(entry["years"], zip(entry["club"], entry["international"])))
+        recent = np.array([by_year.get(year, (0, 0)) for year in window], dtype=float)
+        used = window >= entry["first_year"]
+        current[i] = by_year.get(start_year, (0, 0))
+        if used.any():
+            rates[i] = weights[used] @ recent[used] / weights[used].sum()
+        else:
+            rates[i] = current[i]  # estreante: só há o ano corrente
+        if entry["last_year"] < start_year - 1:
+            rates[i] = 0  # sem jogos nos dois últimos anos: carreira encerrada
+    return rates, current
+
+
+def _hazard(entries, start_year, horizon, birth_dates):
+    """Risco de aposentadoria ao fim de cada ano projetado: (jogadores, 2, horizon + 1)."""
+    offsets = np.arange(horizon + 1)
+    hazard = np.zeros((len(entries), 2, horizon + 1))
+    for i, entry in enumerate(entries):
+        birth = (birth_dates or {}).get(entry["name"])
+        known = birth is not None and pd.notna(birth) and str(birth) != ""
+        for j, kind in enumerate(("club", "international")):
+            if known:
+                x = start_year - int(str(birth)[:4]) + offsets - RETIREMENT_AGE[kind]
+            else:
+                x = start_year - entry["first_year"] + offsets - RETIREMENT_CAREER[kind]
+            hazard[i, j] = 1 / (1 + np.exp(-x / RETIREMENT_SCALE))
+    return hazard
+
+
+def _reached_year(entry, target):
+    """Ano (dos dados) em que o jogador chegou a `target` gols, ou None."""
+    cumulative = np.cumsum(np.add(entry["club"], entry["international"]))
+    hits = np.flatnonzero(cumulative >= target)
+    return int(entry["years"][hits[0]]) if len(hits) else None
+
+
+def _simulate_block(rates, current, totals, hazard, targets, n_sims, rng):
+    """
+    Simula um bloco de jogadores de uma vez.
+
+    Returns:
+        dict: alvo -> array (jogadores, simulações) com o índice do ano em que o
+        alvo é atingido (-1 se não for no horizonte).
+    """
+    n_players, _, steps = hazard.shape
+    offsets = np.arange(steps)
+    form = rng.gamma(FORM_SHAPE, 1 / FORM_SHAPE, (n_players, n_sims, 1))
+    decline = np.clip(rng.normal(DECLINE, DECLINE_SD, (n_players, n_sims, 1)), 0.5, 1.05)
+    trend = form * decline ** offsets  # (P, S, anos)
+
+    # Probabilidade de ainda jogar no ano k (aposentadoria ao fim do ano k vale
+    # a partir do ano k + 1): um único sorteio por carreira contra essa curva.
+    survival = np.cumprod(np.concatenate([np.ones((n_players, 2, 1)), 1 - hazard[:, :, :-1]],
+                                         axis=2), axis=2)
+    # O mesmo sorteio para os dois tipos: quem deixa o clube deixa a seleção.
+    draw = rng.random((n_players, n_sims, 1))
+    expected = np.zeros((n_players, n_sims, steps))
+    for j in range(2):
+        active = draw < survival[:, None, j, :]
+        rate = rates[:, None, None, j] * trend
+        # Ano corrente: só o que falta para o ritmo esperado.
+        rate[:, :, 0] = np.maximum(rate[:, :, 0] - current[:, None, j], 0)
+        expected += rate * active
+    cumulative = totals[:, None, None] + np.cumsum(rng.poisson(expected), axis=2)
+
+    result = {}
+    for target in targets:
+        reached = cumulative >= target
+        first = reached.argmax(axis=2)
+        result[target] = np.where(reached[:, :, -1], first, -1)
+    return result
+
+
+def _summary(years_index, start_year, n_steps):
+    """Probabilidade, distribuição e quantis do ano em que o alvo é atingido."""
+    hit = years_index[years_index >= 0]
+    by_year = np.bincount(hit, minlength=n_steps) / len(years_index)
+    summary = {"probability": round(float(len(hit) / len(years_index)), 4),
+               "reached_year": None,
+               "by_year": [round(float(p), 4) for p in by_year]}
+    if len(hit):
+        p10, p50, p90 = np.percentile(hit, [10, 50, 90], method="lower")
+        summary.update(median_year=start_year + int(p50), p10_year=start_year + int(p10),
+                       p90_year=start_year + int(p90),
+                       expected_year=round(start_year + float(hit.mean()), 2))
+    else:
+        summary.update(median_year=None, p10_year=None, p90_year=None, expected_year=None)
+    return summary
+
+
+@instrument.instrumented("forecast")
+def forecast_entries(entries, targets=(500,), n_sims=20_000, horizon=15, seed=0,
+                     birth_dates=None, start_year=None):
+    """
+    Projeta, para cada alvo, quando cada jogador chega àquele número de gols.
+
+    Args:
+        entries (iterable): entradas dos jogadores (ver goal500.site.player_entries).
+        targets (iterable, optional): números de gols na carreira.
+        n_sims (int, optional): carreiras simuladas por jogador.
+        horizon (int, optional): anos projetados depois do ano corrente.
+        seed (int, optional): semente do gerador.
+        birth_dates (dict, optional): nome -> data de nascimento (AAAA-MM-DD),
+            como a coluna birth_date de get_player_datasets()["players"]; sem
+            ela (ou com valor ausente), o risco de aposentadoria vem do tempo
+            de carreira.
+        start_year (int, optional): ano corrente; por padrão, o último dos dados.
+
+    Returns:
+        dict: {"targets", "simulations", "horizon", "seed", "start_year",
+        "years" (anos projetados, o corrente primeiro), "players": {alvo (str):
+        {nome: resumo}}}. O resumo traz goals, probability, by_year
+        (probabilidade de atingir o alvo em cada ano de "years"), median_year,
+        p10_year, p90_year e expected_year (quantis e média entre as
+        simulações que atingem o alvo) e reached_year (se já atingiu nos dados;
+        então probability é 1).
+
+    Raises:
+        ValueError: algum alvo não é um número de gols positivo.
+    """
+    targets = [int(target) for target in targets]
+    if any(target <= 0 for target in targets):
+        raise ValueError("O alvo da projeção deve ser um número de gols positivo.")
+    # Ordem fixa: o resultado não depende da ordem das entradas.
+    entries = sorted(entries, key=lambda entry: entry["name"])
+    if start_year is None:
+        start_year = max((entry["last_year"] for entry in entries), default=date.today().year)
+    steps = horizon + 1
+    result = {"targets": targets, "simulations": n_sims, "horizon": horizon, "seed": seed,
+              "start_year": start_year, "years": list(range(start_year, start_year + steps)),
+              "players": {str(target): {} for target in targets}}
+    if not entries:
+        return result
+
+    rng = np.random.default_rng(seed)
+    rates, current = _rates(entries, start_year)
+    totals = np.array([entry["total"] for entry in entries], dtype=np.int64)
+    hazard = _hazard(entries, start_year, horizon, birth_dates)
+
+    block = max(1, MAX_BLOCK_ELEMENTS // (n_sims * steps))
+    for start in range(0, len(entries), block):
+        stop = start + block
+        reached = _simulate_block(rates[start:stop], current[start:stop], totals[start:stop],
+                                  hazard[start:stop], targets, n_sims, rng)
+        for offset, entry in enumerate(entries[start:stop]):
+            for target in targets:
+                summary = {"goals": entry["total"],
+                           **_summary(reached[target][offset], start_year, steps)}
+                already = _reached_year(entry, target)
+                if already is not None:
+                    summary.update(probability=1.0, reached_year=already, by_year=[0.0] * steps,
+                                   median_year=already, p10_year=already, p90_year=already,
+                                   expected_year=float(already))
+                result["players"][str(target)][entry["name"]] = summary
+    return result
+
+
+def forecast_summary(entries, target=500, **options):
+    """
+    Projeção de um único alvo a partir das entradas dos jogadores.
+
+    É o formato embutido por build_site_data(forecast=...).
+
+    Args:
+        entries (iterable): entradas dos jogadores (ver goal500.site.player_entries).
+        target (int, optional): número de gols na carreira.
+        **options: n_sims, horizon, seed, birth_dates, start_year (ver forecast_entries).
+
+    Returns:
+        dict: como forecast_entries, com "target" no lugar de "targets" e
+        "players" já do alvo pedido ({nome: resumo}).
+    """
+    result = forecast_entries(entries, [target], **options)
+    del result["targets"]
+    result["players"] = result["players"][str(int(target))]
+    return {"target": int(target), **result}
+
+
+def forecast(data, target=500, n_sims=20_000, horizon=15, seed=0, birth_dates=None):
+    """
+    Projeta quando cada jogador chega a `target` gols.
+
+    Args:
+        data (pd.DataFrame): DataFrame bruto com colunas name/year/total/type.
+        target (int, optional): número de gols na carreira.
+        n_sims, horizon, seed, birth_dates: ver forecast_entries.
+
+    Returns:
+        dict: ver forecast_summary.
+    """
+    from goal500.site import player_entries
+    from goal500.utils.data_processing import clean_data
+
+    entries = player_entries(clean_data(data.copy())).values()
+    return forecast_summary(entries, target, n_sims=n_sims, horizon=horizon, seed=seed,
+                            birth_dates=birth_dates)
+
+
+def probability_of_reaching(data, targets=(500, 600, 700, 800), n_sims=20_000, horizon=15, seed=0,
+                            birth_dates=None):
+    """
+    Probabilidade de cada jogador chegar a cada alvo, com uma única simulação.
+
+    Returns:
+        pd.DataFrame: uma linha por jogador (índice name) e uma coluna por alvo.
+    """
+    from goal500.site import player_entries
+    from goal500.utils.data_processing import clean_data
+
+    entries = player_entries(clean_data(data.copy())).values()
+    result = forecast_entries(entries, targets, n_sims, horizon, seed, birth_dates)
+    table = pd.DataFrame({target: {name: summary["probability"] for name, summary in players.items()}
+                          for target, players in result["players"].items()})
+    table.columns = [int(target) for target in table.columns]
+    table.index.name = "name"
+    return table
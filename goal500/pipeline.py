@@ -0,0 +1,165 @@
+"""
+Pipeline completo: extração (ou leitura), site, gráfico e animação.
+
+Os dados são carregados uma vez, limpos uma vez e preparados para os gráficos
+uma vez; cada etapa recebe os mesmos DataFrames. As etapas formam um grafo de
+dependências (goal500.scheduler), e com `jobs > 1` as que são independentes
+entre si (site, gráfico e animação) rodam em paralelo num pool de processos.
+"""
+
+import os
+import time
+
+import pandas as pd
+
+from goal500.scheduler import critical_path, run_dag
+from goal500.site import _write_site_from_clean
+from goal500.utils.data_processing import calculate_cumulative_goals, clean_data
+from goal500.utils.manifest import data_fingerprint
+
+# Etapas que podem ser selecionadas, na ordem em que rodam.
+STAGES = ("site", "plot", "animate")
+
+
+def _print_timings(timings):
+    """Imprime a tabela de tempos por etapa."""
+    print("Tempos por etapa:")
+    width = max(len(stage) for stage in timings)
+    for stage, seconds in timings.items():
+        print(f"  {stage:<{width}}  {seconds:8.3f} s")
+
+
+# Etapas do grafo: funções de módulo, para poderem rodar em outro processo.
+# Matplotlib e requests só são importados pelas etapas que precisam deles.
+
+def _stage_extract(input_file):
+    from goal500.scrapers.wikipedia import get_player_stats
+
+    print("Extraindo dados da Wikipedia...")
+    raw = get_player_stats()
+    os.makedirs(os.path.dirname(input_file) or ".", exist_ok=True)
+    raw.to_csv(input_file, index=False)
+    print(f"Dados salvos em: {input_file}")
+    return raw
+
+
+def _stage_load(input_file):
+    return pd.read_csv(input_file)
+
+
+def _stage_clean(raw):
+    return clean_data(raw.copy())
+
+
+def _stage_fingerprint(clean):
+    return data_fingerprint(clean, clean=True)
+
+
+# Com manifesto, as etapas recebem a impressão digital dos dados, calculada uma
+# vez (a mesma que write_site_data/plot_cumulative_goals/create_animation usam).
+
+def _stage_site(clean, data_key=None, output_file="docs/data.json", manifest=None):
+    return _write_site_from_clean(clean, output_file, manifest, data_key=data_key)
+
+
+def _stage_plot(plot_data, data_key=None, output_file="images/cumulative_goals.png", manifest=None):
+    from goal500.visualization.plots import _plot_key, _plot_prepared
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    key = _plot_key(None, output_file, data_key=data_key) if manifest else None
+    _plot_prepared(plot_data, output_file, manifest=manifest, key=key)
+    return output_file
+
+
+def _stage_animate(plot_data, data_key=None, output_file="images/cumulative_goals.gif", fps=2,
+                   duration=5, workers=1, tween=0, manifest=None):
+    from goal500.visualization.plots import _animate_prepared, _animation_key
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    key = _animation_key(None, output_file, fps, duration, tween, data_key) if manifest else None
+    return _animate_prepared(plot_data, output_file, fps, duration, workers, tween, manifest, key)
+
+
+def build_tasks(input_file="data/player_stats.csv", extract=False, stages=STAGES,
+                site_output="docs/data.json", plot_output="images/cumulative_goals.png",
+                animation_output="images/cumulative_goals.gif", fps=2, duration=5,
+                workers=1, tween=0, manifest=None):
+    """
+    Monta o grafo de tarefas do pipeline (ver run_pipeline para os argumentos).
+
+    Returns:
+        dict: nome -> (função, dependências, kwargs), no formato de run_dag.
+    """
+    source = "extract" if extract else "load"
+    tasks = {
+        source: (_stage_extract if extract else _stage_load, [], {"input_file": input_file}),
+        "clean": (_stage_clean, [source], None),
+    }
+    if "plot" in stages or "animate" in stages:
+        tasks["prepare"] = (calculate_cumulative_goals, ["clean"], None)
+    key = []
+    if manifest:
+        tasks["fingerprint"] = (_stage_fingerprint, ["clean"], None)
+        key = ["fingerprint"]
+    if "site" in stages:
+        tasks["site"] = (_stage_site, ["clean"] + key,
+                         {"output_file": site_output, "manifest": manifest})
+    if "plot" in stages:
+        tasks["plot"] = (_stage_plot, ["prepare"] + key,
+                         {"output_file": plot_output, "manifest": manifest})
+    if "animate" in stages:
+        tasks["animate"] = (_stage_animate, ["prepare"] + key, {
+            "output_file": animation_output, "fps": fps, "duration": duration,
+            "workers": workers, "tween": tween, "manifest": manifest,
+        })
+    return tasks
+
+
+def run_pipeline(input_file="data/player_stats.csv", extract=False, stages=STAGES,
+                 site_output="docs/data.json", plot_output="images/cumulative_goals.png",
+                 animation_output="images/cumulative_goals.gif", fps=2, duration=5,
+                 workers=1, tween=0, jobs=1, manifest=None):
+    """
+    Gera os artefatos do projeto a partir de um único carregamento dos dados.
+
+    Args:
+        input_file (str, optional): CSV com os dados. Com `extract=True`, é onde
+            os dados extraídos são salvos; caso contrário, é lido.
+        extract (bool, optional): Extrai os dados da Wikipedia antes das etapas.
+        stages (iterable, optional): Etapas a executar (subconjunto de STAGES).
+        site_output (str, optional): JSON de dados da página estática.
+        plot_output (str, optional): Imagem do gráfico estático.
+        animation_output (str, optional): Arquivo da animação (formato pela extensão).
+        fps (int, optional): Frames por segundo da animação.
+        duration (int, optional): Pausa em segundos no final da animação.
+        workers (int, optional): Processos para desenhar os frames da animação.
+        tween (int, optional): Frames interpolados entre anos consecutivos.
+        jobs (int, optional): Processos para as etapas. Com 1 (padrão), as
+            etapas rodam uma após a outra no processo atual.
+        manifest (str, optional): Manifesto de build; etapas cujos dados e
+            parâmetros não mudaram desde a última execução são puladas.
+
+    Returns:
+        dict: Tempo em segundos de cada etapa executada, mais o total.
+    """
+    unknown = set(stages) - set(STAGES)
+    stages = [stage for stage in STAGES if stage in set(stages)]
+    if unknown:
+        raise ValueError(f"Etapas desconhecidas: {', '.join(sorted(unknown))}.")
+
+    # A animação é validada antes de extrair ou carregar qualquer coisa.
+    if "animate" in stages:
+        from goal500.visualization.plots import _check_animation_args
+
+        _check_animation_args(animation_output, tween)
+
+    tasks = build_tasks(input_file, extract, stages, site_output, plot_output,
+                        animation_output, fps, duration, workers, tween, manifest)
+    start = time.perf_counter()
+    _, timings = run_dag(tasks, jobs)
+    timings["total"] = time.perf_counter() - start
+
+    _print_timings(timings)
+    path, length = critical_path(tasks, timings)
+    print(f"Caminho crítico: {' -> '.join(path)} ({length:.3f} s)")
+    return timings
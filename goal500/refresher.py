@@ -0,0 +1,432 @@
+"""
+Atualização contínua (`goal500 refresh-daemon`): reextrai cada jogador com uma
+frequência que depende da sua atividade, dentro de um orçamento de requisições.
+
+- Intervalo: quem marcou gols nos dois últimos anos dos dados é revisitado a
+  cada BASE_INTERVAL / (1 + gols recentes / GOALS_SCALE) (no mínimo
+  MIN_INTERVAL); quem não marcou, a cada RETIRED_INTERVAL.
+- Fila de prioridade (heapq) pelo próximo horário de cada jogador (última
+  atualização + intervalo): os mais atrasados primeiro e, nos empates, quem
+  marcou mais gols recentemente. Jogadores novos entram vencidos.
+- Orçamento: um token bucket com `budget` requisições por hora. Cada
+  requisição HTTP gasta um token. Por isso fetch_page roda sem novas
+  tentativas: uma falha só reagenda o jogador (com espera crescente), e um 429
+  pausa tudo pelo Retry-After.
+- Revisões: a cada ciclo, uma única consulta à API (get_revisions) diz quais
+  páginas vencidas mudaram desde a última extração; as outras são só
+  reagendadas, sem baixar a página.
+- Saídas: cada página baixada é gravada no banco SQLite (goal500.storage, um
+  registro em scrape_runs por ciclo). Se os dados de algum jogador mudaram, o
+  ciclo também grava um snapshot (goal500.snapshots) e/ou o CSV completo
+  (que `goal500 watch` e `goal500 serve` acompanham).
+
+A agenda (horários, revisões, falhas e o saldo do orçamento) fica num JSON
+gravado atomicamente ao fim de cada ciclo: ao reiniciar, o daemon continua de
+onde parou, sem repetir extrações nem ganhar orçamento extra.
+"""
+
+import heapq
+import json
+import os
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+
+from goal500 import storage
+from goal500.scrapers.wikipedia import (MAX_TITLES, fetch_page, get_active_players, get_revisions,
+                                        page_title, parse_career_tables)
+from goal500.utils.manifest import atomic_path, atomic_write
+
+HOUR = 3600.0
+BASE_INTERVAL = 7 * 24 * HOUR
+MIN_INTERVAL = 6 * HOUR
+RETIRED_INTERVAL = 30 * 24 * HOUR
+GOALS_SCALE = 10.0
+# Espera após uma falha: RETRY_DELAY * 2**(falhas - 1), no máximo o intervalo normal.
+RETRY_DELAY = 15 * 60.0
+# Pausa após um 429 sem Retry-After.
+DEFAULT_PAUSE = 60.0
+SCHEDULE_VERSION = 1
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+def _timestamp(iso):
+    return datetime.fromisoformat(iso).timestamp() if iso else None
+
+
+def refresh_interval(recent_goals):
+    """
+    Intervalo, em segundos, entre duas extrações de um jogador.
+
+    Args:
+        recent_goals (int): gols nos dois últimos anos dos dados (None se o
+            jogador ainda não foi extraído).
+
+    Returns:
+        float: segundos.
+    """
+    if recent_goals is None:
+        return MIN_INTERVAL
+    if recent_goals <= 0:
+        return RETIRED_INTERVAL
+    return max(MIN_INTERVAL, BASE_INTERVAL / (1 + recent_goals / GOALS_SCALE))
+
+
+class TokenBucket:
+    """
+    Orçamento de requisições: `per_hour` tokens por hora, acumulando até `capacity`.
+
+    Args:
+        per_hour (float): requisições permitidas por hora.
+        capacity (float, optional): saldo máximo (rajada); por padrão, per_hour.
+        tokens (float, optional): saldo inicial; por padrão, a capacidade.
+        updated_at (float, optional): instante (epoch) do saldo inicial.
+    """
+
+    def __init__(self, per_hour, capacity=None, tokens=None, updated_at=None):
+        if per_hour <= 0:
+            raise ValueError("O orçamento precisa ser positivo.")
+        self.rate = per_hour / HOUR
+        self.capacity = float(capacity or per_hour)
+        self.tokens = self.capacity if tokens is None else min(float(tokens), self.capacity)
+        self.updated_at = updated_at
+
+    def refill(self, now):
+        """Soma os tokens acumulados desde a última atualização."""
+        if self.updated_at is not None and now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now if self.updated_at is None else max(now, self.updated_at)
+
+    def take(self, now, n=1):
+        """Gasta `n` tokens se houver saldo; retorna se gastou."""
+        self.refill(now)
+        if self.tokens + 1e-9 < n:
+            return False
+        self.tokens -= n
+        return True
+
+    def wait(self, now, n=1):
+        """Segundos até haver `n` tokens (0 se já houver)."""
+        self.refill(now)
+        return max(0.0, (n - self.tokens) / self.rate)
+
+
+class Refresher:
+    """
+    Estado do daemon: agenda por jogador, fila de prioridade e orçamento.
+
+    Args:
+        db (str, optional): banco SQLite onde os dados são gravados.
+        schedule_file (str, optional): JSON com a agenda persistida.
+        budget (float, optional): requisições HTTP por hora.
+        base_url (str, optional): outro servidor no lugar da Wikipedia (ver wiki_url).
+        players (pd.DataFrame, optional): jogadores acompanhados (name e link);
+            por padrão, get_active_players(base_url). Os já agendados ou já no
+            banco continuam na agenda.
+        snapshots (str, optional): diretório do histórico de snapshots.
+        output (str, optional): CSV reescrito quando os dados mudam.
+        clock (callable, optional): relógio (epoch em segundos); útil em testes.
+    """
+
+    def __init__(self, db="data/goal500.db", schedule_file="data/refresh_schedule.json", budget=60,
+                 base_url=None, players=None, snapshots=None, output=None, clock=time.time):
+        self.db = db
+        self.schedule_file = schedule_file
+        self.snapshots = snapshots
+        self.output = output
+        self.clock = clock
+        self._session = requests.Session()
+        self._conn = storage.connect(db)
+
+        saved = self._load()
+        budget_state = saved.get("budget", {})
+        self.bucket = TokenBucket(budget, tokens=budget_state.get("tokens"),
+                                  updated_at=_timestamp(budget_state.get("updated_at")))
+        self.paused_until = _timestamp(saved.get("paused_until"))
+        self.schedule = saved.get("players", {})
+
+        if players is None:
+            players = get_active_players(base_url)
+        stored = dict(self._conn.execute("SELECT name, link FROM players WHERE link IS NOT NULL"))
+        recent = self._recent_goals()
+        now = self.clock()
+        for name, link in [*stored.items(), *zip(players["name"], players["link"])]:
+            entry = self.schedule.setdefault(name, {"due_at": _iso(now), "last_refresh": None,
+                                                    "revid": None, "failures": 0})
+            entry["link"] = link
+            entry.setdefault("recent_goals", recent.get(name))
+        self._queue = [(_timestamp(entry["due_at"]), -(entry["recent_goals"] or 0), name)
+                       for name, entry in self.schedule.items()]
+        heapq.heapify(self._queue)
+
+    def close(self):
+        """Fecha a sessão HTTP e o banco."""
+        self._session.close()
+        self._conn.close()
+
+    def _load(self):
+        if not os.path.exists(self.schedule_file):
+            return {}
+        with open(self.schedule_file, encoding="utf-8") as fh:
+            saved = json.load(fh)
+        if saved.get("version") != SCHEDULE_VERSION:
+            raise ValueError(f"Agenda {self.schedule_file} em formato desconhecido.")
+        return saved
+
+    def save(self):
+        """Grava a agenda e o saldo do orçamento (atomicamente)."""
+        state = {
+            "version": SCHEDULE_VERSION,
+            "budget": {"tokens": round(self.bucket.tokens, 6),
+                       "updated_at": _iso(self.bucket.updated_at or self.clock())},
+            "paused_until": _iso(self.paused_until) if self.paused_until else None,
+            "players": self.schedule,
+        }
+        atomic_write(self.schedule_file, json.dumps(state, ensure_ascii=False, indent=2) + "\n")
+
+    def _recent_goals(self, names=None):
+        """Gols de cada jogador nos dois últimos anos presentes no banco."""
+        (last_year,) = self._conn.execute("SELECT MAX(year) FROM seasons").fetchone()
+        if last_year is None:
+            return {}
+        where, params = "", [last_year - 1]
+        if names:
+            where = f"AND p.name IN ({', '.join('?' * len(names))})"
+            params.extend(names)
+        rows = self._conn.execute(
+            f"""
+            SELECT p.name, COALESCE(SUM(CASE WHEN s.year >= ? THEN s.total END), 0)
+            FROM players p LEFT JOIN seasons s ON s.player_id = p.id
+            WHERE 1 = 1 {where}
+            GROUP BY p.name
+            """,
+            params,
+        ).fetchall()
+        return dict(rows)
+
+    def _reschedule(self, name, now, delay=None):
+        entry = self.schedule[name]
+        if delay is None:
+            delay = refresh_interval(entry["recent_goals"])
+        entry["due_at"] = _iso(now + delay)
+        heapq.heappush(self._queue, (now + delay, -(entry["recent_goals"] or 0), name))
+
+    def _fail(self, name, now):
+        entry = self.schedule[name]
+        entry["failures"] += 1
+        delay = min(RETRY_DELAY * 2 ** (entry["failures"] - 1), refresh_interval(entry["recent_goals"]))
+        self._reschedule(name, now, delay)
+
+    def queue(self):
+        """Agenda ordenada por prioridade: lista de (próximo horário, nome, entrada)."""
+        return [(due_at, name, self.schedule[name]) for due_at, _, name in sorted(self._queue)]
+
+    def next_delay(self):
+        """Segundos até o próximo ciclo com trabalho (vencimento, pausa ou orçamento)."""
+        now = self.clock()
+        if self.paused_until and self.paused_until > now:
+            return self.paused_until - now
+        if not self._queue:
+            return HOUR
+        return max(self._queue[0][0] - now, self.bucket.wait(now, 2), 0.0)
+
+    def _due(self, now):
+        """Retira da fila os jogadores vencidos que o orçamento comporta neste ciclo."""
+        # Um token para a consulta de revisões e um para cada página.
+        budget = min(int(self.bucket.tokens + 1e-9) - 1, MAX_TITLES)
+        due = []
+        while self._queue and self._queue[0][0] <= now and len(due) < budget:
+            due.append(heapq.heappop(self._queue)[2])
+        return due
+
+    def _check_revisions(self, names, now):
+        """Separa os vencidos cujas páginas não mudaram; os demais devem ser baixados."""
+        by_server = {}
+        for name in names:
+            parts = urlsplit(self.schedule[name]["link"])
+            by_server.setdefault(f"{parts.scheme}://{parts.netloc}", []).append(name)
+
+        changed = []
+        for base_url, group in by_server.items():
+            if not self.bucket.take(now):
+                changed.extend(group)
+                continue
+            try:
+                revisions = get_revisions([page_title(self.schedule[n]["link"]) for n in group],
+                                          base_url, session=self._session, retries=0)
+            except requests.RequestException as exc:
+                self._handle_error(exc, now)
+                changed.extend(group)
+                continue
+            for name in group:
+                entry = self.schedule[name]
+                entry["latest_revid"] = revisions.get(page_title(entry["link"]))
+                if entry["revid"] is not None and entry["latest_revid"] == entry["revid"]:
+                    entry["last_refresh"] = _iso(now)
+                    entry["failures"] = 0
+                    self._reschedule(name, now)
+                else:
+                    changed.append(name)
+        return changed
+
+    def _handle_error(self, exc, now):
+        """Pausa o daemon após um 429 (respeitando o Retry-After)."""
+        response = getattr(exc, "response", None)
+        if response is not None and response.status_code == 429:
+            try:
+                pause = float(response.headers.get("Retry-After", DEFAULT_PAUSE))
+            except ValueError:
+                pause = DEFAULT_PAUSE
+            self.paused_until = now + pause
+            print(f"Limite de requisições atingido: pausa de {pause:.0f} s.")
+
+    def run_once(self):
+        """
+        Executa um ciclo: verifica as revisões dos vencidos e baixa os que mudaram.
+
+        Returns:
+            dict: listas de nomes em "checked" (vencidos neste ciclo),
+            "unchanged" (página sem nova revisão), "updated" (dados novos no
+            banco), "fetched" (páginas baixadas) e "failed".
+        """
+        now = self.clock()
+        summary = {"checked": [], "unchanged": [], "fetched": [], "updated": [], "failed": []}
+        if self.paused_until and now < self.paused_until:
+            return summary
+        self.paused_until = None
+        self.bucket.refill(now)
+        due = self._due(now)
+        summary["checked"] = due
+        if not due:
+            self.save()
+            return summary
+
+        changed = self._check_revisions(due, now)
+        summary["unchanged"] = [name for name in due if name not in changed]
+        run_id = storage.start_run(self._conn) if changed else None
+        status = "failed"
+        try:
+            for position, name in enumerate(changed):
+                if self.paused_until or not self.bucket.take(now):
+                    # Sem orçamento (ou em pausa): os restantes voltam à fila como estavam.
+                    for pending in changed[position:]:
+                        heapq.heappush(self._queue, (now, -(self.schedule[pending]["recent_goals"] or 0),
+                                                     pending))
+                    break
+                if self._refresh_player(name, now, run_id):
+                    summary["updated"].append(name)
+                if self.schedule[name]["failures"]:
+                    summary["failed"].append(name)
+                else:
+                    summary["fetched"].append(name)
+            status = "ok"
+        finally:
+            if run_id is not None:
+                storage.finish_run(self._conn, run_id, status)
+            self.save()
+
+        if summary["updated"]:
+            self._write_outputs()
+        return summary
+
+    def _refresh_player(self, name, now, run_id):
+        """Baixa e grava um jogador. Retorna se os dados dele mudaram no banco."""
+        entry = self.schedule[name]
+        revid = entry.pop("latest_revid", None)
+        print(f"Atualizando {name}: {entry['link']}")
+        try:
+            goals = parse_career_tables(fetch_page(entry["link"], session=self._session, retries=0))
+        except requests.RequestException as exc:
+            print(f"Erro ao obter a página de {name}: {exc}")
+            self._handle_error(exc, now)
+            self._fail(name, now)
+            return False
+        if goals.empty:
+            self._fail(name, now)
+            return False
+
+        before = storage.load_stats(self._conn, names=[name])
+        storage.upsert_player(self._conn, name, goals, entry["link"], run_id)
+        after = storage.load_stats(self._conn, names=[name])
+        entry.update(last_refresh=_iso(now), failures=0, revid=revid,
+                     recent_goals=self._recent_goals([name]).get(name, 0))
+        self._reschedule(name, now)
+        return not before.equals(after)
+
+    def _write_outputs(self):
+        if not (self.snapshots or self.output):
+            return
+        data = storage.load_stats(self._conn)
+        if self.snapshots:
+            from goal500.snapshots import save_snapshot
+
+            entry = save_snapshot(data, self.snapshots)
+            print(f"Snapshot {entry['id']} ({entry['kind']}, {entry['changes']} linhas).")
+        if self.output:
+            with atomic_path(self.output) as tmp:
+                data.to_csv(tmp, index=False)
+            print(f"Dados salvos em: {self.output}")
+
+
+def refresh_daemon(db="data/goal500.db", schedule_file="data/refresh_schedule.json", budget=60,
+                   base_url=None, snapshots=None, output=None, once=False, max_sleep=HOUR):
+    """
+    Mantém o banco atualizado até Ctrl+C, um ciclo por vez (ver Refresher).
+
+    Entre os ciclos, dorme até o próximo vencimento, o fim da pausa ou a
+    recarga do orçamento (no máximo `max_sleep` segundos). Os demais
+    argumentos são os de Refresher.
+
+    Args:
+        once (bool, optional): executa um único ciclo e sai.
+        max_sleep (float, optional): maior espera entre ciclos, em segundos.
+
+    Returns:
+        dict: resumo do último ciclo (ver Refresher.run_once).
+    """
+    refresher = Refresher(db, schedule_file, budget, base_url, snapshots=snapshots, output=output)
+    summary = {}
+    try:
+        while True:
+            summary = refresher.run_once()
+            if summary["checked"]:
+                print(f"Ciclo: {len(summary['checked'])} vencidos, {len(summary['unchanged'])} sem "
+                      f"mudanças, {len(summary['fetched'])} baixados, {len(summary['updated'])} "
+                      f"atualizados, {len(summary['failed'])} falhas "
+                      f"(orçamento: {refresher.bucket.tokens:.1f} requisições).")
+            if once:
+                break
+            delay = min(refresher.next_delay(), max_sleep)
+            print(f"Próximo ciclo em {delay:.0f} s (Ctrl+C para sair)...")
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        print("\nEncerrando o refresh-daemon.")
+    finally:
+        refresher.save()
+        refresher.close()
+    return summary
+
+
+def schedule_table(schedule_file="data/refresh_schedule.json"):
+    """
+    A agenda persistida como tabela, na ordem em que os jogadores serão atualizados.
+
+    Returns:
+        pd.DataFrame: name, due_at, last_refresh, recent_goals, interval_hours e failures.
+    """
+    if not os.path.exists(schedule_file):
+        raise FileNotFoundError(schedule_file)
+    with open(schedule_file, encoding="utf-8") as fh:
+        players = json.load(fh)["players"]
+    rows = [(name, entry["due_at"], entry["last_refresh"], entry["recent_goals"],
+             round(refresh_interval(entry["recent_goals"]) / HOUR, 1), entry["failures"])
+            for name, entry in players.items()]
+    table = pd.DataFrame(rows, columns=["name", "due_at", "last_refresh", "recent_goals",
+                                        "interval_hours", "failures"])
+    return table.sort_values(["due_at", "recent_goals"], ascending=[True, False], ignore_index=True)
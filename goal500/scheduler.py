@@ -0,0 +1,121 @@
+"""
+Executor mínimo de grafos de tarefas (DAG) para as etapas do pipeline.
+
+Cada tarefa declara as tarefas de que depende; os resultados delas são
+passados como argumentos posicionais, na ordem declarada. Tarefas cujas
+dependências já terminaram rodam em paralelo num pool de processos.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+def _timed_call(func, args, kwargs):
+    """Executa a tarefa e mede o tempo dentro do processo que a executou."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _check_graph(tasks):
+    """
+    Valida as dependências e retorna as tarefas em ordem topológica.
+
+    Raises:
+        ValueError: se uma dependência não existe ou se há ciclo.
+    """
+    order = []
+    state = {}  # 1 = visitando, 2 = concluída
+
+    def visit(name, path):
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Ciclo entre as tarefas: {' -> '.join(path + [name])}.")
+        state[name] = 1
+        for dep in tasks[name][1]:
+            if dep not in tasks:
+                raise ValueError(f"A tarefa {name!r} depende de {dep!r}, que não existe.")
+            visit(dep, path + [name])
+        state[name] = 2
+        order.append(name)
+
+    for name in tasks:
+        visit(name, [])
+    return order
+
+
+def critical_path(tasks, durations):
+    """
+    Calcula o caminho crítico: a cadeia de dependências com maior tempo somado.
+
+    Args:
+        tasks (dict): grafo no formato de run_dag.
+        durations (dict): tempo em segundos de cada tarefa.
+
+    Returns:
+        tuple: (lista de tarefas do caminho, tempo total do caminho em segundos).
+    """
+    finish = {}
+    previous = {}
+    for name in _check_graph(tasks):
+        deps = tasks[name][1]
+        before = max(deps, key=lambda dep: finish[dep]) if deps else None
+        previous[name] = before
+        finish[name] = durations[name] + (finish[before] if before else 0.0)
+
+    if not finish:
+        return [], 0.0
+    name = max(finish, key=finish.get)
+    length = finish[name]
+    path = []
+    while name is not None:
+        path.append(name)
+        name = previous[name]
+    return path[::-1], length
+
+
+def run_dag(tasks, jobs=1):
+    """
+    Executa um grafo de tarefas respeitando as dependências.
+
+    Args:
+        tasks (dict): nome -> (função, dependências, kwargs). A função recebe os
+            resultados das dependências como argumentos posicionais, seguidos
+            dos kwargs. Com `jobs > 1`, funções, argumentos e resultados
+            precisam ser serializáveis (pickle).
+        jobs (int, optional): número de processos. Com 1, tudo roda em ordem
+            topológica no processo atual.
+
+    Returns:
+        tuple: (resultados, durações) — dicionários indexados pelo nome da tarefa,
+        na ordem em que as tarefas foram declaradas.
+    """
+    order = _check_graph(tasks)
+    results = {}
+    durations = {}
+
+    def call_args(name):
+        func, deps, kwargs = tasks[name]
+        return func, tuple(results[dep] for dep in deps), kwargs or {}
+
+    if jobs <= 1:
+        for name in order:
+            results[name], durations[name] = _timed_call(*call_args(name))
+    else:
+        waiting = {name: set(tasks[name][1]) for name in order}
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            running = {}
+            while waiting or running:
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[executor.submit(_timed_call, *call_args(name))] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name], durations[name] = future.result()
+                    for deps in waiting.values():
+                        deps.discard(name)
+
+    return ({name: results[name] for name in tasks},
+            {name: durations[name] for name in tasks})
@@ -2,36 +2,70 @@
 Módulo para extrair dados de gols de jogadores de futebol da Wikipedia.
 """
 
+import json
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 from urllib.error import URLError
+from urllib.parse import unquote, urlencode, urlsplit
 import pandas as pd
 import requests
 
+from goal500.utils import instrument
 
-def wiki_url(path):
+WIKIPEDIA_URL = "https://en.wikipedia.org"
+HEADERS = {"User-Agent": "goal500-python/0.1 (https://github.com/jtrecenti/goal500-python)"}
+
+# Jogadores acompanhados: nome e caminho da página na Wikipedia.
+TRACKED_PLAYERS = [
+    ("Cristiano Ronaldo", "/wiki/Cristiano_Ronaldo"),
+    ("Lionel Messi", "/wiki/Lionel_Messi"),
+    ("Robert Lewandowski", "/wiki/Robert_Lewandowski"),
+    ("Neymar Jr", "/wiki/Neymar"),
+    ("Erling Haaland", "/wiki/Erling_Haaland"),
+    ("Kylian Mbappé", "/wiki/Kylian_Mbapp%C3%A9"),
+    ("Harry Kane", "/wiki/Harry_Kane"),
+    ("Luis Suárez", "/wiki/Luis_Su%C3%A1rez"),
+]
+
+# Competições do detalhamento por temporada (ver parse_player_page).
+COMPETITIONS = ("league", "cup", "continental", "other", "national_team")
+COMPETITION_COLUMNS = ["year", "type", "competition", "apps", "goals"]
+
+# Data de nascimento no infobox: <span class="bday">1987-06-24</span>.
+_BIRTH_DATE = re.compile(r'class="bday"[^>]*>\s*(\d{4}-\d{2}-\d{2})')
+
+# Títulos por consulta de revisões (limite da API do MediaWiki para clientes comuns).
+MAX_TITLES = 50
+
+# Respostas que valem nova tentativa: limite de taxa e erros temporários do servidor.
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Espera máxima, em segundos, pedida por um Retry-After que seja respeitada.
+MAX_RETRY_AFTER = 60
+
+
+def wiki_url(path, base_url=None):
     """
     Constrói a URL completa da Wikipedia a partir de um caminho.
+
+    Args:
+        path (str): caminho da página (ex.: "/wiki/Harry_Kane").
+        base_url (str, optional): outro servidor no lugar da Wikipedia (ex.: o
+            servidor local de goal500.bench_fixtures).
     """
-    return f"https://en.wikipedia.org{path}"
+    return f"{(base_url or WIKIPEDIA_URL).rstrip('/')}{path}"
 
 
-def get_active_players():
+def get_active_players(base_url=None):
     """
     Retorna uma lista de jogadores ativos com seus nomes e links para suas páginas na Wikipedia.
+
+    Args:
+        base_url (str, optional): servidor usado nos links (ver wiki_url).
     """
-    players = [
-        ("Cristiano Ronaldo",
-         "https://en.wikipedia.org/wiki/Cristiano_Ronaldo"),
-        ("Lionel Messi", "https://en.wikipedia.org/wiki/Lionel_Messi"),
-        ("Robert Lewandowski",
-         "https://en.wikipedia.org/wiki/Robert_Lewandowski"),
-        ("Neymar Jr", "https://en.wikipedia.org/wiki/Neymar"),
-        ("Erling Haaland", "https://en.wikipedia.org/wiki/Erling_Haaland"),
-        ("Kylian Mbappé", "https://en.wikipedia.org/wiki/Kylian_Mbapp%C3%A9"),
-        ("Harry Kane", "https://en.wikipedia.org/wiki/Harry_Kane"),
-        ("Luis Suárez", "https://en.wikipedia.org/wiki/Luis_Su%C3%A1rez"),
-    ]
+    players = [(name, wiki_url(path, base_url)) for name, path in TRACKED_PLAYERS]
     return pd.DataFrame(players, columns=["name", "link"])
 
 
@@ -88,7 +122,211 @@ def _extract_rows(table, key_col, goal_col, kind):
     return rows
 
 
-def extract_goals_by_year(url):
+def _competition(group):
+    """
+    Classifica um grupo de colunas da tabela de clube (ex.: "National cup[a]").
+
+    Returns:
+        str: "league", "cup", "continental" ou "other"; None para "Total" (e
+        para colunas sem grupo).
+    """
+    group = re.sub(r"\[[^\]]*\]", "", group).strip().lower()
+    if not group or "total" in group:
+        return None
+    if any(word in group for word in ("cup", "copa", "coupe", "coppa", "pokal", "taça")):
+        return "cup"
+    if any(word in group for word in ("continental", "europe", "uefa", "champions",
+                                      "conmebol", "concacaf", "afc", "caf")):
+        return "continental"
+    if "league" in group or "division" in group:
+        return "league"
+    return "other"
+
+
+def _competition_columns(cols, goal_col, kind):
+    """
+    Colunas de partidas e gols de cada competição: lista de (competição, apps, goals).
+
+    Na tabela de clube, cada grupo de colunas (League, National cup, Europe...)
+    vira uma competição; grupos diferentes da mesma competição (ex.: copa
+    nacional e copa da liga) são somados depois. Na de seleção, vale o total
+    do ano (a coluna de gols escolhida e a última de partidas).
+    """
+    if kind == "international":
+        apps_cols = [c for c in cols if "Apps" in c]
+        return [("national_team", apps_cols[-1] if apps_cols else None, goal_col)]
+
+    groups = {}
+    for col in cols:
+        match = re.fullmatch(r"(.*?)\s*(Apps|Goals)", re.sub(r"\[[^\]]*\]", "", col).strip())
+        if match:
+            groups.setdefault(match.group(1), {})[match.group(2)] = col
+    return [(_competition(group), stats.get("Apps"), stats.get("Goals"))
+            for group, stats in groups.items() if _competition(group) and "Goals" in stats]
+
+
+def _extract_competitions(table, key_col, columns, kind):
+    """
+    Extrai (year, type, competition, apps, goals) das linhas com ano (ver _extract_rows).
+
+    As tabelas têm dezenas de linhas: listas e regex simples saem bem mais
+    baratos que operações vetorizadas do pandas, que custam caro por chamada.
+    """
+    cells = [(competition, table[apps_col].tolist() if apps_col else None, table[goals_col].tolist())
+             for competition, apps_col, goals_col in columns]
+    rows = []
+    for i, key in enumerate(table[key_col].tolist()):
+        year_match = re.search(r"(\d{4})", str(key))
+        if not year_match:
+            continue
+        year = int(year_match.group(1))
+        for competition, apps, goals in cells:
+            rows.append((year, kind, competition,
+                         _parse_goals(apps[i]) if apps is not None else 0, _parse_goals(goals[i])))
+    return rows
+
+
+def _competition_frame(rows):
+    """
+    Monta o formato longo compacto a partir das linhas de _extract_competitions.
+
+    Uma linha por (year, type, competition), na ordem em que aparecem na
+    página, somando linhas da mesma temporada (ex.: dois clubes) e omitindo as
+    que têm zero partidas e zero gols.
+    """
+    totals = {}
+    for year, kind, competition, apps, goals in rows:
+        key = (year, kind, competition)
+        previous = totals.get(key, (0, 0))
+        totals[key] = (previous[0] + apps, previous[1] + goals)
+    data = pd.DataFrame([key + value for key, value in totals.items() if value != (0, 0)],
+                        columns=COMPETITION_COLUMNS)
+    return data.astype({
+        "year": "int16",
+        "type": pd.CategoricalDtype(["club", "international"]),
+        "competition": pd.CategoricalDtype(COMPETITIONS),
+        "apps": "int32",
+        "goals": "int32",
+    })
+
+
+def _retry_delay(response, attempt, backoff):
+    """Espera antes da próxima tentativa: o Retry-After do servidor ou backoff exponencial."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return min(float(retry_after), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return backoff * 2 ** attempt
+
+
+def fetch_page(url, session=None, retries=3, backoff=0.5, cache=None, timeout=30):
+    """
+    Baixa uma página, com novas tentativas e revalidação pelo ETag.
+
+    Respostas 429 e 5xx e falhas de conexão são tentadas de novo até `retries`
+    vezes, esperando o Retry-After do servidor (no máximo MAX_RETRY_AFTER
+    segundos) ou `backoff * 2**tentativa`.
+
+    Args:
+        url (str): endereço da página.
+        session (requests.Session, optional): sessão reaproveitada entre
+            páginas (mantém as conexões abertas); sem ela, usa requests.get.
+        retries (int, optional): novas tentativas após a primeira.
+        backoff (float, optional): espera base, em segundos, sem Retry-After.
+        cache (dict, optional): url -> (etag, html). Se a página estiver no
+            cache, a requisição leva If-None-Match e um 304 devolve o HTML
+            guardado; respostas 200 com ETag atualizam o cache.
+        timeout (float, optional): tempo limite de cada requisição, em segundos.
+
+    Returns:
+        str: o HTML da página.
+
+    Raises:
+        requests.RequestException: erro HTTP ou de rede após as tentativas.
+    """
+    client = session or requests
+    headers = dict(HEADERS)
+    cached = cache.get(url) if cache is not None else None
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    for attempt in range(retries + 1):
+        try:
+            response = client.get(url, timeout=timeout, headers=headers)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            time.sleep(_retry_delay(None, attempt, backoff))
+            continue
+        if response.status_code in RETRY_STATUS and attempt < retries:
+            time.sleep(_retry_delay(response, attempt, backoff))
+            continue
+        break
+
+    if cached and response.status_code == 304:
+        return cached[1]
+    response.raise_for_status()
+    etag = response.headers.get("ETag")
+    if cache is not None and etag:
+        cache[url] = (etag, response.text)
+    return response.text
+
+
+def page_title(link):
+    """Título da página (com sublinhados) a partir do link ou do caminho /wiki/..."""
+    return unquote(urlsplit(link).path.rsplit("/wiki/", 1)[-1])
+
+
+def get_revisions(titles, base_url=None, session=None, retries=3, timeout=30):
+    """
+    Revisão atual de várias páginas numa única requisição à API do MediaWiki.
+
+    Serve para saber, sem baixar as páginas, quais mudaram desde a última
+    extração (a revisão muda a cada edição). Redirecionamentos são seguidos
+    (redirects=1), como faz /wiki/<título>: a revisão é a da página de destino.
+    A API devolve os títulos normalizados e já redirecionados; eles são
+    mapeados de volta para os títulos pedidos.
+
+    Args:
+        titles (list): títulos das páginas (ver page_title), no máximo MAX_TITLES.
+        base_url (str, optional): outro servidor no lugar da Wikipedia (ver wiki_url).
+        session, retries, timeout: repassados a fetch_page.
+
+    Returns:
+        dict: título pedido (com sublinhados) -> revid (int), ou None se a
+        página não existe.
+
+    Raises:
+        ValueError: mais de MAX_TITLES títulos.
+        requests.RequestException: erro HTTP ou de rede após as tentativas.
+    """
+    titles = [title.replace(" ", "_") for title in titles]
+    if len(titles) > MAX_TITLES:
+        raise ValueError(f"No máximo {MAX_TITLES} títulos por consulta (recebidos {len(titles)}).")
+    if not titles:
+        return {}
+    query = urlencode({"action": "query", "prop": "revisions", "rvprop": "ids|timestamp",
+                       "redirects": 1, "titles": "|".join(titles), "format": "json"})
+    url = wiki_url(f"/w/api.php?{query}", base_url)
+    result = json.loads(fetch_page(url, session=session, retries=retries, timeout=timeout))
+    result = result.get("query", {})
+    normalized = {item["from"]: item["to"] for item in result.get("normalized", [])}
+    redirects = {item["from"]: item["to"] for item in result.get("redirects", [])}
+    by_title = {page["title"].replace(" ", "_"): page["revisions"][0]["revid"]
+                for page in result.get("pages", {}).values() if "revisions" in page}
+
+    revisions = {}
+    for title in titles:
+        current = normalized.get(title, title)
+        for _ in range(len(redirects)):  # cadeias de redirecionamento
+            if current not in redirects:
+                break
+            current = redirects[current]
+        revisions[title] = by_title.get(current.replace(" ", "_"))
+    return revisions
+
+
+def extract_goals_by_year(url, session=None, retries=3, cache=None):
     """
     Extrai os gols por ano de um jogador a partir da sua página na Wikipedia (em inglês).
 
@@ -96,22 +334,42 @@ def extract_goals_by_year(url):
     (coluna "Year"), somando sempre a coluna "Total Goals" de cada linha. Os totais
     resultantes batem com a linha "Career total" da própria página.
 
+    Args:
+        url (str): endereço da página do jogador.
+        session, retries, cache: repassados a fetch_page.
+
     Returns:
         pd.DataFrame: DataFrame com as colunas 'year', 'total' e 'type'.
     """
     print(f"Extraindo dados de: {url}")
-    headers = {"User-Agent": "goal500-python/0.1 (https://github.com/jtrecenti/goal500-python)"}
     try:
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
-        # flavor='lxml' torna o parsing determinístico e evita depender de html5lib.
-        tables = pd.read_html(StringIO(response.text), flavor="lxml")
-    except (ValueError, URLError, requests.RequestException) as e:
+        with instrument.stage("scraper.fetch"):
+            html = fetch_page(url, session=session, retries=retries, cache=cache)
+    except (URLError, requests.RequestException) as e:
         print(f"Erro ao obter/parsear a página: {e}")
         return pd.DataFrame(columns=["year", "total", "type"])
+    return parse_career_tables(html)
 
-    club_data = []
-    international_data = []
+
+def _read_tables(html):
+    """Lê as tabelas do HTML; None (com aviso) se não houver nenhuma."""
+    try:
+        # flavor='lxml' torna o parsing determinístico e evita depender de html5lib.
+        return pd.read_html(StringIO(html), flavor="lxml")
+    except ValueError as e:
+        print(f"Erro ao obter/parsear a página: {e}")
+        return None
+
+
+def _career_tables(tables):
+    """
+    Encontra as tabelas "Career statistics" de clube e de seleção.
+
+    Returns:
+        list: (tabela, colunas, coluna-chave, coluna de gols, tipo) de cada
+        tabela encontrada, a de clube primeiro.
+    """
+    found = []
     club_done = False
     international_done = False
 
@@ -124,47 +382,225 @@ def extract_goals_by_year(url):
         # Tabela de clube: tem a coluna "Season".
         if not club_done and any("Season" in col for col in cols):
             season_col = next(col for col in cols if "Season" in col)
-            club_data = _extract_rows(table, season_col, goal_col, "club")
+            found.append((table, cols, season_col, goal_col, "club"))
             club_done = True
 
         # Tabela de seleção: tem a coluna "Year" (mas não "Season").
         elif not international_done and any("Year" in col for col in cols):
             year_col = next(col for col in cols if "Year" in col)
-            international_data = _extract_rows(table, year_col, goal_col, "international")
+            found.append((table, cols, year_col, goal_col, "international"))
             international_done = True
 
         if club_done and international_done:
             break
 
-    return pd.DataFrame(club_data + international_data)
+    found.sort(key=lambda item: item[4] != "club")
+    return found
 
 
-def get_player_stats():
+@instrument.instrumented("scraper.parse")
+def parse_career_tables(html):
     """
-    Obtém estatísticas de gols por ano para todos os jogadores ativos.
-    
+    Extrai os gols por ano do HTML de uma página de jogador (ver extract_goals_by_year).
+
+    Args:
+        html (str): conteúdo HTML da página.
+
     Returns:
-        pd.DataFrame: DataFrame com as colunas 'name', 'year', 'total' e 'type'.
+        pd.DataFrame: DataFrame com as colunas 'year', 'total' e 'type'.
+    """
+    tables = _read_tables(html)
+    if tables is None:
+        return pd.DataFrame(columns=["year", "total", "type"])
+
+    rows = []
+    for table, _, key_col, goal_col, kind in _career_tables(tables):
+        rows += _extract_rows(table, key_col, goal_col, kind)
+    return pd.DataFrame(rows)
+
+
+def _empty_player_page():
+    return {"goals": pd.DataFrame(columns=["year", "total", "type"]),
+            "competitions": _competition_frame([]), "birth_date": None}
+
+
+@instrument.instrumented("scraper.parse")
+def parse_player_page(html):
     """
-    players = get_active_players()
-    all_stats = []
+    Extrai todos os dados de uma página de jogador numa única leitura das tabelas.
+
+    Args:
+        html (str): conteúdo HTML da página.
 
-    for _, player in players.iterrows():
+    Returns:
+        dict: "goals" (o mesmo DataFrame de parse_career_tables), "competitions"
+        (formato longo: year, type, competition, apps e goals por temporada; ver
+        _competition_frame) e "birth_date" (AAAA-MM-DD do infobox, ou None).
+    """
+    match = _BIRTH_DATE.search(html)
+    result = _empty_player_page()
+    result["birth_date"] = match.group(1) if match else None
+    tables = _read_tables(html)
+    if tables is None:
+        return result
+
+    rows = []
+    competitions = []
+    for table, cols, key_col, goal_col, kind in _career_tables(tables):
+        rows += _extract_rows(table, key_col, goal_col, kind)
+        competitions += _extract_competitions(table, key_col,
+                                              _competition_columns(cols, goal_col, kind), kind)
+    result["goals"] = pd.DataFrame(rows)
+    result["competitions"] = _competition_frame(competitions)
+    return result
+
+
+def extract_player_data(url, session=None, retries=3, cache=None):
+    """
+    Baixa a página de um jogador uma vez e extrai todos os dados (ver parse_player_page).
+
+    Args:
+        url (str): endereço da página do jogador.
+        session, retries, cache: repassados a fetch_page.
+
+    Returns:
+        dict: "goals", "competitions" e "birth_date"; vazios se a página não
+        puder ser obtida.
+    """
+    print(f"Extraindo dados de: {url}")
+    try:
+        with instrument.stage("scraper.fetch"):
+            html = fetch_page(url, session=session, retries=retries, cache=cache)
+    except (URLError, requests.RequestException) as e:
+        print(f"Erro ao obter/parsear a página: {e}")
+        return _empty_player_page()
+    return parse_player_page(html)
+
+
+def _scrape_players(players, extract, db, workers, retries, cache):
+    """
+    Extrai os jogadores em paralelo e grava cada um no banco, na ordem da lista.
+
+    Args:
+        players (pd.DataFrame): colunas name e link.
+        extract (callable): extract(link, session=, retries=, cache=) -> dict
+            com pelo menos "goals".
+        db, workers, retries, cache: ver get_player_stats.
+
+    Returns:
+        list: (name, link, resultado de extract) dos jogadores com gols extraídos.
+    """
+    local = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def scrape(link):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+            with sessions_lock:
+                sessions.append(session)
         try:
-            player_stats = extract_goals_by_year(player["link"])
-            if not player_stats.empty:
-                player_stats["name"] = player["name"]
-                all_stats.append(player_stats)
+            return extract(link, session=session, retries=retries, cache=cache)
         except ValueError as e:
             print(f"Erro de valor: {e}")
         except URLError as e:
             print(f"Erro de rede: {e}")
+        return None
+
+    scraped = []
+    conn = run_id = None
+    if db:
+        from goal500 import storage
+
+        conn = storage.connect(db)
+        run_id = storage.start_run(conn)
+    status = "failed"
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        # map devolve na ordem dos jogadores; o banco só é usado nesta thread.
+        results = executor.map(scrape, players["link"])
+        for name, link, result in zip(players["name"], players["link"], results):
+            if result is None or result["goals"].empty:
+                continue
+            result["goals"]["name"] = name
+            scraped.append((name, link, result))
+            if conn is not None:
+                storage.upsert_player(conn, name, result["goals"], link, run_id)
+        status = "ok"
+    finally:
+        executor.shutdown(cancel_futures=True)
+        for session in sessions:
+            session.close()
+        if conn is not None:
+            storage.finish_run(conn, run_id, status)
+            conn.close()
+    return scraped
 
-    if all_stats:
-        return pd.concat(all_stats, ignore_index=True)
+
+def _concat_goals(scraped):
+    if scraped:
+        return pd.concat([result["goals"] for _, _, result in scraped], ignore_index=True)
     return pd.DataFrame(columns=["name", "year", "total", "type"])
 
 
+def get_player_stats(db=None, base_url=None, workers=1, retries=3, cache=None, players=None):
+    """
+    Obtém estatísticas de gols por ano para todos os jogadores ativos.
+
+    Args:
+        db (str, optional): banco SQLite (goal500.storage) onde cada jogador é
+            gravado, na sua própria transação, logo após ser extraído. A
+            execução fica registrada em scrape_runs.
+        base_url (str, optional): outro servidor no lugar da Wikipedia (ver wiki_url).
+        workers (int, optional): páginas baixadas e analisadas ao mesmo tempo
+            (threads, cada uma com a sua requests.Session). O resultado e a
+            ordem de gravação no banco não dependem do número de workers.
+        retries (int, optional): novas tentativas por página (ver fetch_page).
+        cache (dict, optional): cache de ETags entre execuções (ver fetch_page).
+        players (pd.DataFrame, optional): jogadores a extrair (colunas name e
+            link); por padrão, get_active_players(base_url).
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'name', 'year', 'total' e 'type'.
+    """
+    if players is None:
+        players = get_active_players(base_url)
+
+    def extract(link, **options):
+        return {"goals": extract_goals_by_year(link, **options)}
+
+    return _concat_goals(_scrape_players(players, extract, db, workers, retries, cache))
+
+
+def get_player_datasets(db=None, base_url=None, workers=1, retries=3, cache=None, players=None):
+    """
+    Como get_player_stats, mas com todos os dados de cada página (uma leitura por página).
+
+    Args:
+        db, base_url, workers, retries, cache, players: ver get_player_stats.
+
+    Returns:
+        dict: três DataFrames —
+        "goals": o mesmo de get_player_stats;
+        "competitions": partidas e gols por temporada e competição, no formato
+        longo (year, type, competition, apps, goals, name; ver parse_player_page);
+        "players": name, link e birth_date.
+    """
+    if players is None:
+        players = get_active_players(base_url)
+    scraped = _scrape_players(players, extract_player_data, db, workers, retries, cache)
+
+    competitions = [result["competitions"].assign(name=name) for name, _, result in scraped]
+    if competitions:
+        competitions = pd.concat(competitions, ignore_index=True)
+    else:
+        competitions = _competition_frame([]).assign(name=pd.Series(dtype=str))
+    info = pd.DataFrame([(name, link, result["birth_date"]) for name, link, result in scraped],
+                        columns=["name", "link", "birth_date"])
+    return {"goals": _concat_goals(scraped), "competitions": competitions, "players": info}
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     stats = get_player_stats()
@@ -0,0 +1,370 @@
+"""
+Servidor HTTP local com os dados em memória (`goal500 serve`).
+
+O CSV é lido e limpo uma única vez e o payload de build_site_data fica em
+memória. Endpoints:
+
+- ``/data.json`` e ``/version.json``: os mesmos dados da página estática;
+- ``/api/players``: séries filtradas, com os parâmetros ``names`` (lista
+  separada por vírgulas), ``type`` (total, club ou international), ``axis``
+  (active = anos de carreira, year = ano-calendário) e ``limit`` (os N
+  maiores no filtro);
+- com ``static_dir``, os demais caminhos servem arquivos desse diretório
+  (ex.: ``docs/``, para abrir o painel apontando para o servidor).
+
+Cada resposta é serializada, comprimida (gzip) e recebe seus ETags (um por
+codificação, o do gzip com sufixo ``-gz``) uma única vez por versão dos dados;
+requisições repetidas só copiam bytes de um cache, e ``If-None-Match`` com o
+ETag atual recebe 304. Quando o arquivo de entrada muda
+(mtime ou tamanho, verificados no máximo a cada ``reload_interval`` segundos),
+os dados são recarregados sem reiniciar o servidor; se a leitura falhar (ex.:
+arquivo no meio de uma gravação), os dados anteriores continuam no ar.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import accumulate
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from goal500.site import _site_data_from_clean, data_version
+from goal500.utils.data_processing import clean_data
+
+GOAL_TYPES = ("total", "club", "international")
+AXES = ("active", "year")
+
+# Respostas menores que isso não compensam o gzip.
+GZIP_MIN_BYTES = 512
+# Respostas de /api/players guardadas por versão dos dados (consultas
+# distintas); ao passar do limite, as usadas há mais tempo saem primeiro.
+MAX_CACHED_RESPONSES = 1024
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _make_response(body, content_type="application/json; charset=utf-8", status=200):
+    """Monta a resposta pronta para envio: corpo, versão gzip e os ETags de cada um."""
+    compressed = None
+    if len(body) >= GZIP_MIN_BYTES:
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+    etag = etag_gzip = None
+    if status == 200:
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        # ETag forte por representação: corpos diferentes, ETags diferentes.
+        etag, etag_gzip = f'"{digest}"', f'"{digest}-gz"'
+    return {"status": status, "type": content_type, "body": body,
+            "gzip": compressed, "etag": etag, "etag_gzip": etag_gzip}
+
+
+def _etag_matches(header, etag):
+    """Se o If-None-Match (lista separada por vírgulas, ou *) contém exatamente `etag`."""
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _error(status, message):
+    return _make_response(_dumps({"error": message}), status=status)
+
+
+def query_players(data, names=None, kind="total", axis="active", limit=None):
+    """
+    Séries de gols dos jogadores no formato usado pelo painel.
+
+    Args:
+        data (dict): payload de build_site_data.
+        names (list, optional): jogadores a incluir, na ordem desejada; None
+            para todos (na ordem do payload, por total na carreira).
+        kind (str, optional): "total", "club" ou "international".
+        axis (str, optional): "active" (x = anos desde o primeiro ano, como na
+            página) ou "year" (x = ano-calendário).
+        limit (int, optional): mantém só os N jogadores com mais gols no filtro.
+
+    Returns:
+        dict: {"type", "axis", "players": [{"name", "color", "color_dark", "x",
+        "goals", "cumulative", "total"}]}.
+
+    Raises:
+        ValueError: tipo, eixo ou limite inválidos, ou jogadores desconhecidos.
+    """
+    if kind not in GOAL_TYPES:
+        raise ValueError(f"Tipo inválido: {kind!r} (use {', '.join(GOAL_TYPES)}).")
+    if axis not in AXES:
+        raise ValueError(f"Eixo inválido: {axis!r} (use {', '.join(AXES)}).")
+    if limit is not None and limit < 1:
+        raise ValueError("O limite deve ser um inteiro positivo.")
+
+    players = data["players"]
+    if names:
+        by_name = {player["name"]: player for player in players}
+        unknown = [name for name in names if name not in by_name]
+        if unknown:
+            raise ValueError(f"Jogadores desconhecidos: {', '.join(unknown)}.")
+        players = [by_name[name] for name in dict.fromkeys(names)]
+
+    series = []
+    for player in players:
+        if kind == "total":
+            goals = [c + i for c, i in zip(player["club"], player["international"])]
+        else:
+            goals = player[kind]
+        base = 0 if axis == "year" else player["first_year"]
+        series.append({
+            "name": player["name"],
+            "color": player["color"],
+            "color_dark": player["color_dark"],
+            "x": [year - base for year in player["years"]],
+            "goals": goals,
+            "cumulative": list(accumulate(goals)),
+            "total": player["total" if kind == "total" else f"total_{kind}"],
+        })
+
+    if limit is not None:
+        top = sorted(series, key=lambda s: s["total"], reverse=True)[:limit]
+        keep = {id(s) for s in top}
+        series = [s for s in series if id(s) in keep]
+    return {"type": kind, "axis": axis, "players": series}
+
+
+def _load_snapshot(input_file):
+    """
+    Lê o CSV e monta o estado servido: payload, versão, respostas fixas
+    (/data.json e /version.json) e o cache (LRU) de consultas, vazio.
+    """
+    data = _site_data_from_clean(clean_data(pd.read_csv(input_file)))
+    payload = _dumps(data)
+    version = data_version(data)
+    return {
+        "data": data,
+        "version": version,
+        "fixed": {
+            "/data.json": _make_response(payload),
+            "/version.json": _make_response(
+                _dumps({"version": version, "generated_at": data["generated_at"]})),
+        },
+        "queries": OrderedDict(),
+        "queries_lock": threading.Lock(),
+    }
+
+
+class DataStore:
+    """
+    Dados em memória do servidor, recarregados quando o arquivo muda.
+
+    O estado atual é um dicionário imutável do ponto de vista das threads de
+    requisição (só o cache de consultas muda, sob o seu próprio lock); a
+    recarga monta um estado novo e o troca de uma vez, então cada requisição
+    vê uma única versão dos dados.
+    """
+
+    def __init__(self, input_file, reload_interval=1.0, static_dir=None):
+        self.input_file = input_file
+        self.reload_interval = reload_interval
+        self.static_dir = os.path.realpath(static_dir) if static_dir else None
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._checked = time.monotonic()
+        self._snapshot = _load_snapshot(input_file)
+        self._static = {}
+
+    def _stat(self):
+        stat = os.stat(self.input_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def version(self):
+        return self._snapshot["version"]
+
+    def current(self):
+        """Retorna o estado atual, recarregando os dados se o arquivo mudou."""
+        if time.monotonic() - self._checked >= self.reload_interval:
+            self.reload_if_changed()
+        return self._snapshot
+
+    def reload_if_changed(self):
+        """
+        Recarrega os dados se o arquivo de entrada mudou desde a última leitura.
+
+        Returns:
+            bool: True se os dados foram recarregados.
+        """
+        # Se outra thread já está verificando/recarregando, segue com os dados atuais.
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked = time.monotonic()
+            try:
+                signature = self._stat()
+            except OSError:
+                return False
+            if signature == self._signature:
+                return False
+            try:
+                snapshot = _load_snapshot(self.input_file)
+            except (OSError, ValueError, KeyError, pd.errors.ParserError) as exc:
+                print(f"Erro ao recarregar {self.input_file}: {exc} (mantendo os dados anteriores)")
+                return False
+            self._snapshot, self._signature = snapshot, signature
+            print(f"Dados recarregados de {self.input_file} (versão {snapshot['version']})")
+            return True
+        finally:
+            self._lock.release()
+
+    def response(self, path, query=""):
+        """Resposta (cacheada) para um caminho e query string."""
+        snapshot = self.current()
+        if path in ("/data.json", "/version.json"):
+            return snapshot["fixed"][path]
+        if path == "/api/players":
+            return self._players_response(snapshot, query)
+        if self.static_dir:
+            return self._static_response(path)
+        return _error(404, f"Caminho não encontrado: {path}")
+
+    def _players_response(self, snapshot, query):
+        params = parse_qs(query)
+        names = [name.strip() for value in params.get("names", []) for name in value.split(",")]
+        names = [name for name in names if name]
+        kind = params.get("type", ["total"])[-1]
+        axis = params.get("axis", ["active"])[-1]
+        limit = params.get("limit", [None])[-1]
+        key = ("/api/players", tuple(names), kind, axis, limit)
+
+        queries, lock = snapshot["queries"], snapshot["queries_lock"]
+        with lock:
+            cached = queries.get(key)
+            if cached is not None:
+                queries.move_to_end(key)
+                return cached
+        try:
+            limit_value = int(limit) if limit is not None else None
+            result = query_players(snapshot["data"], names, kind, axis, limit_value)
+        except ValueError as exc:
+            return _error(400, str(exc))
+        response = _make_response(_dumps({"version": snapshot["version"], **result}))
+        with lock:
+            queries[key] = response
+            queries.move_to_end(key)
+            while len(queries) > MAX_CACHED_RESPONSES:
+                queries.popitem(last=False)
+        return response
+
+    def _static_response(self, path):
+        relative = unquote(path).lstrip("/") or "index.html"
+        file_path = os.path.realpath(os.path.join(self.static_dir, relative))
+        if os.path.isdir(file_path):
+            file_path = os.path.join(file_path, "index.html")
+        if not file_path.startswith(self.static_dir + os.sep) or not os.path.isfile(file_path):
+            return _error(404, f"Caminho não encontrado: {path}")
+
+        mtime = os.stat(file_path).st_mtime_ns
+        cached = self._static.get(file_path)
+        if cached is None or cached[0] != mtime:
+            with open(file_path, "rb") as fh:
+                body = fh.read()
+            content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type.endswith("javascript"):
+                content_type += "; charset=utf-8"
+            cached = (mtime, _make_response(body, content_type))
+            self._static[file_path] = cached
+        return cached[1]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantém a conexão aberta entre requisições (keep-alive).
+    protocol_version = "HTTP/1.1"
+    server_version = "goal500"
+    # Cabeçalhos e corpo saem em duas escritas; sem TCP_NODELAY, o algoritmo de
+    # Nagle somado ao ACK atrasado do cliente segura cada resposta por ~40 ms.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlsplit(self.path)
+        response = self.server.store.response(url.path, url.query)
+        use_gzip = response["gzip"] is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = response["etag_gzip"] if use_gzip else response["etag"]
+
+        if etag and _etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(304)
+            self._common_headers(etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = response["gzip"] if use_gzip else response["body"]
+        self.send_response(response["status"])
+        self._common_headers(etag)
+        self.send_header("Content-Type", response["type"])
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _common_headers(self, etag):
+        # no-cache: o cliente pode guardar, mas revalida pelo ETag (304 é barato).
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if etag:
+            self.send_header("ETag", etag)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(input_file="data/player_stats.csv", host="127.0.0.1", port=8000,
+                static_dir=None, reload_interval=1.0, verbose=False):
+    """
+    Cria o servidor (sem iniciá-lo), já com os dados carregados.
+
+    Args:
+        input_file (str, optional): CSV com os dados extraídos.
+        host (str, optional): endereço de escuta.
+        port (int, optional): porta (0 escolhe uma livre).
+        static_dir (str, optional): diretório servido nos demais caminhos.
+        reload_interval (float, optional): intervalo mínimo, em segundos, entre
+            verificações de mudança no arquivo de entrada.
+        verbose (bool, optional): registra cada requisição no terminal.
+
+    Returns:
+        ThreadingHTTPServer: servidor com o atributo `store` (DataStore).
+    """
+    store = DataStore(input_file, reload_interval, static_dir)
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.store = store
+    server.verbose = verbose
+    return server
+
+
+def serve(input_file="data/player_stats.csv", host="127.0.0.1", port=8000,
+          static_dir=None, reload_interval=1.0, verbose=False):
+    """Carrega os dados e atende requisições até Ctrl+C (ver make_server)."""
+    server = make_server(input_file, host, port, static_dir, reload_interval, verbose)
+    host, port = server.server_address[:2]
+    print(f"Servindo {input_file} (versão {server.store.version}) em http://{host}:{port}/")
+    print("Endpoints: /data.json, /version.json, /api/players?names=&type=&axis=&limit=")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando o servidor.")
+    finally:
+        server.server_close()
@@ -6,13 +6,18 @@ interativos no navegador, permitindo filtrar por jogador, tipo de gol
 (clube/seleção) e eixo (anos ativos vs. ano-calendário).
 """
 
+import hashlib
 import json
 import os
 from datetime import date
 
-import pandas as pd
+import numpy as np
 
+from goal500.utils import instrument
 from goal500.utils.data_processing import clean_data
+from goal500.utils.manifest import (
+    atomic_write, data_fingerprint, fingerprint, is_up_to_date, record,
+)
 
 # Ordem/paleta categórica validada (mesma usada no index.html).
 # Cada modo tem sua própria versão dos mesmos 8 tons, ajustada à superfície.
@@ -37,8 +42,67 @@ PALETTE_DARK = [
     "#d95926",  # orange
 ]
 
+VERSION_FILE = "version.json"
+SERVICE_WORKER_FILE = "sw.js"
 
-def build_site_data(df):
+# Service worker gravado ao lado do data.json. Responde data.json direto do
+# cache e, em segundo plano, consulta version.json (arquivo minúsculo, sem
+# cache HTTP). Só quando a versão muda baixa o JSON completo, atualiza o
+# cache e avisa a página para redesenhar.
+SERVICE_WORKER = """// Gerado por goal500.site.write_site_data — não edite à mão.
+const CACHE = "goal500-data";
+const DATA_URL = new URL("__DATA_FILE__", self.registration.scope).href;
+const VERSION_URL = new URL("version.json", self.registration.scope).href;
+const VERSION_HEADER = "X-Goal500-Version";
+
+self.addEventListener("install", () => self.skipWaiting());
+self.addEventListener("activate", (event) => event.waitUntil(self.clients.claim()));
+
+self.addEventListener("fetch", (event) => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== "GET" || url.origin + url.pathname !== DATA_URL) return;
+  event.respondWith(staleWhileRevalidate(event));
+});
+
+async function staleWhileRevalidate(event) {
+  const cache = await caches.open(CACHE);
+  const cached = await cache.match(DATA_URL);
+  const refresh = revalidate(cache, cached);
+  if (cached) {
+    event.waitUntil(refresh.catch(() => null));
+    return cached;
+  }
+  try {
+    return (await refresh) || fetch(event.request);
+  } catch (e) {
+    return fetch(event.request);
+  }
+}
+
+async function revalidate(cache, cached) {
+  const res = await fetch(VERSION_URL, { cache: "no-store" });
+  if (!res.ok) throw new Error("version.json HTTP " + res.status);
+  const { version } = await res.json();
+  if (cached && cached.headers.get(VERSION_HEADER) === version) return null;
+
+  // A query string com a versão fura caches intermediários (CDN do Pages).
+  const fresh = await fetch(DATA_URL + "?v=" + version);
+  if (!fresh.ok) throw new Error("data.json HTTP " + fresh.status);
+  const headers = new Headers(fresh.headers);
+  headers.set(VERSION_HEADER, version);
+  const stamped = new Response(await fresh.blob(), { status: 200, headers });
+  await cache.put(DATA_URL, stamped.clone());
+
+  if (cached) {
+    const clients = await self.clients.matchAll({ type: "window" });
+    clients.forEach((c) => c.postMessage({ type: "goal500-data-updated", version }));
+  }
+  return stamped;
+}
+"""
+
+
+def build_site_data(df, forecast=None):
     """
     Constrói o dicionário de dados consumido pela página estática.
 
@@ -46,71 +110,213 @@ def build_site_data(df):
     de clube e de seleção. O acumulado, os "anos ativos" e os totais por filtro
     são calculados no navegador, garantindo que os gráficos reajam aos filtros.
 
+    Com `forecast`, o JSON ganha a chave "forecast" com a projeção de quando
+    cada jogador chega ao alvo (ver goal500.forecast.forecast_summary). Com a
+    semente fixa, o conteúdo (e a versão) só muda quando os dados mudam.
+
     Args:
         df (pd.DataFrame): DataFrame bruto com colunas name/year/total/type.
+        forecast (bool or dict, optional): True para a projeção padrão (500
+            gols) ou um dicionário de opções de forecast_summary (target,
+            n_sims, horizon, seed, birth_dates).
 
     Returns:
         dict: estrutura pronta para virar JSON.
     """
-    clean = clean_data(df.copy())
+    return _site_data_from_clean(clean_data(df.copy()), forecast)
+
+
+@instrument.instrumented("site.build")
+def _site_data_from_clean(clean, forecast=None):
+    """
+    Constrói os dados da página a partir de um DataFrame já limpo (clean_data).
+
+    Não altera `clean`, que pode ser compartilhado com outras etapas do pipeline.
+    """
+    return _site_data_from_entries(player_entries(clean).values(), forecast)
+
+
+def player_entries(clean):
+    """
+    Calcula a entrada de cada jogador (sem cores) numa única passada agrupada.
+
+    As entradas só dependem das linhas do próprio jogador, então o modo watch
+    recalcula apenas as dos jogadores alterados e remonta o resto com
+    _site_data_from_entries.
+
+    Args:
+        clean (pd.DataFrame): DataFrame já passado por clean_data.
+
+    Returns:
+        dict: nome -> entrada (anos, gols de clube/seleção alinhados e totais).
+    """
     if clean.empty:
-        return {"generated_at": date.today().isoformat(), "source": "Wikipedia", "players": []}
+        return {}
 
-    clean["year"] = clean["year"].astype(int)
-    # Soma gols por jogador/ano/tipo (o CSV pode ter várias linhas por temporada).
-    grouped = (
-        clean.groupby(["name", "year", "type"])["total"].sum().reset_index()
+    clean = clean.assign(year=clean["year"].astype(int))
+    # Soma gols por jogador/ano/tipo (o CSV pode ter várias linhas por temporada)
+    # e põe clube e seleção lado a lado; anos sem um dos tipos ficam com 0.
+    table = (
+        clean.groupby(["name", "year", "type"])["total"].sum()
+        .unstack("type", fill_value=0)
+        .reindex(columns=["club", "international"], fill_value=0)
     )
+    names = table.index.get_level_values("name")
+    years = table.index.get_level_values("year").to_numpy()
+    club = table["club"].to_numpy().astype(np.int64)
+    international = table["international"].to_numpy().astype(np.int64)
+    # O índice vem ordenado por jogador: cada bloco contíguo é um jogador.
+    starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+    bounds = np.append(starts, len(names))
 
-    players = []
-    # Mantém uma ordem estável: por total de gols na carreira (desc).
-    totals = grouped.groupby("name")["total"].sum().sort_values(ascending=False)
-
-    for idx, name in enumerate(totals.index):
-        pdata = grouped[grouped["name"] == name]
-        years = sorted(pdata["year"].unique().tolist())
-        club = []
-        international = []
-        for y in years:
-            sub = pdata[pdata["year"] == y]
-            club.append(int(sub[sub["type"] == "club"]["total"].sum()))
-            international.append(int(sub[sub["type"] == "international"]["total"].sum()))
-
-        players.append({
+    entries = {}
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        name = names[start]
+        player_club = club[start:end].tolist()
+        player_international = international[start:end].tolist()
+        player_years = years[start:end].tolist()
+        total_club, total_international = sum(player_club), sum(player_international)
+        entries[name] = {
             "name": name,
+            "years": player_years,
+            "club": player_club,
+            "international": player_international,
+            "total_club": total_club,
+            "total_international": total_international,
+            "total": total_club + total_international,
+            "first_year": player_years[0],
+            "last_year": player_years[-1],
+        }
+    return entries
+
+
+def _site_data_from_entries(entries, forecast=None):
+    """
+    Monta o dicionário da página a partir das entradas dos jogadores.
+
+    Ordena por total de gols na carreira (desc; empates em ordem alfabética) e
+    atribui as cores pela posição, como a página espera. Com `forecast`, inclui
+    a projeção (ver build_site_data).
+    """
+    # Ordem estável: por nome primeiro, depois por total (desc).
+    ordered = sorted(sorted(entries, key=lambda e: e["name"]), key=lambda e: -e["total"])
+    players = [
+        {
+            "name": entry["name"],
             "color": PALETTE[idx % len(PALETTE)],
             "color_dark": PALETTE_DARK[idx % len(PALETTE_DARK)],
-            "years": years,
-            "club": club,
-            "international": international,
-            "total_club": int(sum(club)),
-            "total_international": int(sum(international)),
-            "total": int(sum(club) + sum(international)),
-            "first_year": years[0],
-            "last_year": years[-1],
-        })
-
-    return {
+            **{key: value for key, value in entry.items() if key != "name"},
+        }
+        for idx, entry in enumerate(ordered)
+    ]
+    data = {
         "generated_at": date.today().isoformat(),
         "source": "Wikipedia",
         "players": players,
     }
+    if forecast:
+        from goal500.forecast import forecast_summary
+
+        data["forecast"] = forecast_summary(ordered, **_forecast_options(forecast))
+    return data
 
 
-def write_site_data(df, output_file="docs/data.json"):
+def _forecast_options(forecast):
+    """Opções de forecast_summary a partir do argumento `forecast` (True ou dict)."""
+    return {} if forecast is True else dict(forecast)
+
+
+def data_version(data):
+    """
+    Calcula a versão (hash de conteúdo) dos dados da página.
+
+    Entram só os jogadores, a fonte e a projeção: `generated_at` fica de fora,
+    para que regerar os mesmos dados em outro dia mantenha a versão (e o
+    cache da página).
+
+    Args:
+        data (dict): dicionário de build_site_data.
+
+    Returns:
+        str: os 16 primeiros dígitos hexadecimais do SHA-256.
+    """
+    content = {key: value for key, value in data.items() if key != "generated_at"}
+    payload = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def write_site_data(df, output_file="docs/data.json", manifest=None, forecast=None):
     """
     Escreve o JSON de dados da página estática.
 
+    Junto do JSON são gravados, no mesmo diretório, `version.json` (hash do
+    conteúdo) e o service worker `sw.js`. A página usa os dois para servir os
+    dados do cache imediatamente e só baixar data.json de novo quando a
+    versão publicada mudar (stale-while-revalidate).
+
+    Com `manifest`, a geração é pulada quando os dados normalizados são os
+    mesmos da última execução registrada no manifesto (ver goal500.utils.manifest).
+
     Args:
         df (pd.DataFrame): DataFrame bruto com os dados extraídos.
         output_file (str): caminho do arquivo JSON de saída.
+        manifest (str, optional): caminho do manifesto de build.
+        forecast (bool or dict, optional): inclui a projeção (ver build_site_data).
 
     Returns:
         str: caminho do arquivo escrito.
     """
-    data = build_site_data(df)
-    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
-    with open(output_file, "w", encoding="utf-8") as fh:
-        json.dump(data, fh, ensure_ascii=False, indent=2)
-    print(f"Dados do site salvos em: {output_file}")
+    return _write_site_from_clean(clean_data(df.copy()), output_file, manifest, forecast)
+
+
+def _write_site_from_clean(clean, output_file="docs/data.json", manifest=None, forecast=None,
+                           data_key=None):
+    """
+    Escreve o JSON de dados da página a partir de um DataFrame já limpo.
+
+    Usado pelo pipeline, que limpa os dados uma única vez para todas as etapas.
+
+    Args:
+        clean (pd.DataFrame): DataFrame já passado por clean_data.
+        output_file (str): caminho do arquivo JSON de saída.
+        manifest (str, optional): caminho do manifesto de build.
+        forecast (bool or dict, optional): inclui a projeção (ver build_site_data).
+        data_key (str, optional): impressão digital dos dados, se já calculada
+            (ver goal500.utils.manifest.data_fingerprint).
+
+    Returns:
+        str: caminho do arquivo escrito.
+    """
+    if manifest:
+        out_dir = os.path.dirname(output_file) or "."
+        outputs = [output_file, os.path.join(out_dir, VERSION_FILE),
+                   os.path.join(out_dir, SERVICE_WORKER_FILE)]
+        params = {"forecast": _forecast_options(forecast)} if forecast else {}
+        if data_key is None:
+            data_key = data_fingerprint(clean, clean=True)
+        key = fingerprint(clean, data_key, stage="site", data_file=os.path.basename(output_file),
+                          **params)
+        if is_up_to_date(manifest, outputs, key):
+            print(f"Dados do site sem mudanças, mantido: {output_file}")
+            return output_file
+
+    _write_site(_site_data_from_clean(clean, forecast), output_file)
+    if manifest:
+        record(manifest, output_file, key, "site")
+    return output_file
+
+
+@instrument.instrumented("site.write")
+def _write_site(data, output_file):
+    """Grava data.json, version.json e sw.js a partir do dicionário já construído."""
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    out_dir = os.path.dirname(output_file) or "."
+    # Escritas atômicas; version.json por último, pois sinaliza dados novos.
+    atomic_write(output_file, payload)
+    version = {"version": data_version(data), "generated_at": data["generated_at"]}
+    atomic_write(os.path.join(out_dir, VERSION_FILE), json.dumps(version))
+    atomic_write(os.path.join(out_dir, SERVICE_WORKER_FILE),
+                 SERVICE_WORKER.replace("__DATA_FILE__", os.path.basename(output_file)))
+
+    print(f"Dados do site salvos em: {output_file} (versão {version['version']})")
     return output_file
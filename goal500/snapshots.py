@@ -0,0 +1,269 @@
+"""
+Histórico das extrações: snapshots em deltas com checkpoints periódicos.
+
+Cada execução (ex.: a atualização semanal) vira um snapshot no diretório do
+histórico. Os dados são normalizados em linhas (name, year, type, total) —
+uma por chave, com os gols somados — e gravados como:
+
+- checkpoint: a tabela completa, a cada ``checkpoint_every`` snapshots;
+- delta: só as linhas que mudaram em relação ao snapshot anterior, com a
+  operação ``set`` (linha nova ou alterada) ou ``del`` (linha removida).
+
+Reconstruir um snapshot custa ler o checkpoint anterior e no máximo
+``checkpoint_every - 1`` deltas. O índice (``index.json``) guarda a ordem,
+o tipo, o arquivo e um hash de conteúdo de cada snapshot, conferido na
+reconstrução. Os arquivos são CSV comprimidos com gzip e gravados de forma
+atômica; o índice é atualizado por último.
+
+As diferenças entre dois snapshots (diff_frames) são um hash join pelas chaves
+(name, year, type), feito pelo pandas (merge) de forma vetorizada.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from goal500.utils.data_processing import clean_data
+from goal500.utils.manifest import _locked, atomic_path, atomic_write
+
+KEYS = ["name", "year", "type"]
+COLUMNS = KEYS + ["total"]
+INDEX_FILE = "index.json"
+
+
+def normalize(df):
+    """
+    Normaliza os dados para o histórico: uma linha por (name, year, type).
+
+    Returns:
+        pd.DataFrame: colunas name, year, type e total, ordenadas pelas chaves;
+        total é inteiro quando todos os valores são inteiros.
+    """
+    clean = clean_data(df.copy())
+    if clean.empty:
+        return pd.DataFrame({"name": pd.Series(dtype=str), "year": pd.Series(dtype="int64"),
+                             "type": pd.Series(dtype=str), "total": pd.Series(dtype="int64")})
+    clean = clean.assign(year=clean["year"].astype("int64"))
+    table = clean.groupby(KEYS, sort=True)["total"].sum().reset_index()
+    if (table["total"] % 1 == 0).all():
+        table["total"] = table["total"].astype("int64")
+    return table[COLUMNS]
+
+
+def content_hash(table):
+    """Hash do conteúdo de uma tabela normalizada (independe dos tipos numéricos)."""
+    digest = hashlib.sha256()
+    rows = table[COLUMNS].astype({"year": "int64", "total": "float64"}).astype(str)
+    digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def diff_frames(old, new):
+    """
+    Compara duas tabelas normalizadas com um hash join pelas chaves.
+
+    Args:
+        old (pd.DataFrame): tabela anterior (ver normalize).
+        new (pd.DataFrame): tabela nova.
+
+    Returns:
+        pd.DataFrame: uma linha por chave que mudou, com name, year, type,
+        old_total, new_total (NaN se a linha não existe daquele lado), delta
+        (new - old, com ausência contando como 0) e status ("added",
+        "removed" ou "changed"), ordenada pelas chaves.
+    """
+    merged = old[COLUMNS].merge(new[COLUMNS], on=KEYS, how="outer",
+                                suffixes=("_old", "_new"), indicator=True)
+    merged = merged.rename(columns={"total_old": "old_total", "total_new": "new_total"})
+    changed = merged[(merged["_merge"] != "both") | (merged["old_total"] != merged["new_total"])]
+    status = changed["_merge"].map({"left_only": "removed", "right_only": "added", "both": "changed"})
+    result = changed[KEYS + ["old_total", "new_total"]].assign(
+        delta=changed["new_total"].fillna(0) - changed["old_total"].fillna(0),
+        status=status.astype(str),
+    )
+    return result.sort_values(KEYS, kind="stable").reset_index(drop=True)
+
+
+def goals_by_player(changes):
+    """
+    Resume um diff por jogador: gols novos (soma dos deltas) e linhas alteradas.
+
+    Returns:
+        pd.DataFrame: colunas name, delta e rows, do maior ganho para o menor.
+    """
+    summary = changes.groupby("name", sort=True).agg(delta=("delta", "sum"), rows=("delta", "size"))
+    summary = summary.reset_index()
+    return summary.sort_values(["delta", "name"], ascending=[False, True],
+                               kind="stable").reset_index(drop=True)
+
+
+def _index_path(store):
+    return os.path.join(store, INDEX_FILE)
+
+
+def list_snapshots(store="data/snapshots"):
+    """
+    Lista os snapshots do histórico, do mais antigo para o mais recente.
+
+    Returns:
+        list: registros com id, label, created_at, kind, file, rows, changes e hash.
+    """
+    try:
+        with open(_index_path(store), encoding="utf-8") as fh:
+            return json.load(fh)["snapshots"]
+    except FileNotFoundError:
+        return []
+
+
+def _resolve(snapshots, ref):
+    """Encontra um snapshot pelo id, pelo rótulo ou por posição negativa (-1 = último)."""
+    if not snapshots:
+        raise ValueError("O histórico de snapshots está vazio.")
+    if isinstance(ref, int) or (isinstance(ref, str) and ref.lstrip("-").isdigit()):
+        number = int(ref)
+        if number < 0:
+            if -number > len(snapshots):
+                raise ValueError(f"Snapshot {ref} não existe ({len(snapshots)} no histórico).")
+            return len(snapshots) + number
+        for position, entry in enumerate(snapshots):
+            if entry["id"] == number:
+                return position
+    for position in range(len(snapshots) - 1, -1, -1):
+        if snapshots[position]["label"] == ref:
+            return position
+    raise ValueError(f"Snapshot não encontrado: {ref}.")
+
+
+def _read_table(store, entry):
+    # Nomes como "NA" continuam nomes; só total vazio (linhas "del") vira NaN.
+    return pd.read_csv(os.path.join(store, entry["file"]), keep_default_na=False,
+                       na_values={"total": [""]}, dtype={"name": str, "type": str})
+
+
+def load_table(ref, store="data/snapshots"):
+    """
+    Carrega uma tabela normalizada de um snapshot ou de um arquivo CSV.
+
+    Args:
+        ref (str or int): caminho de um CSV existente, ou referência de snapshot
+            (ver load_snapshot).
+        store (str, optional): diretório do histórico.
+    """
+    if isinstance(ref, str) and os.path.isfile(ref):
+        return normalize(pd.read_csv(ref))
+    return load_snapshot(ref, store)
+
+
+def _apply_delta(state, delta):
+    """Aplica um delta (linhas set/del) a uma tabela normalizada."""
+    indexed = state.set_index(KEYS)["total"]
+    keys = pd.MultiIndex.from_frame(delta[KEYS])
+    kept = indexed[~indexed.index.isin(keys)]
+    sets = delta[delta["op"] == "set"].set_index(KEYS)["total"]
+    result = pd.concat([kept, sets]).sort_index().reset_index()
+    return normalize(result) if not result.empty else normalize(state.iloc[:0])
+
+
+def load_snapshot(ref=-1, store="data/snapshots"):
+    """
+    Reconstrói um snapshot: o checkpoint anterior mais os deltas seguintes.
+
+    Args:
+        ref (int or str, optional): id, rótulo ou posição negativa (-1 = último).
+        store (str, optional): diretório do histórico.
+
+    Returns:
+        pd.DataFrame: a tabela normalizada (name, year, type, total).
+
+    Raises:
+        ValueError: snapshot inexistente ou conteúdo que não bate com o hash.
+    """
+    snapshots = list_snapshots(store)
+    position = _resolve(snapshots, ref)
+    start = max(i for i in range(position + 1) if snapshots[i]["kind"] == "checkpoint")
+
+    state = normalize(_read_table(store, snapshots[start]))
+    for entry in snapshots[start + 1:position + 1]:
+        if entry["file"] is not None:
+            state = _apply_delta(state, _read_table(store, entry))
+    if content_hash(state) != snapshots[position]["hash"]:
+        raise ValueError(f"Snapshot {snapshots[position]['id']} corrompido: o hash não confere.")
+    return state
+
+
+def save_snapshot(df, store="data/snapshots", label=None, checkpoint_every=10, skip_unchanged=True):
+    """
+    Grava os dados de uma execução como um novo snapshot.
+
+    Args:
+        df (pd.DataFrame): dados da execução (formato de get_player_stats).
+        store (str, optional): diretório do histórico (criado se não existir).
+        label (str, optional): rótulo do snapshot (ex.: a data da extração);
+            por padrão, a data UTC atual.
+        checkpoint_every (int, optional): a cada quantos snapshots gravar a
+            tabela completa em vez de um delta.
+        skip_unchanged (bool, optional): se os dados forem iguais aos do último
+            snapshot, não grava nada e retorna o registro existente.
+
+    Returns:
+        dict: o registro do snapshot no índice.
+    """
+    os.makedirs(store, exist_ok=True)
+    table = normalize(df)
+    now = datetime.now(timezone.utc)
+
+    with _locked(_index_path(store)):
+        snapshots = list_snapshots(store)
+        if skip_unchanged and snapshots and snapshots[-1]["hash"] == content_hash(table):
+            return snapshots[-1]
+        number = snapshots[-1]["id"] + 1 if snapshots else 1
+        since_checkpoint = 0
+        for entry in reversed(snapshots):
+            if entry["kind"] == "checkpoint":
+                break
+            since_checkpoint += 1
+        entry = {
+            "id": number,
+            "label": label or now.date().isoformat(),
+            "created_at": now.isoformat(timespec="seconds"),
+            "rows": len(table),
+            "hash": content_hash(table),
+        }
+
+        if not snapshots or since_checkpoint + 1 >= checkpoint_every:
+            entry.update(kind="checkpoint", file=f"{number:06d}-checkpoint.csv.gz", changes=len(table))
+            payload = table
+        else:
+            changes = diff_frames(load_snapshot(-1, store), table)
+            delta = changes[KEYS].assign(
+                total=changes["new_total"],
+                op=changes["status"].map({"removed": "del"}).fillna("set"),
+            )
+            entry.update(kind="delta", file=f"{number:06d}-delta.csv.gz" if len(delta) else None,
+                         changes=len(delta))
+            payload = delta
+
+        if entry["file"] is not None:
+            with atomic_path(os.path.join(store, entry["file"])) as tmp:
+                payload.to_csv(tmp, index=False, compression="gzip")
+        snapshots.append(entry)
+        atomic_write(_index_path(store), json.dumps({"snapshots": snapshots}, indent=2) + "\n")
+    return entry
+
+
+def diff_snapshots(old_ref=-2, new_ref=-1, store="data/snapshots"):
+    """
+    Diferenças entre dois snapshots (por padrão, os dois últimos).
+
+    Args:
+        old_ref (int or str, optional): snapshot antigo ou CSV (ver load_table).
+        new_ref (int or str, optional): snapshot novo ou CSV.
+        store (str, optional): diretório do histórico.
+
+    Returns:
+        pd.DataFrame: saída de diff_frames.
+    """
+    return diff_frames(load_table(old_ref, store), load_table(new_ref, store))
@@ -0,0 +1,271 @@
+"""
+Armazenamento persistente das estatísticas em SQLite (biblioteca padrão).
+
+Esquema normalizado:
+
+- ``players``: um registro por jogador, com link, totais de gols (mantidos a
+  cada gravação, com índices para consultas de top N) e a última extração;
+- ``seasons``: gols por (jogador, ano, tipo). A chave primária é esse trio e a
+  tabela é WITHOUT ROWID, então os dados ficam ordenados fisicamente pelo
+  índice (player_id, year, type);
+- ``scrape_runs``: cada execução de extração, com início, fim, situação e
+  quantos jogadores/linhas gravou.
+
+Cada jogador é gravado na sua própria transação (upsert): uma extração que
+falha no meio mantém os jogadores já gravados e os dados anteriores dos demais.
+Linhas repetidas de um mesmo (jogador, ano, tipo) — ex.: dois clubes na mesma
+temporada — são somadas, como já fazem o site e os gráficos.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from goal500.utils.data_processing import clean_data
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    players INTEGER NOT NULL DEFAULT 0,
+    rows INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    link TEXT,
+    total_club INTEGER NOT NULL DEFAULT 0,
+    total_international INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    last_run_id INTEGER REFERENCES scrape_runs(id)
+);
+CREATE INDEX IF NOT EXISTS idx_players_total ON players(total DESC);
+CREATE INDEX IF NOT EXISTS idx_players_total_club ON players(total_club DESC);
+CREATE INDEX IF NOT EXISTS idx_players_total_international ON players(total_international DESC);
+
+CREATE TABLE IF NOT EXISTS seasons (
+    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    year INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (player_id, year, type)
+) WITHOUT ROWID;
+"""
+
+# Colunas de players que podem ordenar o top N.
+RANKINGS = {"total": "total", "club": "total_club", "international": "total_international"}
+
+COLUMNS = ["name", "year", "total", "type"]
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def connect(path="data/goal500.db", create=True):
+    """
+    Abre (e, se preciso, cria) o banco de estatísticas.
+
+    Args:
+        path (str, optional): arquivo do banco.
+        create (bool, optional): cria o arquivo e o esquema se não existirem;
+            com False, um arquivo inexistente gera FileNotFoundError (leituras
+            não devem criar um banco vazio por engano).
+
+    Returns:
+        sqlite3.Connection: conexão com chaves estrangeiras ligadas e WAL.
+    """
+    if not create and not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if create:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    # WAL: leitores (site, gráficos) não bloqueiam a extração e vice-versa.
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def start_run(conn):
+    """Registra o início de uma extração e retorna o seu id."""
+    with conn:
+        return conn.execute("INSERT INTO scrape_runs (started_at) VALUES (?)", (_now(),)).lastrowid
+
+
+def finish_run(conn, run_id, status="ok"):
+    """Fecha uma extração, contando os jogadores e linhas que ela gravou."""
+    with conn:
+        conn.execute(
+            """
+            UPDATE scrape_runs SET
+                finished_at = :finished,
+                status = :status,
+                players = (SELECT COUNT(*) FROM players WHERE last_run_id = :id),
+                rows = (SELECT COUNT(*) FROM seasons s JOIN players p ON p.id = s.player_id
+                        WHERE p.last_run_id = :id)
+            WHERE id = :id
+            """,
+            {"finished": _now(), "status": status, "id": run_id},
+        )
+
+
+def _season_rows(stats):
+    """Soma os gols por (ano, tipo) e retorna linhas (year, type, total) com tipos nativos."""
+    clean = clean_data(stats[["year", "total", "type"]].copy())
+    grouped = clean.groupby(["year", "type"])["total"].sum()
+    return [(int(year), str(kind), int(total)) for (year, kind), total in grouped.items()]
+
+
+def upsert_player(conn, name, stats, link=None, run_id=None):
+    """
+    Grava as temporadas de um jogador numa única transação.
+
+    Linhas novas são inseridas, as que mudaram são atualizadas, as que não
+    mudaram não são reescritas e as que sumiram da extração são removidas.
+
+    Args:
+        conn (sqlite3.Connection): conexão aberta com connect.
+        name (str): nome do jogador.
+        stats (pd.DataFrame): gols do jogador (colunas year, total e type).
+        link (str, optional): página do jogador (mantém o anterior se None).
+        run_id (int, optional): extração que produziu os dados.
+
+    Returns:
+        int: número de linhas (ano, tipo) do jogador após a gravação.
+    """
+    rows = _season_rows(stats)
+    totals = {"club": 0, "international": 0}
+    for _, kind, total in rows:
+        if kind in totals:
+            totals[kind] += total
+
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO players (name, link, total_club, total_international, total,
+                                 updated_at, last_run_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET
+                link = COALESCE(excluded.link, players.link),
+                total_club = excluded.total_club,
+                total_international = excluded.total_international,
+                total = excluded.total,
+                updated_at = excluded.updated_at,
+                last_run_id = COALESCE(excluded.last_run_id, players.last_run_id)
+            """,
+            (name, link, totals["club"], totals["international"],
+             totals["club"] + totals["international"], _now(), run_id),
+        )
+        (player_id,) = conn.execute("SELECT id FROM players WHERE name = ?", (name,)).fetchone()
+
+        conn.executemany(
+            """
+            INSERT INTO seasons (player_id, year, type, total) VALUES (?, ?, ?, ?)
+            ON CONFLICT (player_id, year, type) DO UPDATE SET total = excluded.total
+            WHERE seasons.total != excluded.total
+            """,
+            [(player_id, year, kind, total) for year, kind, total in rows],
+        )
+        existing = conn.execute(
+            "SELECT year, type FROM seasons WHERE player_id = ?", (player_id,)
+        ).fetchall()
+        stale = set(existing) - {(year, kind) for year, kind, _ in rows}
+        conn.executemany(
+            "DELETE FROM seasons WHERE player_id = ? AND year = ? AND type = ?",
+            [(player_id, year, kind) for year, kind in stale],
+        )
+    return len(rows)
+
+
+def import_dataframe(conn, df, run_id=None):
+    """
+    Grava no banco um DataFrame no formato de get_player_stats (ex.: o CSV atual).
+
+    Returns:
+        int: número de jogadores gravados.
+    """
+    count = 0
+    for name, stats in df.groupby("name", sort=False):
+        upsert_player(conn, name, stats, run_id=run_id)
+        count += 1
+    return count
+
+
+def _order_column(by):
+    if by not in RANKINGS:
+        raise ValueError(f"Ordenação inválida: {by!r} (use {', '.join(RANKINGS)}).")
+    return RANKINGS[by]
+
+
+def top_players(conn, n=10, by="total"):
+    """
+    Os N jogadores com mais gols, lidos pelo índice de totais.
+
+    Args:
+        conn (sqlite3.Connection): conexão aberta com connect.
+        n (int, optional): quantos jogadores.
+        by (str, optional): "total", "club" ou "international".
+
+    Returns:
+        list: dicionários com name, total_club, total_international e total.
+    """
+    column = _order_column(by)
+    cursor = conn.execute(
+        f"SELECT name, total_club, total_international, total FROM players "
+        f"ORDER BY {column} DESC, name LIMIT ?",
+        (n,),
+    )
+    keys = [description[0] for description in cursor.description]
+    return [dict(zip(keys, row)) for row in cursor]
+
+
+def load_stats(conn, names=None, top=None, by="total"):
+    """
+    Lê as estatísticas no formato de get_player_stats, só dos jogadores pedidos.
+
+    O filtro acontece no SQLite (top N pelo índice de totais, temporadas pela
+    chave primária); só as linhas selecionadas chegam ao pandas.
+
+    Args:
+        conn (sqlite3.Connection): conexão aberta com connect.
+        names (list, optional): jogadores a incluir.
+        top (int, optional): só os N jogadores com mais gols (segundo `by`).
+        by (str, optional): critério do top N ("total", "club" ou "international").
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'name', 'year', 'total' e 'type'.
+    """
+    column = _order_column(by)
+    where, params = "", []
+    if names:
+        where = f"WHERE name IN ({', '.join('?' * len(names))})"
+        params.extend(names)
+    limit = ""
+    if top is not None:
+        limit = "LIMIT ?"
+        params.append(top)
+
+    rows = conn.execute(
+        f"""
+        WITH chosen AS (
+            SELECT id, name FROM players {where} ORDER BY {column} DESC, name {limit}
+        )
+        SELECT c.name, s.year, s.total, s.type
+        FROM chosen c JOIN seasons s ON s.player_id = c.id
+        ORDER BY c.name, s.year, s.type
+        """,
+        params,
+    ).fetchall()
+    return pd.DataFrame(rows, columns=COLUMNS)
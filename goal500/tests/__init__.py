@@ -0,0 +1,4 @@
+import os
+
+# Páginas de jogadores servidas por goal500.bench_fixtures e os dados esperados.
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "wikipedia")
@@ -0,0 +1,118 @@
+"""
+Testes para as consultas analíticas com cache.
+"""
+
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from goal500 import analytics
+from goal500.utils.data_processing import prepare_visualization_data
+
+
+def _sample_data():
+    return pd.DataFrame({
+        "name": ["Player A", "Player A", "Player A", "Player B", "Player B", "Player C"],
+        "year": [2020, 2021, 2021, 2019, 2020, 2018],
+        "total": [10, 20, 3, 5, 8, 13],
+        "type": ["club", "club", "international", "club", "international", "club"],
+    })
+
+
+class TestFingerprint(unittest.TestCase):
+    """Testes para a impressão digital dos dados."""
+
+    def test_order_insensitive_and_content_sensitive(self):
+        """A ordem das linhas não importa; o conteúdo sim."""
+        data = _sample_data()
+        self.assertEqual(analytics.fingerprint(data),
+                         analytics.fingerprint(data.sample(frac=1, random_state=1)))
+        changed = data.copy()
+        changed.loc[0, "total"] = 11
+        self.assertNotEqual(analytics.fingerprint(data), analytics.fingerprint(changed))
+
+
+class TestQueries(unittest.TestCase):
+    """Testes para as consultas e o cache."""
+
+    def setUp(self):
+        analytics.configure_cache()
+        self.data = _sample_data()
+
+    def test_totals_by_type(self):
+        """Totais por tipo e ordenação por total (desc) e nome."""
+        totals = analytics.totals_by_type(self.data)
+        self.assertEqual(list(totals.index), ["Player A", "Player B", "Player C"])
+        self.assertEqual(totals.loc["Player A"].tolist(), [30, 3, 33])
+        self.assertEqual(totals.loc["Player B"].tolist(), [5, 8, 13])
+
+    def test_top_players(self):
+        """top N por tipo, com empates desfeitos pelo nome."""
+        self.assertEqual(analytics.top_players(self.data, 2),
+                         [{"name": "Player A", "total": 33}, {"name": "Player B", "total": 13}])
+        self.assertEqual(analytics.top_players(self.data, 1, "international"),
+                         [{"name": "Player B", "total": 8}])
+        with self.assertRaises(ValueError):
+            analytics.top_players(self.data, kind="assists")
+
+    def test_cumulative_curves(self):
+        """As curvas são as de prepare_visualization_data."""
+        pd.testing.assert_frame_equal(analytics.cumulative_curves(self.data),
+                                      prepare_visualization_data(self.data.copy()))
+
+    def test_compare_players(self):
+        """Comparação na ordem pedida; jogadores desconhecidos geram ValueError."""
+        rows = analytics.compare_players(self.data, ["Player B", "Player A"])
+        self.assertEqual([row["name"] for row in rows], ["Player B", "Player A"])
+        self.assertEqual(rows[1]["best_year"], 2021)
+        self.assertEqual(rows[1]["best_year_goals"], 23)
+        self.assertEqual(rows[1]["goals_per_season"], 16.5)
+        with self.assertRaises(ValueError):
+            analytics.compare_players(self.data, ["Ninguém"])
+
+    def test_hits_and_misses(self):
+        """Consultas repetidas são acertos e não recalculam nada."""
+        with patch("goal500.analytics.prepare_visualization_data",
+                   wraps=prepare_visualization_data) as prepare:
+            first = analytics.cumulative_curves(self.data)
+            second = analytics.cumulative_curves(self.data)
+            # Outro objeto com o mesmo conteúdo também acerta o cache.
+            third = analytics.cumulative_curves(self.data.copy())
+        self.assertIs(first, second)
+        self.assertIs(first, third)
+        self.assertEqual(prepare.call_count, 1)
+        info = analytics.cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (2, 1))
+
+    def test_changed_data_misses(self):
+        """Dados diferentes (inclusive alterados no lugar) são recalculados."""
+        analytics.top_players(self.data, 1)
+        self.data.loc[5, "total"] = 100
+        self.assertEqual(analytics.top_players(self.data, 1), [{"name": "Player C", "total": 100}])
+
+    def test_eviction_by_entries_and_bytes(self):
+        """O cache respeita os limites de entradas e de bytes."""
+        analytics.configure_cache(max_entries=2)
+        for n in (1, 2, 3):
+            analytics.top_players(self.data, n)
+        info = analytics.cache_info()
+        self.assertEqual(info["entries"], 2)
+        # top_players também guarda totals_by_type: 4 resultados, 2 despejados.
+        self.assertEqual(info["evictions"], 2)
+
+        analytics.configure_cache(max_bytes=1)
+        analytics.top_players(self.data, 1)
+        self.assertEqual(analytics.cache_info()["entries"], 0)
+
+    def test_mutated_in_place_is_recomputed(self):
+        """Alterar o mesmo objeto DataFrame muda a chave do cache."""
+        before = analytics.totals_by_type(self.data)
+        self.data.loc[0, "total"] = 100
+        after = analytics.totals_by_type(self.data)
+        self.assertIsNot(before, after)
+        self.assertNotEqual(before["total"].sum(), after["total"].sum())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Testes para o benchmark com dados sintéticos (bench.py).
+"""
+
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import pandas as pd
+
+from goal500.bench import (
+    compare, load_results, measure, parse_size, run_benchmarks, run_scrape_benchmark,
+    save_results, synthetic_stats, synthetic_wikipedia_html,
+)
+from goal500.scrapers.wikipedia import parse_career_tables
+
+
+class TestBench(unittest.TestCase):
+    """Testes para os geradores sintéticos, a medição e a comparação."""
+
+    def test_parse_size(self):
+        """Tamanhos aceitam sufixos k e m."""
+        self.assertEqual([parse_size(s) for s in ("10", "1k", "1.5k", "2M")],
+                         [10, 1_000, 1_500, 2_000_000])
+
+    def test_measure_keeps_existing_tracing(self):
+        """Com o tracemalloc já ligado, measure não o desliga e mede o pico da função."""
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        kept = bytearray(8 * 2**20)
+        result = measure(lambda: bytearray(2**20), repeats=1)
+        self.assertTrue(tracemalloc.is_tracing())
+        self.assertTrue(0.9 < result["peak_mb"] < 2)
+        del kept
+
+    def test_synthetic_stats(self):
+        """Os dados sintéticos são determinísticos e respeitam o tamanho das carreiras."""
+        data = synthetic_stats(20, career=(3, 5), seed=1)
+        pd.testing.assert_frame_equal(data, synthetic_stats(20, career=(3, 5), seed=1))
+        self.assertEqual(list(data.columns), ["name", "year", "total", "type"])
+        self.assertEqual(data["name"].nunique(), 20)
+        seasons = data[data["type"] == "club"].groupby("name")["year"].agg(["count", "min", "max"])
+        self.assertTrue(seasons["count"].between(3, 5).all())
+        self.assertTrue((seasons["max"] - seasons["min"] + 1 == seasons["count"]).all())
+
+    def test_synthetic_html_is_parsed(self):
+        """O parser lê as duas tabelas da página sintética e ignora os subtotais."""
+        result = parse_career_tables(synthetic_wikipedia_html(seasons=9, seed=2))
+        self.assertEqual((result["type"] == "club").sum(), 9)
+        self.assertEqual((result["type"] == "international").sum(), 9)
+        self.assertEqual(result["year"].iloc[0], "2000")
+
+    def test_run_and_compare(self):
+        """Resultados têm tempos e memória, medições caras são puladas e regressões detectadas."""
+        results = run_benchmarks(sizes=[5, 50], stages=["clean_data", "build_site_data"],
+                                 repeats=2, budget=60)
+        self.assertEqual([(r["stage"], r["players"]) for r in results["results"]],
+                         [("clean_data", 5), ("build_site_data", 5),
+                          ("clean_data", 50), ("build_site_data", 50)])
+        for result in results["results"]:
+            self.assertGreater(result["median_s"], 0)
+            self.assertGreaterEqual(result["peak_mb"], 0)
+
+        skipped = run_benchmarks(sizes=[5, 50], stages=["clean_data"], repeats=1, budget=0)
+        self.assertIsNone(skipped["results"][1]["median_s"])
+        self.assertIn("skipped", skipped["results"][1])
+
+        slower = json.loads(json.dumps(results))
+        slower["results"][0]["median_s"] *= 2
+        rows = compare(slower, results, threshold=0.2)
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(rows[0]["regression"])
+        self.assertFalse(any(row["regression"] for row in rows[1:]))
+        # Medições puladas não entram na comparação.
+        self.assertEqual(len(compare(skipped, skipped)), 1)
+
+    def test_scrape_benchmark_budget(self):
+        """A latência do servidor já pula o primeiro tamanho; o resto é extrapolado."""
+        results = run_scrape_benchmark(sizes=[5, 500], workers=[4], latency=0.01, budget=1)
+        first, second = results["results"]
+        self.assertTrue(first["correct"])
+        self.assertEqual(first["requests"], 5)
+        self.assertIsNone(second["median_s"])  # 500 x 0.01 / 4 = 1.25 s > 1 s
+        self.assertIn("skipped", second)
+        self.assertEqual(results["meta"]["latency_s"], 0.01)
+
+        skipped = run_scrape_benchmark(sizes=[1000], workers=[1], latency=1.0, budget=60)
+        self.assertIn("skipped", skipped["results"][0])
+
+    def test_save_and_load(self):
+        """Os resultados vão e voltam de JSON."""
+        results = run_benchmarks(sizes=[3], stages=["clean_data"], repeats=1, memory=False)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bench", "resultados.json")
+            save_results(results, path)
+            self.assertEqual(load_results(path), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Testes para a Wikipedia local e testes de carga do scraper contra ela.
+"""
+
+import contextlib
+import io
+import json
+import time
+import unittest
+
+import pandas as pd
+import requests
+
+from goal500 import bench_fixtures
+from goal500.bench import _rows, synthetic_stats
+from goal500.scrapers.wikipedia import (
+    get_active_players, get_player_stats, page_title, parse_career_tables,
+)
+from goal500.tests import FIXTURES_DIR
+
+
+def _quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+class TestFixtures(unittest.TestCase):
+    """As fixtures cobrem os jogadores acompanhados e reproduzem os dados esperados."""
+
+    def test_fixtures_match_expected(self):
+        pages = bench_fixtures.load_fixtures(FIXTURES_DIR)
+        expected = pd.read_csv(f"{FIXTURES_DIR}/expected.csv")
+        players = get_active_players()
+        self.assertEqual(sorted(pages), sorted(map(page_title, players["link"])))
+        for name, link in zip(players["name"], players["link"]):
+            parsed = _quiet(parse_career_tables, pages[page_title(link)])
+            self.assertEqual(_rows(parsed.assign(name=name)), _rows(expected[expected["name"] == name]))
+        self.assertIn('<span class="bday">1987-06-24</span>', pages["Lionel_Messi"])
+
+
+class TestServer(unittest.TestCase):
+    """Testes para os endpoints do servidor."""
+
+    def setUp(self):
+        self.context = bench_fixtures.running({"Player_A": "<p>A</p>", "Player_B": "<p>B</p>"})
+        self.wiki = self.context.__enter__()
+        self.session = requests.Session()
+
+    def tearDown(self):
+        self.session.close()
+        self.context.__exit__(None, None, None)
+
+    def _get(self, path, **kwargs):
+        return self.session.get(self.wiki.base_url + path, timeout=5, **kwargs)
+
+    def test_pages_and_etag(self):
+        """Páginas com ETag; If-None-Match recebe 304 até a página mudar."""
+        response = self._get("/wiki/Player_A")
+        self.assertEqual((response.status_code, response.text), (200, "<p>A</p>"))
+        etag = response.headers["ETag"]
+        self.assertEqual(self._get("/wiki/Player_A", headers={"If-None-Match": etag}).status_code, 304)
+        self.wiki.set_page("Player A", "<p>A2</p>")
+        changed = self._get("/wiki/Player_A", headers={"If-None-Match": etag})
+        self.assertEqual((changed.status_code, changed.text), (200, "<p>A2</p>"))
+        self.assertEqual(self._get("/wiki/Player_C").status_code, 404)
+
+    def test_api(self):
+        """action=parse devolve o HTML; action=query, as revisões (ou missing)."""
+        parsed = self._get("/w/api.php", params={"action": "parse", "page": "Player B",
+                                                 "format": "json"}).json()
+        self.assertEqual(parsed["parse"]["title"], "Player B")
+        self.assertEqual(parsed["parse"]["text"]["*"], "<p>B</p>")
+        self.assertEqual(self._get("/w/api.php", params={"action": "parse", "page": "Nobody"})
+                         .json()["error"]["code"], "missingtitle")
+
+        query = self._get("/w/api.php", params={"action": "query", "prop": "revisions",
+                                                "titles": "Player_A|Nobody", "format": "json"})
+        pages = list(json.loads(query.text)["query"]["pages"].values())
+        self.assertEqual(pages[0]["revisions"][0]["revid"], parsed["parse"]["revid"] - 1)
+        self.assertIn("missing", pages[1])
+
+    def test_injected_faults_and_latency(self):
+        """Latência e respostas 429/503 nas proporções pedidas (com semente)."""
+        self.wiki.latency = 0.05
+        start = time.perf_counter()
+        self._get("/wiki/Player_A")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+        self.wiki.latency = 0
+        self.wiki.error_rate, self.wiki.server_error_rate, self.wiki.retry_after = 0.3, 0.2, 2
+        responses = [self._get("/wiki/Player_A") for _ in range(200)]
+        statuses = [r.status_code for r in responses]
+        self.assertTrue(40 <= statuses.count(429) <= 80)
+        self.assertTrue(20 <= statuses.count(503) <= 60)
+        self.assertEqual(next(r for r in responses if r.status_code == 429).headers["Retry-After"], "2")
+        self.assertEqual(self.wiki.stats()["requests"], 201)
+
+
+class TestScraperLoad(unittest.TestCase):
+    """get_player_stats de ponta a ponta, em escala, com latência e falhas."""
+
+    def test_tracked_players_with_faults(self):
+        """Com 429/503 frequentes, as novas tentativas recuperam todos os dados."""
+        expected = pd.read_csv(f"{FIXTURES_DIR}/expected.csv")
+        with bench_fixtures.running(bench_fixtures.load_fixtures(FIXTURES_DIR), error_rate=0.2,
+                                    server_error_rate=0.1, seed=1) as wiki:
+            data = _quiet(get_player_stats, base_url=wiki.base_url, workers=4, retries=10)
+            stats = wiki.stats()
+        self.assertEqual(_rows(data), _rows(expected))
+        self.assertGreater(stats["status"].get(429, 0) + stats["status"].get(503, 0), 0)
+        self.assertEqual(stats["status"][200], 8)
+
+    def test_throughput_with_workers(self):
+        """80 páginas com 100 ms de latência: os workers sobrepõem a espera."""
+        n_players, latency = 80, 0.1
+        data = synthetic_stats(n_players, career=(5, 10), seed=3)
+        names = data["name"].unique()
+        titles = [name.replace(" ", "_") for name in names]
+        pages = bench_fixtures.fixture_pages(data, pd.DataFrame({"name": names, "link": titles}))
+
+        with bench_fixtures.running(pages, latency=latency, error_rate=0.05, seed=3) as wiki:
+            players = pd.DataFrame({"name": names, "link": [
+                bench_fixtures.page_link(wiki.base_url, title) for title in titles]})
+            start = time.perf_counter()
+            scraped = _quiet(get_player_stats, workers=16, retries=10, players=players)
+            elapsed = time.perf_counter() - start
+            stats = wiki.stats()
+
+        self.assertEqual(_rows(scraped), _rows(data))
+        # Em série, só a latência já somaria 8 s (sem contar as novas tentativas).
+        self.assertLess(elapsed, n_players * latency / 2)
+        self.assertGreater(stats["max_in_flight"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,12 +2,19 @@
 Testes para a interface de linha de comando.
 """
 
+import contextlib
+import io
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
+import os
+import subprocess
 import sys
+import tempfile
 
+import goal500
 from goal500.cli import main
+from goal500.utils import instrument
 
 
 class TestCLI(unittest.TestCase):
@@ -100,6 +107,152 @@ class TestCLI(unittest.TestCase):
         # Verificar se sys.exit foi chamado com código 1
         mock_exit.assert_called_once_with(1)
     
+    @patch("goal500.cli.run_pipeline")
+    @patch("goal500.cli.sys.argv", ["goal500", "pipeline", "--input", "dados.csv", "--stages", "site, plot"])
+    def test_pipeline_command(self, mock_pipeline):
+        """Testa o comando pipeline."""
+        main()
+        mock_pipeline.assert_called_once()
+        args = mock_pipeline.call_args[0]
+        self.assertEqual(args[0], "dados.csv")
+        self.assertFalse(args[1])
+        self.assertEqual(args[2], ["site", "plot"])
+
+    def test_profile_and_instrument_options(self):
+        """Testa --profile e --instrument-json em torno de um subcomando."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv = os.path.join(tmpdir, "dados.csv")
+            pd.DataFrame({
+                "name": ["A", "A", "B"], "year": [2020, 2021, 2020],
+                "total": [10, 20, 5], "type": ["club"] * 3,
+            }).to_csv(csv, index=False)
+            prof = os.path.join(tmpdir, "site.prof")
+            report = os.path.join(tmpdir, "etapas.json")
+            argv = ["goal500", "--profile", prof, "--instrument-json", report,
+                    "site", "--input", csv, "--output", os.path.join(tmpdir, "data.json")]
+            with patch("goal500.cli.sys.argv", argv):
+                main()
+
+            import json
+            import pstats
+
+            self.assertGreater(pstats.Stats(prof).total_calls, 0)
+            with open(report, encoding="utf-8") as fh:
+                stages = [row["stage"] for row in json.load(fh)["summary"]]
+            self.assertIn("clean_data", stages)
+            self.assertIn("site.build", stages)
+            self.assertIn("site.write", stages)
+        self.assertFalse(instrument.is_enabled())
+
+    def test_import_and_site_from_db(self):
+        """import grava o CSV no banco; site --db --top lê só os N maiores."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv = os.path.join(tmpdir, "dados.csv")
+            pd.DataFrame({
+                "name": ["A", "A", "B", "C"], "year": [2020, 2021, 2020, 2019],
+                "total": [10, 20, 5, 1], "type": ["club"] * 4,
+            }).to_csv(csv, index=False)
+            db = os.path.join(tmpdir, "goal500.db")
+            output = os.path.join(tmpdir, "data.json")
+            with patch("goal500.cli.sys.argv", ["goal500", "import", "--input", csv, "--db", db]):
+                main()
+            with patch("goal500.cli.sys.argv",
+                       ["goal500", "site", "--db", db, "--top", "2", "--output", output]):
+                main()
+
+            import json
+
+            with open(output, encoding="utf-8") as fh:
+                players = [p["name"] for p in json.load(fh)["players"]]
+            self.assertEqual(players, ["A", "B"])
+
+    def test_site_forecast_options(self):
+        """site --forecast 0 é rejeitado; --forecast N embute a projeção com alvo N."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv = os.path.join(tmpdir, "dados.csv")
+            pd.DataFrame({"name": ["A", "A"], "year": [2020, 2021], "total": [10, 20],
+                          "type": ["club"] * 2}).to_csv(csv, index=False)
+            output = os.path.join(tmpdir, "data.json")
+            argv = ["goal500", "site", "-i", csv, "-o", output, "--simulations", "50"]
+            with patch("goal500.cli.sys.argv", argv + ["--forecast", "0"]), \
+                    contextlib.redirect_stdout(io.StringIO()) as out:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+            self.assertEqual(exit_info.exception.code, 1)
+            self.assertIn("--forecast", out.getvalue())
+            self.assertFalse(os.path.exists(output))
+
+            with patch("goal500.cli.sys.argv", argv + ["--forecast", "25"]):
+                main()
+            import json
+
+            with open(output, encoding="utf-8") as fh:
+                self.assertEqual(json.load(fh)["forecast"]["target"], 25)
+
+    def test_site_birth_dates_errors(self):
+        """Erros no CSV de datas de nascimento apontam esse arquivo."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv = os.path.join(tmpdir, "dados.csv")
+            pd.DataFrame({"name": ["A"], "year": [2020], "total": [10],
+                          "type": ["club"]}).to_csv(csv, index=False)
+            no_column = os.path.join(tmpdir, "info.csv")
+            pd.DataFrame({"name": ["A"], "born": ["1990-01-01"]}).to_csv(no_column, index=False)
+            missing = os.path.join(tmpdir, "nao_existe.csv")
+            for birth_dates, message in ((missing, f"{missing} não encontrado"),
+                                         (no_column, "birth_date")):
+                argv = ["goal500", "site", "-i", csv, "-o", os.path.join(tmpdir, "data.json"),
+                        "--forecast", "--birth-dates", birth_dates]
+                with patch("goal500.cli.sys.argv", argv), \
+                        contextlib.redirect_stdout(io.StringIO()) as out:
+                    with self.assertRaises(SystemExit) as exit_info:
+                        main()
+                self.assertEqual(exit_info.exception.code, 1)
+                self.assertIn(message, out.getvalue())
+                self.assertNotIn(csv, out.getvalue())
+
+    def test_chunksize_with_db(self):
+        """--chunksize junto com --db sai com erro em vez de ser ignorado."""
+        argv = ["goal500", "site", "--db", "stats.db", "--chunksize", "1000"]
+        with patch("goal500.cli.sys.argv", argv), \
+                contextlib.redirect_stdout(io.StringIO()) as out:
+            with self.assertRaises(SystemExit) as exit_info:
+                main()
+        self.assertEqual(exit_info.exception.code, 1)
+        self.assertIn("--chunksize", out.getvalue())
+
+    def test_animate_unknown_format(self):
+        """animate com extensão desconhecida sai com erro, sem traceback."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv = os.path.join(tmpdir, "dados.csv")
+            pd.DataFrame({"name": ["A"], "year": [2020], "total": [10],
+                          "type": ["club"]}).to_csv(csv, index=False)
+            argv = ["goal500", "animate", "-i", csv, "-o", os.path.join(tmpdir, "x.xyz")]
+            with patch("goal500.cli.sys.argv", argv), \
+                    contextlib.redirect_stdout(io.StringIO()) as out:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main()
+        self.assertEqual(exit_info.exception.code, 1)
+        self.assertIn("Erro:", out.getvalue())
+
+    def test_snapshot_and_diff(self):
+        """snapshot grava o histórico; diff mostra os gols novos por jogador."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv = os.path.join(tmpdir, "dados.csv")
+            store = os.path.join(tmpdir, "snapshots")
+            data = pd.DataFrame({"name": ["A", "B"], "year": [2020, 2020],
+                                 "total": [10, 5], "type": ["club"] * 2})
+            data.to_csv(csv, index=False)
+            with patch("goal500.cli.sys.argv",
+                       ["goal500", "snapshot", "--input", csv, "--store", store]):
+                main()
+            data.assign(total=[13, 5]).to_csv(csv, index=False)
+            with patch("goal500.cli.sys.argv", ["goal500", "diff", "-1", csv, "--store", store]), \
+                    patch("builtins.print") as mock_print:
+                main()
+            output = "\n".join(str(call.args[0]) for call in mock_print.call_args_list if call.args)
+            self.assertIn("1 linhas alteradas", output)
+            self.assertRegex(output, r"A\s+3\s+1")
+
     @patch("goal500.cli.argparse.ArgumentParser.print_help")
     @patch("goal500.cli.sys.argv", ["goal500"])
     def test_no_command(self, mock_print_help):
@@ -111,5 +264,48 @@ class TestCLI(unittest.TestCase):
         mock_print_help.assert_called_once()
 
 
+
+class TestLazyImports(unittest.TestCase):
+    """Testes para a importação preguiçosa do pacote e da CLI."""
+
+    HEAVY = {"matplotlib", "pandas", "numpy", "requests", "imageio", "PIL"}
+
+    def _run(self, code):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                capture_output=True, text=True, check=True)
+        # Linhas do -X importtime: "import time: self | cumulative | nome".
+        imported = {line.rsplit("|", 1)[1].strip().split(".")[0]
+                    for line in result.stderr.splitlines() if line.startswith("import time:")}
+        return result.stdout, imported
+
+    def test_cli_import_is_light(self):
+        """Testa que importar a CLI não carrega bibliotecas pesadas."""
+        _, imported = self._run("import goal500.cli")
+        self.assertIn("goal500", imported)
+        self.assertEqual(imported & self.HEAVY, set())
+
+    def test_site_command_skips_plotting(self):
+        """Testa que o comando site não importa matplotlib nem requests."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv = os.path.join(tmpdir, "dados.csv")
+            pd.DataFrame({"name": ["Jogador A"], "year": [2020], "total": [10],
+                          "type": ["club"]}).to_csv(csv, index=False)
+            code = ("import sys, goal500.cli as cli; "
+                    f"sys.argv = ['goal500', 'site', '-i', {csv!r}, '-o', {os.path.join(tmpdir, 'data.json')!r}]; "
+                    "cli.main()")
+            _, imported = self._run(code)
+        self.assertIn("pandas", imported)
+        self.assertEqual(imported & {"matplotlib", "requests", "imageio"}, set())
+
+    def test_package_attributes(self):
+        """Testa que os atributos públicos do pacote continuam acessíveis."""
+        from goal500.visualization.plots import plot_batch
+
+        self.assertIs(goal500.plot_batch, plot_batch)
+        self.assertTrue(set(goal500.__all__) <= set(dir(goal500)))
+        with self.assertRaises(AttributeError):
+            goal500.nao_existe
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,11 +2,18 @@
 Testes para o módulo de processamento de dados.
 """
 
+import os
+import tempfile
 import unittest
 import pandas as pd
 import numpy as np
 
-from goal500.utils.data_processing import clean_data, calculate_cumulative_goals, prepare_visualization_data
+from goal500.bench import synthetic_stats
+from goal500.site import build_site_data
+from goal500.utils.data_processing import (
+    aggregate_csv, clean_data, calculate_cumulative_goals, cumulative_goals_from_csv,
+    prepare_visualization_data,
+)
 
 
 class TestDataProcessing(unittest.TestCase):
@@ -109,5 +116,48 @@ class TestDataProcessing(unittest.TestCase):
         self.assertTrue(result_empty.empty)
 
 
+class TestChunkedAggregation(unittest.TestCase):
+    """O caminho em blocos dá o mesmo resultado que a leitura inteira."""
+
+    MESSY = (
+        "year,total,type,name\n"
+        "2001,5,club,A\n2001,3,international,A\nabc,4,club,A\n2002,,club,B\n"
+        "2002,7,club,B\n2003,2.5,club,C\n2001,1,club,A\n2004,x,club,C\n"
+        ",3,club,D\n2005,9,club,\n2002,1,,B\n"
+    )
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "dados.csv")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _assert_same(self, chunksizes):
+        expected = prepare_visualization_data(pd.read_csv(self.path))
+        for chunksize in chunksizes:
+            with self.subTest(chunksize=chunksize):
+                pd.testing.assert_frame_equal(cumulative_goals_from_csv(self.path, chunksize), expected)
+
+    def test_messy_file(self):
+        """Anos/totais inválidos ou vazios em alguns blocos: float64, como na leitura inteira."""
+        with open(self.path, "w", encoding="utf-8") as fh:
+            fh.write(self.MESSY)
+        self._assert_same([1, 2, 3, 100])
+        self.assertEqual(aggregate_csv(self.path, 2)["total"].dtype, np.float64)
+
+    def test_duplicated_sources(self):
+        """Muitas cópias das mesmas chaves, embaralhadas: as parciais são combinadas."""
+        data = synthetic_stats(40, career=(3, 6), seed=2)
+        copies = pd.concat([data] * 5, ignore_index=True).sample(frac=1, random_state=0)
+        copies.to_csv(self.path, index=False)
+        self._assert_same([7, 50, 10_000])
+
+        aggregated = aggregate_csv(self.path, 7)
+        self.assertEqual(len(aggregated), len(data.drop_duplicates(["name", "year", "type"])))
+        self.assertEqual(aggregated["total"].dtype, np.int64)
+        self.assertEqual(build_site_data(aggregated), build_site_data(copies))
+
+
 if __name__ == "__main__":
     unittest.main()
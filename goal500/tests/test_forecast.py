@@ -0,0 +1,119 @@
+"""
+Testes para a projeção (Monte Carlo) da corrida aos 500 gols.
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+from goal500 import forecast
+from goal500.bench import synthetic_stats
+from goal500.site import build_site_data, player_entries, write_site_data
+from goal500.utils.data_processing import clean_data
+
+
+def _sample_data():
+    """Veterano acima de 500, artilheiro jovem perto de 500 e aposentado abaixo."""
+    years = list(range(2015, 2027))
+    rows = [("Veterano", year, 60, "club") for year in years]
+    rows += [("Jovem", year, 45, "club") for year in years[3:-1]] + [("Jovem", 2026, 10, "club")]
+    rows += [("Jovem", year, 8, "international") for year in years[3:]]
+    rows += [("Aposentado", year, 30, "club") for year in range(2005, 2015)]
+    return pd.DataFrame(rows, columns=["name", "year", "total", "type"])
+
+
+class TestForecast(unittest.TestCase):
+    """Testes para forecast, forecast_entries e probability_of_reaching."""
+
+    def setUp(self):
+        self.data = _sample_data()
+
+    def test_summary_per_player(self):
+        """Quem já passou do alvo tem probabilidade 1; quem parou não chega."""
+        result = forecast.forecast(self.data, target=500, n_sims=2000, horizon=10)
+        self.assertEqual(result["start_year"], 2026)
+        self.assertEqual(result["years"], list(range(2026, 2037)))
+        players = result["players"]
+
+        self.assertEqual(players["Veterano"]["probability"], 1.0)
+        self.assertEqual(players["Veterano"]["reached_year"], 2023)
+        self.assertEqual(players["Aposentado"]["probability"], 0.0)
+        self.assertIsNone(players["Aposentado"]["median_year"])
+
+        young = players["Jovem"]
+        self.assertEqual(young["goals"], 45 * 8 + 10 + 8 * 9)
+        self.assertGreater(young["probability"], 0.9)
+        self.assertLessEqual(young["p10_year"], young["median_year"])
+        self.assertLessEqual(young["median_year"], young["p90_year"])
+        self.assertAlmostEqual(sum(young["by_year"]), young["probability"], places=2)
+
+    def test_deterministic_by_seed(self):
+        """Mesma semente, mesmo resultado; outra semente muda as simulações."""
+        first = forecast.forecast(self.data, target=600, n_sims=1000, seed=1)
+        self.assertEqual(first, forecast.forecast(self.data, target=600, n_sims=1000, seed=1))
+        other = forecast.forecast(self.data, target=600, n_sims=1000, seed=2)
+        self.assertNotEqual(first["players"]["Jovem"]["by_year"], other["players"]["Jovem"]["by_year"])
+
+    def test_birth_dates_move_retirement(self):
+        """Com data de nascimento, um jogador mais velho se aposenta antes."""
+        probability = [
+            forecast.forecast(self.data, target=800, n_sims=2000,
+                              birth_dates={"Jovem": birth})["players"]["Jovem"]["probability"]
+            for birth in ("2000-01-01", "1988-01-01")
+        ]
+        self.assertGreater(probability[0], probability[1])
+
+    def test_missing_birth_dates_use_career(self):
+        """Data de nascimento ausente (NaN/None) usa o tempo de carreira; alvo precisa ser positivo."""
+        base = forecast.forecast(self.data, target=800, n_sims=500)
+        for missing in (float("nan"), None, pd.NA):
+            self.assertEqual(forecast.forecast(self.data, target=800, n_sims=500,
+                                               birth_dates={"Jovem": missing}), base)
+        with self.assertRaises(ValueError):
+            forecast.forecast(self.data, target=0, n_sims=10)
+
+    def test_probability_of_reaching(self):
+        """Uma simulação para vários alvos: probabilidade não cresce com o alvo."""
+        table = forecast.probability_of_reaching(self.data, targets=[500, 600, 700], n_sims=2000)
+        self.assertEqual(list(table.columns), [500, 600, 700])
+        self.assertEqual(sorted(table.index), ["Aposentado", "Jovem", "Veterano"])
+        self.assertTrue(((table >= 0) & (table <= 1)).all().all())
+        self.assertTrue((table.diff(axis=1).iloc[:, 1:] <= 0).all().all())
+
+    def test_many_players_in_seconds(self):
+        """200 jogadores x 20 mil simulações em poucos segundos (em blocos)."""
+        entries = player_entries(clean_data(synthetic_stats(200, career=(5, 15), seed=0))).values()
+        start = time.perf_counter()
+        result = forecast.forecast_entries(entries, targets=[300], n_sims=20_000, horizon=10)
+        self.assertLess(time.perf_counter() - start, 10)
+        self.assertEqual(len(result["players"]["300"]), 200)
+
+
+class TestSiteForecast(unittest.TestCase):
+    """A projeção embutida no JSON da página."""
+
+    def test_build_site_data_embeds_forecast(self):
+        data = _sample_data()
+        self.assertNotIn("forecast", build_site_data(data))
+        site = build_site_data(data, forecast={"target": 600, "n_sims": 500})
+        self.assertEqual(site["forecast"], forecast.forecast(data, target=600, n_sims=500))
+        self.assertEqual(set(site["forecast"]["players"]), {p["name"] for p in site["players"]})
+
+    def test_manifest_tracks_forecast_options(self):
+        """Mudar as opções da projeção refaz o JSON mesmo com os dados iguais."""
+        data = _sample_data()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = os.path.join(tmpdir, "data.json")
+            manifest = os.path.join(tmpdir, "manifest.json")
+            write_site_data(data, out, manifest, forecast={"n_sims": 200})
+            write_site_data(data, out, manifest, forecast={"n_sims": 200, "target": 600})
+            with open(out, encoding="utf-8") as fh:
+                self.assertEqual(json.load(fh)["forecast"]["target"], 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
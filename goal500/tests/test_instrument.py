@@ -0,0 +1,132 @@
+"""
+Testes para a instrumentação das etapas.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+
+from goal500.utils import instrument
+
+
+class TestInstrument(unittest.TestCase):
+    """Testes para goal500.utils.instrument."""
+
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_disabled_is_noop(self):
+        """Sem enable(), as etapas executam o código mas não registram nada."""
+        with instrument.stage("etapa"):
+            value = 1 + 1
+        self.assertEqual(value, 2)
+        self.assertEqual(instrument.records(), [])
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_stage_records_time_and_memory(self):
+        """Cada execução registra tempo de parede, CPU e pico de memória."""
+        instrument.enable()
+        with instrument.stage("aloca"):
+            buffer = bytearray(8 * 2**20)
+            time.sleep(0.01)
+        del buffer
+
+        (record,) = instrument.records()
+        self.assertEqual(record["stage"], "aloca")
+        self.assertGreaterEqual(record["wall_s"], 0.01)
+        self.assertGreaterEqual(record["cpu_s"], 0.0)
+        self.assertGreaterEqual(record["peak_mb"], 8.0)
+
+    def test_nested_peak_reaches_outer_stage(self):
+        """O pico de uma etapa interna também conta para a externa."""
+        instrument.enable()
+        with instrument.stage("externa"):
+            with instrument.stage("interna"):
+                buffer = bytearray(8 * 2**20)
+                del buffer
+            small = bytearray(2**10)
+        del small
+
+        peaks = {r["stage"]: r["peak_mb"] for r in instrument.records()}
+        self.assertGreaterEqual(peaks["interna"], 8.0)
+        self.assertGreaterEqual(peaks["externa"], peaks["interna"])
+
+    def test_threads_keep_their_own_stages(self):
+        """Etapas em threads paralelas não se misturam nem mexem no pico da principal."""
+        instrument.enable()
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def worker():
+            try:
+                with instrument.stage("thread"):
+                    barrier.wait(timeout=5)  # todas as threads com etapas abertas
+                    with instrument.stage("thread-interna"):
+                        barrier.wait(timeout=5)
+            except Exception as e:  # noqa: BLE001 - repassado ao teste
+                errors.append(e)
+
+        with instrument.stage("lote"):
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            buffer = bytearray(8 * 2**20)
+            del buffer
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        records = instrument.records()
+        self.assertEqual([r["stage"] for r in records].count("thread"), 4)
+        self.assertEqual([r["stage"] for r in records].count("thread-interna"), 4)
+        self.assertTrue(all(r["peak_mb"] is None for r in records if r["stage"] != "lote"))
+        self.assertGreaterEqual(records[-1]["peak_mb"], 8.0)
+
+    def test_without_memory(self):
+        """Com memory=False, o pico fica None."""
+        instrument.enable(memory=False)
+        with instrument.stage("rapida"):
+            pass
+        self.assertIsNone(instrument.records()[0]["peak_mb"])
+
+    def test_decorator_and_summary(self):
+        """O decorador registra cada chamada; o resumo agrega por etapa."""
+        @instrument.instrumented("dobro")
+        def dobro(x):
+            return 2 * x
+
+        instrument.enable()
+        self.assertEqual([dobro(i) for i in range(3)], [0, 2, 4])
+        with instrument.stage("outra"):
+            pass
+
+        summary = instrument.summary()
+        self.assertEqual([row["stage"] for row in summary], ["dobro", "outra"])
+        self.assertEqual(summary[0]["calls"], 3)
+        self.assertAlmostEqual(summary[0]["wall_s"],
+                               sum(r["wall_s"] for r in instrument.records()[:3]))
+
+    def test_write_json(self):
+        """O JSON traz o resumo e os registros individuais."""
+        instrument.enable()
+        with instrument.stage("etapa"):
+            pass
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "sub", "etapas.json")
+            instrument.write_json(output)
+            with open(output, encoding="utf-8") as fh:
+                payload = json.load(fh)
+        self.assertEqual(payload["summary"][0]["stage"], "etapa")
+        self.assertEqual(len(payload["records"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Testes para o manifesto de build (utils/manifest.py).
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from goal500.utils.data_processing import clean_data
+from goal500.utils.manifest import (
+    atomic_path, atomic_write, data_fingerprint, fingerprint, is_up_to_date, record,
+)
+
+
+class TestManifest(unittest.TestCase):
+    """Testes para fingerprint, escritas atômicas e registro no manifesto."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.data = pd.DataFrame({
+            "name": ["Jogador A", "Jogador A", "Jogador B"],
+            "year": [2020, 2021, 2020],
+            "total": [10, 15, 20],
+            "type": ["club", "club", "international"],
+        })
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fingerprint_normalizes_data(self):
+        """Ordem das linhas, tipos numéricos e colunas extras não mudam o hash."""
+        key = fingerprint(self.data, stage="site")
+        shuffled = self.data.iloc[[2, 0, 1]].astype({"year": float, "total": float})
+        shuffled["extra"] = 1
+        self.assertEqual(fingerprint(shuffled, stage="site"), key)
+        # Linhas inválidas (removidas por clean_data) também não contam.
+        invalid = pd.concat([self.data, pd.DataFrame({
+            "name": ["Jogador C"], "year": ["?"], "total": [1], "type": ["club"]})])
+        self.assertEqual(fingerprint(invalid, stage="site"), key)
+
+    def test_data_fingerprint_of_clean_data(self):
+        """Dados já limpos dão a mesma impressão digital sem passar por clean_data de novo."""
+        raw = self.data.iloc[[2, 0, 1]]
+        self.assertEqual(data_fingerprint(clean_data(raw.copy()), clean=True), data_fingerprint(raw))
+        key = fingerprint(self.data, stage="site")
+        self.assertEqual(fingerprint(None, data_fingerprint(self.data), stage="site"), key)
+
+    def test_fingerprint_changes(self):
+        """Dados ou parâmetros diferentes mudam o hash."""
+        key = fingerprint(self.data, stage="site")
+        changed = self.data.copy()
+        changed.loc[0, "total"] = 11
+        self.assertNotEqual(fingerprint(changed, stage="site"), key)
+        self.assertNotEqual(fingerprint(self.data, stage="plot"), key)
+
+    def test_atomic_path(self):
+        """O destino só é substituído quando a escrita termina; falhas não deixam lixo."""
+        path = os.path.join(self.dir, "saida.json")
+        atomic_write(path, "antigo")
+        with self.assertRaises(RuntimeError):
+            with atomic_path(path) as tmp:
+                self.assertTrue(tmp.endswith(".json"))
+                with open(tmp, "w") as fh:
+                    fh.write("parcial")
+                raise RuntimeError("falhou")
+        with open(path) as fh:
+            self.assertEqual(fh.read(), "antigo")
+        self.assertEqual(os.listdir(self.dir), ["saida.json"])
+
+    def test_record_and_check(self):
+        """Um artefato registrado fica atualizado enquanto existir e o hash bater."""
+        manifest = os.path.join(self.dir, "build_manifest.json")
+        output = os.path.join(self.dir, "grafico.png")
+        self.assertFalse(is_up_to_date(manifest, [output], "abc"))
+        record(manifest, output, "abc", "plot")
+        self.assertFalse(is_up_to_date(manifest, [output], "abc"))  # arquivo não existe
+        atomic_write(output, b"png")
+        self.assertTrue(is_up_to_date(manifest, [output], "abc"))
+        self.assertFalse(is_up_to_date(manifest, [output], "def"))
+        with open(manifest) as fh:
+            self.assertEqual(json.load(fh)[os.path.normpath(output)]["stage"], "plot")
+
+
+if __name__ == "__main__":
+    unittest.main()
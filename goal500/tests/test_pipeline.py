@@ -0,0 +1,151 @@
+"""
+Testes para o pipeline em processo único (pipeline.py).
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from goal500 import pipeline
+from goal500.cli import main
+from goal500.pipeline import run_pipeline
+from goal500.site import build_site_data
+
+
+class TestPipeline(unittest.TestCase):
+    """Testes para run_pipeline."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.data = pd.DataFrame({
+            "name": ["Jogador A", "Jogador A", "Jogador A", "Jogador B", "Jogador B"],
+            "year": [2020, 2021, 2020, 2019, 2020],
+            "total": [10, 15, 3, 5, 7],
+            "type": ["club", "club", "international", "club", "club"],
+        })
+        self.csv = os.path.join(self.dir, "dados.csv")
+        self.data.to_csv(self.csv, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _outputs(self):
+        return {
+            "site_output": os.path.join(self.dir, "docs", "data.json"),
+            "plot_output": os.path.join(self.dir, "images", "grafico.png"),
+            "animation_output": os.path.join(self.dir, "images", "animacao.gif"),
+        }
+
+    def test_all_stages_share_one_load(self):
+        """Todas as etapas rodam com uma única leitura e uma única limpeza."""
+        outputs = self._outputs()
+        with patch("goal500.pipeline.pd.read_csv", wraps=pd.read_csv) as mock_read, \
+                patch("goal500.pipeline.clean_data", wraps=pipeline.clean_data) as mock_clean:
+            timings = run_pipeline(self.csv, **outputs)
+
+        mock_read.assert_called_once_with(self.csv)
+        mock_clean.assert_called_once()
+        for path in outputs.values():
+            self.assertTrue(os.path.getsize(path) > 0)
+        self.assertEqual(list(timings),
+                         ["load", "clean", "prepare", "site", "plot", "animate", "total"])
+
+        # O JSON do pipeline é o mesmo de build_site_data.
+        with open(outputs["site_output"], encoding="utf-8") as fh:
+            self.assertEqual(json.load(fh), build_site_data(self.data))
+
+    def test_parallel_stages(self):
+        """Com jobs > 1 as etapas rodam no pool e geram os mesmos arquivos."""
+        outputs = self._outputs()
+        run_pipeline(self.csv, **outputs)
+        with open(outputs["site_output"], "rb") as fh:
+            expected = fh.read()
+        parallel = {key: path + ".paralelo" + os.path.splitext(path)[1]
+                    for key, path in outputs.items()}
+        run_pipeline(self.csv, jobs=3, **parallel)
+        with open(parallel["site_output"], "rb") as fh:
+            self.assertEqual(fh.read(), expected)
+        with open(outputs["animation_output"], "rb") as a, \
+                open(parallel["animation_output"], "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_manifest_skips_unchanged(self):
+        """Com o manifesto, uma segunda execução com os mesmos dados não regera nada."""
+        outputs = self._outputs()
+        manifest = os.path.join(self.dir, "build_manifest.json")
+        run_pipeline(self.csv, manifest=manifest, **outputs)
+        mtimes = {path: os.stat(path).st_mtime_ns for path in outputs.values()}
+
+        with patch("goal500.visualization.plots._draw_cumulative") as mock_draw, \
+                patch("goal500.visualization.plots.write_animation") as mock_write, \
+                patch("goal500.site._write_site") as mock_site:
+            run_pipeline(self.csv, manifest=manifest, **outputs)
+        mock_draw.assert_not_called()
+        mock_write.assert_not_called()
+        mock_site.assert_not_called()
+        self.assertEqual({path: os.stat(path).st_mtime_ns for path in outputs.values()}, mtimes)
+
+        # Dados novos regeram as saídas.
+        self.data.loc[0, "total"] = 99
+        self.data.to_csv(self.csv, index=False)
+        run_pipeline(self.csv, manifest=manifest, **outputs)
+        for path in outputs.values():
+            self.assertNotEqual(os.stat(path).st_mtime_ns, mtimes[path])
+
+    def test_manifest_shared_with_subcommands(self):
+        """Os subcomandos site, plot e animate reconhecem o que o pipeline registrou."""
+        outputs = self._outputs()
+        manifest = os.path.join(self.dir, "build_manifest.json")
+        run_pipeline(self.csv, manifest=manifest, **outputs)
+
+        commands = [
+            ["site", "--output", outputs["site_output"]],
+            ["plot", "--output", outputs["plot_output"]],
+            ["animate", "--output", outputs["animation_output"]],
+        ]
+        with patch("goal500.visualization.plots._draw_cumulative") as mock_draw, \
+                patch("goal500.visualization.plots.write_animation") as mock_write, \
+                patch("goal500.site._write_site") as mock_site:
+            for command in commands:
+                argv = ["goal500", *command, "--input", self.csv, "--manifest", manifest]
+                with patch("goal500.cli.sys.argv", argv):
+                    main()
+        mock_draw.assert_not_called()
+        mock_write.assert_not_called()
+        mock_site.assert_not_called()
+
+    def test_selected_stages(self):
+        """Só as etapas pedidas são executadas."""
+        outputs = self._outputs()
+        timings = run_pipeline(self.csv, stages=["site"], **outputs)
+        self.assertTrue(os.path.exists(outputs["site_output"]))
+        self.assertFalse(os.path.exists(outputs["plot_output"]))
+        self.assertFalse(os.path.exists(outputs["animation_output"]))
+        self.assertNotIn("prepare", timings)
+
+    def test_extract(self):
+        """Com extract=True os dados vêm do scraper e são salvos no CSV."""
+        target = os.path.join(self.dir, "novo", "dados.csv")
+        with patch("goal500.scrapers.wikipedia.get_player_stats", return_value=self.data) as mock_get:
+            timings = run_pipeline(target, extract=True, stages=["site"], **self._outputs())
+        mock_get.assert_called_once()
+        self.assertIn("extract", timings)
+        self.assertEqual(len(pd.read_csv(target)), len(self.data))
+
+    def test_invalid_arguments(self):
+        """Etapas desconhecidas e formatos inválidos falham antes de ler os dados."""
+        with patch("goal500.pipeline.pd.read_csv") as mock_read:
+            with self.assertRaises(ValueError):
+                run_pipeline(self.csv, stages=["site", "video"])
+            with self.assertRaises(ValueError):
+                run_pipeline(self.csv, animation_output="animacao.avi")
+        mock_read.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Testes para o refresh-daemon (agenda por prioridade, orçamento e saídas).
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from goal500 import bench_fixtures, refresher, storage
+from goal500.bench import _rows
+from goal500.scrapers.wikipedia import MAX_TITLES, get_revisions
+from goal500.snapshots import list_snapshots
+from goal500.tests import FIXTURES_DIR
+
+START = 1_800_000_000.0
+DAY = 24 * refresher.HOUR
+
+
+def _summed(data):
+    """Gols somados por (jogador, ano, tipo), como o banco guarda."""
+    return _rows(data.groupby(["name", "year", "type"], as_index=False)["total"].sum())
+
+
+def _quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Testes para o orçamento de requisições."""
+
+    def test_take_refill_and_wait(self):
+        bucket = refresher.TokenBucket(per_hour=4, updated_at=0)
+        self.assertEqual([bucket.take(0) for _ in range(5)], [True] * 4 + [False])
+        self.assertAlmostEqual(bucket.wait(0, 2), refresher.HOUR / 2)
+        self.assertTrue(bucket.take(refresher.HOUR / 4))
+        self.assertFalse(bucket.take(refresher.HOUR / 4))
+        bucket.refill(10 * refresher.HOUR)
+        self.assertEqual(bucket.tokens, 4)  # não passa da capacidade
+        with self.assertRaises(ValueError):
+            refresher.TokenBucket(0)
+
+    def test_refresh_interval(self):
+        """Mais gols recentes, atualizações mais frequentes; sem gols, raramente."""
+        self.assertEqual(refresher.refresh_interval(0), refresher.RETIRED_INTERVAL)
+        self.assertEqual(refresher.refresh_interval(None), refresher.MIN_INTERVAL)
+        self.assertEqual(refresher.refresh_interval(1000), refresher.MIN_INTERVAL)
+        self.assertGreater(refresher.refresh_interval(10), refresher.refresh_interval(60))
+        self.assertLess(refresher.refresh_interval(1), refresher.BASE_INTERVAL)
+
+
+class TestRefresher(unittest.TestCase):
+    """O daemon de ponta a ponta contra a Wikipedia local, com relógio simulado."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.context = bench_fixtures.running(bench_fixtures.load_fixtures(FIXTURES_DIR))
+        self.wiki = self.context.__enter__()
+        self.now = START
+        self.expected = pd.read_csv(f"{FIXTURES_DIR}/expected.csv")
+
+    def tearDown(self):
+        self.context.__exit__(None, None, None)
+        self.tmpdir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def _refresher(self, budget=100, **kwargs):
+        instance = refresher.Refresher(self._path("goal500.db"), self._path("schedule.json"), budget,
+                                       self.wiki.base_url, clock=lambda: self.now, **kwargs)
+        self.addCleanup(instance.close)
+        return instance
+
+    def _requests(self):
+        return self.wiki.stats()["requests"]
+
+    def _stored(self):
+        conn = storage.connect(self._path("goal500.db"), create=False)
+        try:
+            return storage.load_stats(conn)
+        finally:
+            conn.close()
+
+    def test_get_revisions(self):
+        revisions = get_revisions(["Lionel_Messi", "Harry Kane", "Nobody"], self.wiki.base_url)
+        self.assertEqual(set(revisions), {"Lionel_Messi", "Harry_Kane", "Nobody"})
+        self.assertIsNone(revisions["Nobody"])
+        self.wiki.set_page("Lionel_Messi", "<p>editada</p>")
+        self.assertGreater(get_revisions(["Lionel_Messi"], self.wiki.base_url)["Lionel_Messi"],
+                           revisions["Lionel_Messi"])
+        with self.assertRaises(ValueError):
+            get_revisions(["A"] * (MAX_TITLES + 1))
+
+    def test_get_revisions_follows_redirects(self):
+        """Um link que redireciona recebe a revisão da página de destino."""
+        self.wiki.set_redirect("Neymar_Jr", "Neymar")
+        before = get_revisions(["Neymar_Jr", "Neymar"], self.wiki.base_url)
+        self.assertEqual(before["Neymar_Jr"], before["Neymar"])
+        self.wiki.set_page("Neymar", "<p>editada</p>")
+        after = get_revisions(["Neymar Jr"], self.wiki.base_url)
+        self.assertGreater(after["Neymar_Jr"], before["Neymar_Jr"])
+
+    def test_redirected_link_is_refreshed_after_edits(self):
+        """Editar a página de destino faz o daemon baixar de novo o jogador."""
+        self.wiki.set_redirect("Neymar_Jr", "Neymar")
+        players = pd.DataFrame({"name": ["Neymar Jr"],
+                                "link": [bench_fixtures.page_link(self.wiki.base_url, "Neymar_Jr")]})
+        daemon = self._refresher(players=players)
+        self.assertEqual(_quiet(daemon.run_once)["fetched"], ["Neymar Jr"])
+
+        self.now += 30 * DAY
+        self.assertEqual(_quiet(daemon.run_once)["unchanged"], ["Neymar Jr"])
+        self.wiki.set_page("Neymar", bench_fixtures.load_fixtures(FIXTURES_DIR)["Neymar"].replace("<table", "<p></p><table", 1))
+        self.now += 30 * DAY
+        self.assertEqual(_quiet(daemon.run_once)["fetched"], ["Neymar Jr"])
+
+    def test_first_cycle_and_priority(self):
+        """O primeiro ciclo extrai todos; a agenda põe os mais ativos na frente."""
+        daemon = self._refresher()
+        summary = _quiet(daemon.run_once)
+        self.assertEqual(len(summary["updated"]), 8)
+        self.assertEqual(self._requests(), 9)  # 1 consulta de revisões + 8 páginas
+        self.assertEqual(_summed(self._stored()), _summed(self.expected))
+
+        recent = [entry["recent_goals"] for _, _, entry in daemon.queue()]
+        self.assertEqual(recent, sorted(recent, reverse=True))
+        self.assertGreater(min(recent), 0)
+        # Nada vencido: nenhum pedido novo.
+        self.assertEqual(_quiet(daemon.run_once)["checked"], [])
+        self.assertEqual(self._requests(), 9)
+        self.assertAlmostEqual(daemon.next_delay(),
+                               refresher.refresh_interval(recent[0]), delta=1)
+
+    def test_only_changed_pages_are_fetched(self):
+        """Páginas sem nova revisão custam só a consulta; as editadas alimentam as saídas."""
+        _quiet(self._refresher(snapshots=self._path("snapshots"), output=self._path("dados.csv"))
+               .run_once)
+        self.assertEqual(len(list_snapshots(self._path("snapshots"))), 1)
+
+        self.now += 8 * DAY
+        stats = self.expected[self.expected["name"] == "Harry Kane"]
+        last = stats.loc[stats["type"] == "club", "year"].max()
+        changed = stats.assign(total=stats["total"].where(
+            (stats["year"] != last) | (stats["type"] != "club"), stats["total"] + 3))
+        players = pd.DataFrame({"name": ["Harry Kane"], "link": ["Harry_Kane"]})
+        self.wiki.set_page("Harry_Kane", bench_fixtures.fixture_pages(changed, players)["Harry_Kane"])
+
+        requests_before = self._requests()
+        daemon = self._refresher(snapshots=self._path("snapshots"), output=self._path("dados.csv"))
+        summary = _quiet(daemon.run_once)
+        self.assertEqual(len(summary["checked"]), 8)
+        self.assertEqual(summary["fetched"], ["Harry Kane"])
+        self.assertEqual(summary["updated"], ["Harry Kane"])
+        self.assertEqual(self._requests() - requests_before, 2)
+
+        stored = self._stored()
+        kane = stored[(stored["name"] == "Harry Kane") & (stored["year"] == last)
+                      & (stored["type"] == "club")]
+        self.assertEqual(kane["total"].sum(), changed.loc[
+            (changed["year"] == last) & (changed["type"] == "club"), "total"].sum())
+        self.assertEqual(list_snapshots(self._path("snapshots"))[-1]["changes"], 1)
+        self.assertEqual(_rows(pd.read_csv(self._path("dados.csv"))), _rows(stored))
+
+    def test_budget_survives_restart(self):
+        """O orçamento limita cada ciclo e o saldo persiste entre reinícios."""
+        summary = _quiet(self._refresher(budget=4).run_once)
+        self.assertEqual(len(summary["checked"]), 3)  # 1 consulta + 3 páginas
+        self.assertEqual(self._requests(), 4)
+
+        restarted = self._refresher(budget=4)
+        self.assertEqual(_quiet(restarted.run_once)["checked"], [])
+        self.assertAlmostEqual(restarted.next_delay(), refresher.HOUR / 2)
+
+        self.now += refresher.HOUR
+        summary = _quiet(restarted.run_once)
+        self.assertEqual(len(summary["fetched"]), 3)
+        self.assertEqual(self._requests(), 8)
+        pending = [name for _, name, entry in restarted.queue() if entry["last_refresh"] is None]
+        self.assertEqual(len(pending), 2)
+
+    def test_rate_limit_pauses(self):
+        """Um 429 pausa o daemon pelo Retry-After, sem perder os jogadores vencidos."""
+        self.wiki.error_rate, self.wiki.retry_after = 1.0, 120
+        daemon = self._refresher()
+        summary = _quiet(daemon.run_once)
+        self.assertEqual(summary["fetched"], [])
+        self.assertEqual(self._requests(), 1)
+        self.assertAlmostEqual(daemon.next_delay(), 120)
+
+        self.wiki.error_rate = 0
+        self.now += 60
+        self.assertEqual(_quiet(daemon.run_once)["checked"], [])
+        self.now += 61
+        self.assertEqual(len(_quiet(daemon.run_once)["updated"]), 8)
+
+    def test_failures_back_off(self):
+        """Página inexistente: o jogador volta depois de uma espera crescente."""
+        players = pd.DataFrame({"name": ["Nobody"],
+                                "link": [bench_fixtures.page_link(self.wiki.base_url, "Nobody")]})
+        daemon = self._refresher(players=players)
+        summary = _quiet(daemon.run_once)
+        self.assertEqual(summary["failed"], ["Nobody"])
+        due = dict((name, due_at) for due_at, name, _ in daemon.queue())
+        self.assertAlmostEqual(due["Nobody"] - self.now, refresher.RETRY_DELAY)
+        self.now += refresher.RETRY_DELAY
+        _quiet(daemon.run_once)
+        due = dict((name, due_at) for due_at, name, _ in daemon.queue())
+        self.assertAlmostEqual(due["Nobody"] - self.now, 2 * refresher.RETRY_DELAY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Testes para o executor de grafos de tarefas (scheduler.py).
+"""
+
+import time
+import unittest
+
+from goal500.scheduler import critical_path, run_dag
+
+
+def _value(x):
+    return x
+
+
+def _add(*values):
+    return sum(values)
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+class TestScheduler(unittest.TestCase):
+    """Testes para run_dag e critical_path."""
+
+    def setUp(self):
+        # a -> (b, c) -> d
+        self.tasks = {
+            "a": (_value, [], {"x": 1}),
+            "b": (_add, ["a"], {}),
+            "c": (_add, ["a", "a"], None),
+            "d": (_add, ["b", "c"], None),
+        }
+
+    def test_serial_and_parallel_results(self):
+        """As dependências chegam na ordem declarada, em série ou no pool."""
+        for jobs in (1, 2):
+            results, durations = run_dag(self.tasks, jobs)
+            self.assertEqual(results, {"a": 1, "b": 1, "c": 2, "d": 3})
+            self.assertEqual(list(durations), ["a", "b", "c", "d"])
+
+    def test_independent_tasks_overlap(self):
+        """Tarefas independentes rodam ao mesmo tempo: o total fica perto da mais lenta."""
+        tasks = {name: (_sleep, [], {"seconds": 0.5}) for name in ("x", "y", "z")}
+        start = time.perf_counter()
+        run_dag(tasks, jobs=3)
+        self.assertLess(time.perf_counter() - start, 1.2)
+
+    def test_invalid_graph(self):
+        """Dependências inexistentes e ciclos são rejeitados."""
+        with self.assertRaises(ValueError):
+            run_dag({"a": (_value, ["b"], {"x": 1})})
+        with self.assertRaises(ValueError):
+            run_dag({"a": (_add, ["b"], None), "b": (_add, ["a"], None)})
+
+    def test_critical_path(self):
+        """O caminho crítico é a cadeia com maior tempo somado."""
+        durations = {"a": 1.0, "b": 5.0, "c": 2.0, "d": 1.0}
+        self.assertEqual(critical_path(self.tasks, durations), (["a", "b", "d"], 7.0))
+        self.assertEqual(critical_path({}, {}), ([], 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
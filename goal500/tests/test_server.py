@@ -0,0 +1,215 @@
+"""
+Testes para o servidor HTTP local (goal500 serve).
+"""
+
+import gzip
+import http.client
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from goal500.server import make_server, query_players
+from goal500.site import build_site_data
+
+
+def _sample_data():
+    return pd.DataFrame({
+        "name": ["Player A", "Player A", "Player A", "Player B", "Player B"],
+        "year": [2020, 2021, 2021, 2019, 2020],
+        "total": [10, 20, 3, 5, 8],
+        "type": ["club", "club", "international", "club", "international"],
+    })
+
+
+class TestQueryPlayers(unittest.TestCase):
+    """Testes para as consultas filtradas."""
+
+    def setUp(self):
+        self.data = build_site_data(_sample_data())
+
+    def test_total_active_axis(self):
+        """Por padrão: gols totais com o eixo em anos de carreira."""
+        result = query_players(self.data)
+        first = result["players"][0]
+        self.assertEqual(first["name"], "Player A")
+        self.assertEqual(first["x"], [0, 1])
+        self.assertEqual(first["goals"], [10, 23])
+        self.assertEqual(first["cumulative"], [10, 33])
+        self.assertEqual(first["total"], 33)
+
+    def test_type_axis_and_names(self):
+        """Filtro de tipo, eixo de ano-calendário e ordem dos nomes pedidos."""
+        result = query_players(self.data, ["Player B", "Player A"], "international", "year")
+        self.assertEqual([p["name"] for p in result["players"]], ["Player B", "Player A"])
+        self.assertEqual(result["players"][0]["x"], [2019, 2020])
+        self.assertEqual(result["players"][0]["goals"], [0, 8])
+        self.assertEqual(result["players"][1]["total"], 3)
+
+    def test_limit(self):
+        """limit mantém os maiores no filtro, na ordem original."""
+        result = query_players(self.data, kind="international", limit=1)
+        self.assertEqual([p["name"] for p in result["players"]], ["Player B"])
+
+    def test_invalid_arguments(self):
+        """Tipo, eixo, limite e jogadores inválidos geram ValueError."""
+        with self.assertRaises(ValueError):
+            query_players(self.data, kind="penalty")
+        with self.assertRaises(ValueError):
+            query_players(self.data, axis="age")
+        with self.assertRaises(ValueError):
+            query_players(self.data, limit=0)
+        with self.assertRaises(ValueError):
+            query_players(self.data, ["Ninguém"])
+
+
+class TestServer(unittest.TestCase):
+    """Testes de ponta a ponta com o servidor numa thread."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmpdir.name, "dados.csv")
+        _sample_data().to_csv(self.csv, index=False)
+        self.static = os.path.join(self.tmpdir.name, "docs")
+        os.makedirs(self.static)
+        with open(os.path.join(self.static, "index.html"), "w", encoding="utf-8") as fh:
+            fh.write("<html>painel</html>")
+
+        self.server = make_server(self.csv, port=0, static_dir=self.static, reload_interval=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.conn = http.client.HTTPConnection(*self.server.server_address[:2], timeout=10)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def _get(self, path, headers=None):
+        self.conn.request("GET", path, headers=headers or {})
+        response = self.conn.getresponse()
+        return response, response.read()
+
+    def test_data_and_version(self):
+        """data.json traz o payload de build_site_data; version.json a versão."""
+        response, body = self._get("/data.json")
+        self.assertEqual(response.status, 200)
+        data = json.loads(body)
+        self.assertEqual(data["players"], build_site_data(_sample_data())["players"])
+
+        _, body = self._get("/version.json")
+        self.assertEqual(json.loads(body)["version"], self.server.store.version)
+
+    def test_etag_and_not_modified(self):
+        """A mesma resposta tem ETag estável e If-None-Match devolve 304."""
+        response, _ = self._get("/api/players?type=club")
+        etag = response.getheader("ETag")
+        self.assertTrue(etag)
+
+        response, body = self._get("/api/players?type=club", {"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+    def _write_large_csv(self):
+        """Troca o CSV por um grande o bastante para ser comprimido."""
+        pd.DataFrame({
+            "name": [f"Player {i}" for i in range(50)], "year": 2020,
+            "total": range(50), "type": "club",
+        }).to_csv(self.csv, index=False)
+        os.utime(self.csv, ns=(0, os.stat(self.csv).st_mtime_ns + 10**9))
+
+    def test_gzip(self):
+        """Com Accept-Encoding: gzip, respostas grandes vão comprimidas."""
+        self._write_large_csv()
+        response, body = self._get("/data.json", {"Accept-Encoding": "gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(json.loads(gzip.decompress(body))["source"], "Wikipedia")
+
+        response, body = self._get("/data.json")
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        json.loads(body)
+
+    def test_etag_per_encoding(self):
+        """gzip e identidade têm ETags próprios; If-None-Match compara tags inteiras."""
+        self._write_large_csv()
+        gzip_response, _ = self._get("/data.json", {"Accept-Encoding": "gzip"})
+        plain_response, _ = self._get("/data.json")
+        gzip_etag, plain_etag = gzip_response.getheader("ETag"), plain_response.getheader("ETag")
+        self.assertNotEqual(gzip_etag, plain_etag)
+        self.assertEqual(gzip_response.getheader("Vary"), "Accept-Encoding")
+
+        # O ETag da outra codificação não vale para esta.
+        response, _ = self._get("/data.json", {"If-None-Match": gzip_etag})
+        self.assertEqual(response.status, 200)
+        for header in (f'"x", {plain_etag}', "*"):
+            response, _ = self._get("/data.json", {"If-None-Match": header})
+            self.assertEqual(response.status, 304)
+        for header in (f"W/{plain_etag}", plain_etag[:-3] + '"', plain_etag[:-1] + 'ab"'):
+            response, _ = self._get("/data.json", {"If-None-Match": header})
+            self.assertEqual(response.status, 200)
+
+    def test_query_endpoint(self):
+        """Parâmetros da query chegam a query_players; erros viram 400."""
+        _, body = self._get("/api/players?names=Player%20B&axis=year")
+        result = json.loads(body)
+        self.assertEqual([p["name"] for p in result["players"]], ["Player B"])
+        self.assertEqual(result["players"][0]["x"], [2019, 2020])
+
+        response, body = self._get("/api/players?type=penalty")
+        self.assertEqual(response.status, 400)
+        self.assertIn("error", json.loads(body))
+
+    def test_query_cache_limit_keeps_fixed_endpoints(self):
+        """Passado o limite do cache de consultas, /data.json continua respondendo."""
+        with patch("goal500.server.MAX_CACHED_RESPONSES", 4):
+            for limit in range(1, 8):
+                response, _ = self._get(f"/api/players?limit={limit}")
+                self.assertEqual(response.status, 200)
+            self.assertEqual(len(self.server.store.current()["queries"]), 4)
+            response, body = self._get("/data.json")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(json.loads(body)["source"], "Wikipedia")
+            response, _ = self._get("/version.json")
+            self.assertEqual(response.status, 200)
+
+    def test_static_files(self):
+        """Outros caminhos vêm do diretório estático, sem sair dele."""
+        response, body = self._get("/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"<html>painel</html>")
+
+        response, _ = self._get("/../dados.csv")
+        self.assertEqual(response.status, 404)
+
+    def test_hot_reload(self):
+        """Quando o CSV muda, os dados são recarregados sem reiniciar."""
+        _, body = self._get("/version.json")
+        old_version = json.loads(body)["version"]
+
+        data = _sample_data()
+        data.loc[0, "total"] = 100
+        data.to_csv(self.csv, index=False)
+        os.utime(self.csv, ns=(0, os.stat(self.csv).st_mtime_ns + 10**9))
+
+        _, body = self._get("/version.json")
+        self.assertNotEqual(json.loads(body)["version"], old_version)
+        _, body = self._get("/api/players?names=Player%20A")
+        self.assertEqual(json.loads(body)["players"][0]["total"], 123)
+
+    def test_failed_reload_keeps_data(self):
+        """Um arquivo ilegível mantém os dados anteriores no ar."""
+        version = self.server.store.version
+        with open(self.csv, "w", encoding="utf-8") as fh:
+            fh.write("")
+        response, _ = self._get("/data.json")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.server.store.version, version)
+
+
+if __name__ == "__main__":
+    unittest.main()
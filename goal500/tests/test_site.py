@@ -6,10 +6,12 @@ import json
 import os
 import tempfile
 import unittest
+from datetime import date
+from unittest.mock import patch
 
 import pandas as pd
 
-from goal500.site import build_site_data, write_site_data
+from goal500.site import build_site_data, data_version, write_site_data
 
 
 class TestSite(unittest.TestCase):
@@ -84,6 +86,50 @@ class TestSite(unittest.TestCase):
                 loaded = json.load(fh)
             self.assertEqual(len(loaded["players"]), 2)
 
+    def test_write_version_and_service_worker(self):
+        """write_site_data grava version.json (hash do JSON) e o sw.js."""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "data.json")
+            write_site_data(self.test_data, out)
+            with open(out, "rb") as fh:
+                payload = fh.read()
+            with open(os.path.join(tmp, "version.json"), encoding="utf-8") as fh:
+                version = json.load(fh)
+            self.assertEqual(version["version"], data_version(json.loads(payload)))
+            self.assertEqual(version["generated_at"], json.loads(payload)["generated_at"])
+
+            with open(os.path.join(tmp, "sw.js"), encoding="utf-8") as fh:
+                sw = fh.read()
+            self.assertIn('"data.json"', sw)
+            self.assertIn("version.json", sw)
+
+    def test_version_changes_with_data(self):
+        """A versão muda quando os dados mudam e é estável quando não mudam."""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "data.json")
+            versions = []
+            for df in (self.test_data, self.test_data, self.test_data.iloc[:3]):
+                write_site_data(df, out)
+                with open(os.path.join(tmp, "version.json"), encoding="utf-8") as fh:
+                    versions.append(json.load(fh)["version"])
+            self.assertEqual(versions[0], versions[1])
+            self.assertNotEqual(versions[0], versions[2])
+
+
+    def test_version_ignores_generation_date(self):
+        """Regerar os mesmos dados em outro dia não muda a versão."""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "data.json")
+            versions = []
+            for day in (date(2026, 1, 1), date(2026, 1, 2)):
+                with patch("goal500.site.date") as fake_date:
+                    fake_date.today.return_value = day
+                    write_site_data(self.test_data, out)
+                with open(os.path.join(tmp, "version.json"), encoding="utf-8") as fh:
+                    versions.append(json.load(fh))
+            self.assertEqual(versions[0]["generated_at"], "2026-01-01")
+            self.assertEqual(versions[1]["generated_at"], "2026-01-02")
+            self.assertEqual(versions[0]["version"], versions[1]["version"])
 
 if __name__ == "__main__":
     unittest.main()
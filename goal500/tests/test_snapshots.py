@@ -0,0 +1,110 @@
+"""
+Testes para o histórico de snapshots (deltas e checkpoints).
+"""
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from goal500 import snapshots
+
+
+def _week(extra_goals=0, drop=False, new_player=False):
+    data = pd.DataFrame({
+        "name": ["Player A", "Player A", "Player A", "Player B", "Player B"],
+        "year": [2020, 2020, 2021, 2019, 2020],
+        "total": [10, 5, 20 + extra_goals, 8, 3],
+        "type": ["club", "club", "club", "club", "international"],
+    })
+    if drop:
+        data = data.iloc[:4]
+    if new_player:
+        data = pd.concat([data, pd.DataFrame({"name": ["NA"], "year": [2024],
+                                              "total": [2], "type": ["club"]})])
+    return data
+
+
+class TestSnapshots(unittest.TestCase):
+    """Testes para goal500.snapshots."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.tmpdir.name, "snapshots")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_normalize(self):
+        """Uma linha por chave, com os gols somados e total inteiro."""
+        table = snapshots.normalize(_week())
+        self.assertEqual(list(table.columns), ["name", "year", "type", "total"])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.iloc[0].tolist(), ["Player A", 2020, "club", 15])
+        self.assertEqual(str(table["total"].dtype), "int64")
+
+    def test_diff_frames(self):
+        """O diff traz linhas alteradas, incluídas e removidas com o delta."""
+        old = snapshots.normalize(_week())
+        new = snapshots.normalize(_week(extra_goals=4, drop=True, new_player=True))
+        changes = snapshots.diff_frames(old, new)
+        by_status = {row.status: row for row in changes.itertuples()}
+        self.assertEqual(set(by_status), {"added", "removed", "changed"})
+        self.assertEqual(by_status["changed"].delta, 4)
+        self.assertEqual(by_status["removed"].delta, -3)
+        self.assertEqual(by_status["added"].name, "NA")
+
+        summary = snapshots.goals_by_player(changes)
+        self.assertEqual(summary["name"].tolist(), ["Player A", "NA", "Player B"])
+        self.assertEqual(summary["delta"].tolist(), [4, 2, -3])
+
+    def test_deltas_and_checkpoints(self):
+        """Só as mudanças são gravadas, com checkpoints periódicos, e tudo se reconstrói."""
+        weeks = [_week(), _week(extra_goals=1), _week(extra_goals=1, drop=True),
+                 _week(extra_goals=2, new_player=True)]
+        entries = [snapshots.save_snapshot(week, self.store, label=f"s{i}", checkpoint_every=3)
+                   for i, week in enumerate(weeks)]
+        self.assertEqual([e["kind"] for e in entries], ["checkpoint", "delta", "delta", "checkpoint"])
+        self.assertEqual(entries[1]["changes"], 1)
+        self.assertEqual(entries[2]["changes"], 1)
+
+        for i, week in enumerate(weeks):
+            pd.testing.assert_frame_equal(snapshots.load_snapshot(f"s{i}", self.store),
+                                          snapshots.normalize(week))
+        pd.testing.assert_frame_equal(snapshots.load_snapshot(-1, self.store),
+                                      snapshots.load_snapshot(4, self.store))
+
+    def test_unchanged_data_is_skipped(self):
+        """Dados iguais aos do último snapshot não geram outro."""
+        first = snapshots.save_snapshot(_week(), self.store)
+        again = snapshots.save_snapshot(_week().iloc[::-1], self.store)
+        self.assertEqual(again, first)
+        self.assertEqual(len(snapshots.list_snapshots(self.store)), 1)
+
+    def test_diff_snapshots_and_csv(self):
+        """diff_snapshots compara snapshots entre si ou com um CSV."""
+        snapshots.save_snapshot(_week(), self.store)
+        snapshots.save_snapshot(_week(extra_goals=3), self.store)
+        changes = snapshots.diff_snapshots(store=self.store)
+        self.assertEqual(changes["delta"].tolist(), [3])
+
+        csv = os.path.join(self.tmpdir.name, "novo.csv")
+        _week(extra_goals=5).to_csv(csv, index=False)
+        self.assertEqual(snapshots.diff_snapshots(-1, csv, self.store)["delta"].tolist(), [2])
+
+    def test_corruption_and_missing(self):
+        """Hash que não confere e referências inexistentes geram ValueError."""
+        with self.assertRaises(ValueError):
+            snapshots.load_snapshot(-1, self.store)
+        entry = snapshots.save_snapshot(_week(), self.store)
+        snapshots.normalize(_week(extra_goals=1)).to_csv(
+            os.path.join(self.store, entry["file"]), index=False, compression="gzip")
+        with self.assertRaises(ValueError):
+            snapshots.load_snapshot(-1, self.store)
+        with self.assertRaises(ValueError):
+            snapshots.load_snapshot("semana-que-não-existe", self.store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Testes para o armazenamento em SQLite.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from goal500 import storage
+from goal500.scrapers.wikipedia import get_player_stats
+from goal500.site import build_site_data
+
+
+def _sample_data():
+    # Player A tem dois clubes em 2020 (linhas somadas no banco).
+    return pd.DataFrame({
+        "name": ["Player A", "Player A", "Player A", "Player A", "Player B", "Player C"],
+        "year": [2020, 2020, 2021, 2021, 2019, 2018],
+        "total": [10, 5, 20, 3, 8, 30],
+        "type": ["club", "club", "club", "international", "club", "international"],
+    })
+
+
+class TestStorage(unittest.TestCase):
+    """Testes para goal500.storage."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "sub", "goal500.db")
+        self.conn = storage.connect(self.path)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmpdir.cleanup()
+
+    def _seasons(self, name):
+        return self.conn.execute(
+            "SELECT s.year, s.type, s.total FROM seasons s JOIN players p ON p.id = s.player_id "
+            "WHERE p.name = ? ORDER BY s.year, s.type", (name,)
+        ).fetchall()
+
+    def test_schema_and_indexes(self):
+        """As tabelas existem e as consultas usam os índices."""
+        tables = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertTrue({"players", "seasons", "scrape_runs"} <= tables)
+
+        plan = " ".join(row[3] for row in self.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT name FROM players ORDER BY total DESC LIMIT 5"))
+        self.assertIn("idx_players_total", plan)
+        plan = " ".join(row[3] for row in self.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM seasons WHERE player_id = 1 AND year = 2020"))
+        self.assertIn("PRIMARY KEY", plan)
+
+    def test_connect_without_create(self):
+        """Leituras não criam um banco vazio."""
+        with self.assertRaises(FileNotFoundError):
+            storage.connect(os.path.join(self.tmpdir.name, "nada.db"), create=False)
+
+    def test_upsert_aggregates_and_replaces(self):
+        """Linhas repetidas são somadas; uma nova gravação atualiza e remove linhas."""
+        data = _sample_data()
+        storage.upsert_player(self.conn, "Player A", data[data["name"] == "Player A"])
+        self.assertEqual(self._seasons("Player A"),
+                         [(2020, "club", 15), (2021, "club", 20), (2021, "international", 3)])
+
+        update = pd.DataFrame({"year": [2020, 2021], "total": [15, 25], "type": ["club", "club"]})
+        storage.upsert_player(self.conn, "Player A", update)
+        self.assertEqual(self._seasons("Player A"), [(2020, "club", 15), (2021, "club", 25)])
+        self.assertEqual(storage.top_players(self.conn, 1)[0],
+                         {"name": "Player A", "total_club": 40, "total_international": 0, "total": 40})
+
+    def test_failed_upsert_rolls_back(self):
+        """Um erro no meio da gravação mantém os dados anteriores do jogador."""
+        data = _sample_data()
+        storage.upsert_player(self.conn, "Player A", data[data["name"] == "Player A"])
+        before = self._seasons("Player A")
+        with patch("goal500.storage._now", return_value=None):
+            with self.assertRaises(sqlite3.IntegrityError):
+                storage.upsert_player(self.conn, "Player A", data.iloc[:1])
+        self.assertEqual(self._seasons("Player A"), before)
+
+    def test_load_stats_matches_csv(self):
+        """Os dados lidos do banco geram o mesmo site que o DataFrame original."""
+        data = _sample_data()
+        self.assertEqual(storage.import_dataframe(self.conn, data), 3)
+        loaded = storage.load_stats(self.conn)
+        self.assertEqual(list(loaded.columns), ["name", "year", "total", "type"])
+        self.assertEqual(build_site_data(loaded)["players"], build_site_data(data)["players"])
+
+    def test_top_and_names(self):
+        """top N e filtro por nome acontecem na consulta."""
+        storage.import_dataframe(self.conn, _sample_data())
+        self.assertEqual([p["name"] for p in storage.top_players(self.conn, 2)], ["Player A", "Player C"])
+        self.assertEqual([p["name"] for p in storage.top_players(self.conn, 1, by="international")],
+                         ["Player C"])
+        self.assertEqual(set(storage.load_stats(self.conn, top=2)["name"]), {"Player A", "Player C"})
+        self.assertEqual(set(storage.load_stats(self.conn, names=["Player B"])["name"]), {"Player B"})
+        with self.assertRaises(ValueError):
+            storage.top_players(self.conn, by="assists")
+
+    @patch("goal500.scrapers.wikipedia.extract_goals_by_year")
+    def test_get_player_stats_records_run(self, mock_extract):
+        """get_player_stats(db=...) grava cada jogador e registra a extração."""
+        mock_extract.side_effect = lambda url, **kwargs: pd.DataFrame(
+            {"year": ["2020"], "total": [7], "type": ["club"]})
+        data = get_player_stats(db=self.path)
+
+        n_players = data["name"].nunique()
+        run = self.conn.execute("SELECT status, players, rows, finished_at FROM scrape_runs").fetchone()
+        self.assertEqual(run[:3], ("ok", n_players, n_players))
+        self.assertIsNotNone(run[3])
+        links = self.conn.execute("SELECT COUNT(link) FROM players").fetchone()[0]
+        self.assertEqual(links, n_players)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,16 @@ Testes para o módulo de visualização.
 
 import unittest
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
 import os
+import tempfile
+import gc
+import tracemalloc
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-from goal500.visualization.plots import plot_cumulative_goals, create_animation
+from goal500.visualization.plots import plot_cumulative_goals, plot_batch, create_animation, _declutter_labels
 
 
 class TestVisualization(unittest.TestCase):
@@ -27,7 +32,7 @@ class TestVisualization(unittest.TestCase):
         # DataFrame vazio
         self.empty_data = pd.DataFrame(columns=["name", "year", "total", "type"])
     
-    @patch("goal500.visualization.plots.plt.savefig")
+    @patch("goal500.visualization.plots.Figure.savefig")
     @patch("goal500.visualization.plots.prepare_visualization_data")
     def test_plot_cumulative_goals(self, mock_prepare_data, mock_savefig):
         """Testa a função plot_cumulative_goals."""
@@ -41,8 +46,14 @@ class TestVisualization(unittest.TestCase):
             "player_label": ["Jogador A (25)", "Jogador A (25)", "Jogador B (45)", "Jogador B (45)"]
         })
         
+        # O gráfico é salvo num temporário que depois substitui o destino
+        mock_savefig.side_effect = lambda path, **kwargs: open(path, "wb").close()
+
         # Chamar a função com output_file
-        result = plot_cumulative_goals(self.test_data, "test_plot.png")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_file = os.path.join(tmpdir, "test_plot.png")
+            result = plot_cumulative_goals(self.test_data, output_file)
+            self.assertEqual(os.listdir(tmpdir), ["test_plot.png"])
         
         # Verificar se a função prepare_visualization_data foi chamada
         mock_prepare_data.assert_called_once()
@@ -59,15 +70,81 @@ class TestVisualization(unittest.TestCase):
         result_empty = plot_cumulative_goals(self.empty_data)
         self.assertIsNone(result_empty)
     
-    @patch("goal500.visualization.plots.imageio.imread")
-    @patch("goal500.visualization.plots.imageio.get_writer")
-    @patch("goal500.visualization.plots.plt.savefig")
+    def test_plot_without_pyplot_state(self):
+        """Testa que o gráfico não registra figuras no pyplot."""
+        before = plt.get_fignums()
+        fig = plot_cumulative_goals(self.test_data)
+        self.assertEqual(plt.get_fignums(), before)
+        self.assertIsInstance(fig.canvas, FigureCanvasAgg)
+
+    def test_plot_batch(self):
+        """Testa a criação de um gráfico por jogador e por tipo, com threads."""
+        data = pd.concat([self.test_data, pd.DataFrame({
+            "name": ["Jogador Ç"], "year": [2020], "total": [3], "type": ["international"],
+        })], ignore_index=True)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            by_name = plot_batch(data, tmpdir, by="name", workers=3, dpi=30)
+            self.assertEqual(set(by_name), {"Jogador A", "Jogador B", "Jogador Ç"})
+            self.assertEqual(os.path.basename(by_name["Jogador Ç"]), "jogador-c.png")
+            by_type = plot_batch(data, tmpdir, by="type", workers=2, dpi=30)
+            self.assertEqual(set(by_type), {"club", "international"})
+            for path in list(by_name.values()) + list(by_type.values()):
+                self.assertTrue(os.path.getsize(path) > 0)
+
+    def test_repeated_plots_memory_flat(self):
+        """Testa que desenhar muitos gráficos não acumula memória."""
+        def render():
+            fig = plot_cumulative_goals(self.test_data)
+            fig.canvas.draw()
+
+        for _ in range(5):
+            render()
+        tracemalloc.start()
+        try:
+            render()
+            gc.collect()
+            baseline = tracemalloc.get_traced_memory()[0]
+            for _ in range(40):
+                render()
+            gc.collect()
+            growth = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+        # Uma figura vazada custa centenas de KB; 40 vazariam vários MB.
+        self.assertLess(growth, 1_000_000)
+
+    def test_plot_large_mode(self):
+        """Testa o modo para muitos jogadores: uma coleção de linhas e rótulos limitados."""
+        n = 300
+        data = pd.DataFrame({
+            "name": [f"Jogador {i}" for i in range(n) for _ in range(3)],
+            "year": [2020, 2021, 2022] * n,
+            "total": [i % 40 for i in range(3 * n)],
+            "type": ["club"] * (3 * n),
+        })
+        fig = plot_cumulative_goals(data, max_labels=20)
+        ax = fig.axes[0]
+        self.assertEqual(len(ax.lines), 0)
+        self.assertEqual(len(ax.collections), 2)  # LineCollection + scatter
+        self.assertEqual(len(ax.collections[0].get_segments()), n)
+        self.assertLessEqual(len(ax.texts), 20)
+
+        fig = plot_cumulative_goals(data, large=True, markers=False)
+        self.assertEqual(len(fig.axes[0].collections), 1)
+
+    def test_declutter_labels(self):
+        """Testa a escolha gulosa de rótulos sem sobreposição."""
+        anchors = np.array([[0, 0], [5, 2], [100, 0], [0, 50], [102, 3]], dtype=float)
+        sizes = np.full((5, 2), 20.0)
+        priority = np.array([1, 5, 3, 2, 4], dtype=float)
+        # 1 vence 0 (sobrepostos); 4 vence 2; 3 não colide com ninguém.
+        self.assertEqual(_declutter_labels(anchors, sizes, priority), [1, 4, 3])
+        self.assertEqual(_declutter_labels(anchors, sizes, priority, max_labels=2), [1, 4])
+        self.assertEqual(_declutter_labels(anchors[:0], sizes[:0], priority[:0]), [])
+
+    @patch("goal500.visualization.plots.write_animation")
     @patch("goal500.visualization.plots.prepare_visualization_data")
-    @patch("goal500.visualization.plots.os.makedirs")
-    @patch("goal500.visualization.plots.os.remove")
-    @patch("goal500.visualization.plots.os.rmdir")
-    def test_create_animation(self, mock_rmdir, mock_remove, mock_makedirs, 
-                             mock_prepare_data, mock_savefig, mock_get_writer, mock_imread):
+    def test_create_animation(self, mock_prepare_data, mock_write_animation):
         """Testa a função create_animation."""
         # Configurar mock para prepare_visualization_data
         mock_prepare_data.return_value = pd.DataFrame({
@@ -79,29 +156,29 @@ class TestVisualization(unittest.TestCase):
             "player_label": ["Jogador A (25)", "Jogador A (25)", "Jogador B (45)", "Jogador B (45)"]
         })
         
-        # Configurar mock para get_writer
-        mock_writer = MagicMock()
-        mock_get_writer.return_value.__enter__.return_value = mock_writer
+        # Consumir os frames como o escritor real faria
+        written = {}
+        def fake_write_animation(frames, output_file, durations, fps, palette_frames):
+            written["frames"] = list(frames)
+            written["durations"] = list(durations)
+            written["output_file"] = output_file
+        mock_write_animation.side_effect = fake_write_animation
         
         # Chamar a função
-        result = create_animation(self.test_data, "test_animation.gif", fps=1, duration=1)
+        result = create_animation(self.test_data, "test_animation.gif", fps=2, duration=3)
         
         # Verificar se a função prepare_visualization_data foi chamada
         mock_prepare_data.assert_called_once()
         
-        # Verificar se os diretórios foram criados
-        mock_makedirs.assert_called_once()
+        # Verificar se o escritor foi chamado com o arquivo correto
+        mock_write_animation.assert_called_once()
+        self.assertEqual(written["output_file"], "test_animation.gif")
         
-        # Verificar se savefig foi chamado para cada frame
-        self.assertGreater(mock_savefig.call_count, 0)
-        
-        # Verificar se get_writer foi chamado com o arquivo correto
-        mock_get_writer.assert_called_once()
-        self.assertIn("test_animation.gif", mock_get_writer.call_args[0][0])
-        
-        # Verificar se os arquivos temporários foram removidos
-        self.assertGreater(mock_remove.call_count, 0)
-        mock_rmdir.assert_called_once()
+        # Um frame RGB por ano ativo; a pausa é a duração estendida do último
+        self.assertEqual(len(written["frames"]), 2)
+        self.assertEqual(written["frames"][0].ndim, 3)
+        self.assertEqual(written["frames"][0].shape[2], 3)
+        self.assertEqual(written["durations"], [500, 500 + 3000])
         
         # Verificar se a função retornou o caminho do arquivo
         self.assertEqual(result, "test_animation.gif")
@@ -111,6 +188,133 @@ class TestVisualization(unittest.TestCase):
         result_empty = create_animation(self.empty_data)
         self.assertIsNone(result_empty)
 
+    def test_create_animation_formats(self):
+        """O formato de saída é escolhido pela extensão do arquivo."""
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for ext, fmt in ((".gif", "GIF"), (".webp", "WEBP"), (".apng", "PNG")):
+                out = os.path.join(tmp, "anim" + ext)
+                create_animation(self.test_data, out, fps=1, duration=1)
+                with Image.open(out) as im:
+                    self.assertEqual(im.format, fmt)
+                    self.assertEqual(im.n_frames, 2)
+
+    def test_create_animation_unknown_format(self):
+        """Extensões não suportadas falham antes de desenhar qualquer frame."""
+        with patch("goal500.visualization.plots.prepare_visualization_data") as mock_prepare:
+            with self.assertRaises(ValueError):
+                create_animation(self.test_data, "anim.avi")
+            mock_prepare.assert_not_called()
+
+    def test_create_animation_no_temp_files(self):
+        """A animação é gerada em memória, sem criar arquivos no diretório atual."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                create_animation(self.test_data, "anim.gif", fps=1, duration=1)
+                self.assertEqual(os.listdir(tmp), ["anim.gif"])
+            finally:
+                os.chdir(cwd)
+
+    def test_frame_renderer_updates_in_place(self):
+        """Os frames progridem ano a ano reaproveitando os mesmos artistas."""
+        from goal500.utils.data_processing import prepare_visualization_data
+        from goal500.visualization.plots import _FrameRenderer
+
+        renderer = _FrameRenderer(prepare_visualization_data(self.test_data))
+        lines = list(renderer.lines)
+        first = renderer.render(0)
+        last = renderer.render(len(renderer) - 1)
+
+        self.assertEqual(renderer.lines, lines)
+        self.assertEqual(first.shape, last.shape)
+        self.assertFalse((first == last).all())
+        self.assertEqual(len(renderer.lines[0].get_xdata()), 2)
+
+    def test_parallel_frames_match_serial(self):
+        """Com workers > 1 os frames saem em ordem e iguais aos do modo serial."""
+        from goal500.utils.data_processing import prepare_visualization_data
+        from goal500.visualization.plots import _iter_frames
+
+        plot_data = prepare_visualization_data(self.test_data)
+        indices = [0, 1, 2, 1, 0, 2]
+        serial = list(_iter_frames(plot_data, indices, workers=1, tween=1))
+        parallel = list(_iter_frames(plot_data, indices, workers=2, tween=1))
+
+        self.assertEqual(len(parallel), len(serial))
+        for a, b in zip(serial, parallel):
+            self.assertTrue((a == b).all())
+
+    def test_tween_frames(self):
+        """Com tween=N entram N frames interpolados entre anos consecutivos."""
+        from goal500.utils.data_processing import prepare_visualization_data
+        from goal500.visualization.plots import _FrameRenderer, _tween_frames
+
+        plot_data = prepare_visualization_data(self.test_data)
+        positions, heads = _tween_frames(plot_data, tween=3)
+        self.assertEqual(positions.tolist(), [0, 0.25, 0.5, 0.75, 1])
+        # Jogador A: 10 -> 25; Jogador B: 20 -> 45 (interpolação linear).
+        self.assertEqual(heads[0].tolist(), [10, 13.75, 17.5, 21.25, 25])
+        self.assertEqual(heads[1].tolist(), [20, 26.25, 32.5, 38.75, 45])
+
+        renderer = _FrameRenderer(plot_data, tween=3)
+        self.assertEqual(len(renderer), 5)
+        renderer.render(2)
+        self.assertEqual(renderer.lines[0].get_xdata().tolist(), [0, 0.5])
+        self.assertEqual(renderer.lines[0].get_ydata().tolist(), [10, 17.5])
+
+    @patch("goal500.visualization.plots.write_animation")
+    def test_create_animation_tween_timing(self, mock_write_animation):
+        """No modo tween cada ano continua durando 1/fps segundos."""
+        written = {}
+        def fake_write_animation(frames, output_file, durations, fps, palette_frames):
+            written["n"] = sum(1 for _ in frames)
+            written["durations"] = durations
+            written["fps"] = fps
+        mock_write_animation.side_effect = fake_write_animation
+
+        create_animation(self.test_data, "anim.gif", fps=2, duration=1, tween=4)
+        self.assertEqual(written["n"], 6)
+        self.assertEqual(written["fps"], 10)
+        self.assertAlmostEqual(sum(written["durations"]), 500 + 100 + 1000)
+
+        with self.assertRaises(ValueError):
+            create_animation(self.test_data, "anim.gif", tween=-1)
+
+
+class TestTweenBenchmark(unittest.TestCase):
+    """Benchmark da interpolação vetorizada do modo tween."""
+
+    def test_tween_scales(self):
+        """2.000 jogadores x 25 anos x tween=20 (~1 milhão de pontos) em menos de 1 s."""
+        import time
+        from goal500.visualization.plots import _tween_frames
+
+        rng = np.random.default_rng(0)
+        players, years = 2000, 25
+        careers = rng.integers(5, years + 1, size=players)
+        rows = [(f"P{p}", t, g) for p in range(players)
+                for t, g in enumerate(np.cumsum(rng.integers(0, 40, size=careers[p])))]
+        plot_data = pd.DataFrame(rows, columns=["name", "years_active", "cumulative_goals"])
+
+        start = time.perf_counter()
+        positions, heads = _tween_frames(plot_data, tween=20)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(heads.shape, (players, (years - 1) * 21 + 1))
+        self.assertLess(elapsed, 1.0)
+
+        # Confere uma amostra contra np.interp jogador a jogador.
+        names = sorted(plot_data["name"].unique())
+        for p in rng.choice(players, size=20, replace=False):
+            group = plot_data[plot_data["name"] == names[p]]
+            x, y = group["years_active"].to_numpy(), group["cumulative_goals"].to_numpy()
+            inside = positions <= x[-1]
+            expected = np.interp(positions[inside], x, y)
+            self.assertTrue(np.allclose(heads[p, inside], expected))
+            self.assertTrue(np.isnan(heads[p, ~inside]).all())
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+"""
+Testes para o modo watch (reconstrução incremental).
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from goal500.site import build_site_data, player_entries
+from goal500.utils.data_processing import calculate_cumulative_goals, clean_data
+from goal500.watch import Watcher, changed_players, player_hashes
+
+
+def _sample_data():
+    return pd.DataFrame({
+        "name": ["Player A", "Player A", "Player A", "Player B", "Player B", "Player C"],
+        "year": [2020, 2021, 2021, 2019, 2020, 2018],
+        "total": [10, 20, 3, 5, 8, 1],
+        "type": ["club", "club", "international", "club", "international", "club"],
+    })
+
+
+class TestPlayerHashes(unittest.TestCase):
+    """Testes para os hashes por jogador."""
+
+    def test_order_and_row_split_insensitive(self):
+        """A ordem das linhas e a divisão de uma temporada em linhas não mudam o hash."""
+        data = clean_data(_sample_data())
+        shuffled = data.sample(frac=1, random_state=1)
+        split = pd.concat([data.iloc[1:], pd.DataFrame({
+            "name": ["Player A", "Player A"], "year": [2020, 2020],
+            "total": [4, 6], "type": ["club", "club"],
+        })], ignore_index=True)
+        self.assertEqual(player_hashes(data), player_hashes(shuffled))
+        self.assertEqual(player_hashes(data), player_hashes(split))
+
+    def test_changed_players(self):
+        """Jogadores alterados, incluídos e removidos são detectados."""
+        old = clean_data(_sample_data())
+        new = old[old["name"] != "Player C"].copy()
+        new.loc[new.index[0], "total"] = 11
+        new = pd.concat([new, pd.DataFrame({"name": ["Player D"], "year": [2022],
+                                            "total": [2], "type": ["club"]})])
+        self.assertEqual(changed_players(player_hashes(old), player_hashes(new)),
+                         {"Player A", "Player C", "Player D"})
+
+    def test_year_keys_ignore_type(self):
+        """Com keys=("year",), trocar gols entre clube e seleção no mesmo ano não muda o hash."""
+        data = clean_data(_sample_data())
+        moved = data.copy()
+        moved.loc[moved["name"] == "Player A", "type"] = "club"
+        self.assertEqual(player_hashes(data, ("year",)), player_hashes(moved, ("year",)))
+        self.assertNotEqual(player_hashes(data)["Player A"], player_hashes(moved)["Player A"])
+
+
+class TestWatcher(unittest.TestCase):
+    """Testes para Watcher.rebuild."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmpdir.name, "dados.csv")
+        self.site = os.path.join(self.tmpdir.name, "docs", "data.json")
+        _sample_data().to_csv(self.csv, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _site_players(self):
+        with open(self.site, encoding="utf-8") as fh:
+            return json.load(fh)["players"]
+
+    def test_incremental_site(self):
+        """Após uma edição, só o jogador alterado é recalculado e o JSON bate com o completo."""
+        watcher = Watcher(self.csv, stages=("site",), site_output=self.site)
+        first = watcher.rebuild()
+        self.assertEqual(first["site"], {"Player A", "Player B", "Player C"})
+
+        data = _sample_data()
+        data.loc[5, "total"] = 50
+        data.to_csv(self.csv, index=False)
+        with patch("goal500.watch.player_entries", wraps=player_entries) as entries:
+            changed = watcher.rebuild()
+        self.assertEqual(changed["site"], {"Player C"})
+        self.assertEqual(set(entries.call_args[0][0]["name"]), {"Player C"})
+        self.assertEqual(self._site_players(), build_site_data(data)["players"])
+
+        self.assertEqual(watcher.rebuild(), {"site": set(), "plot": set()})
+
+    def test_removed_player(self):
+        """Jogadores removidos do CSV saem do JSON."""
+        watcher = Watcher(self.csv, stages=("site",), site_output=self.site)
+        watcher.rebuild()
+        data = _sample_data().iloc[:5]
+        data.to_csv(self.csv, index=False)
+        watcher.rebuild()
+        self.assertEqual([p["name"] for p in self._site_players()], ["Player A", "Player B"])
+
+    @patch("goal500.visualization.plots.plot_batch")
+    @patch("goal500.visualization.plots._plot_prepared")
+    def test_only_affected_charts(self, mock_plot, mock_batch):
+        """Só os gráficos dos jogadores afetados são redesenhados."""
+        watcher = Watcher(self.csv, stages=("site", "plot", "charts"), site_output=self.site,
+                          plot_output=os.path.join(self.tmpdir.name, "c.png"),
+                          charts_dir=os.path.join(self.tmpdir.name, "players"))
+        watcher.rebuild()
+        self.assertEqual(mock_plot.call_count, 1)
+
+        # Gols trocados entre clube e seleção no mesmo ano: só o site muda.
+        data = _sample_data()
+        data.loc[2, "type"] = "club"
+        data.to_csv(self.csv, index=False)
+        changed = watcher.rebuild()
+        self.assertEqual(changed["site"], {"Player A"})
+        self.assertEqual(changed["plot"], set())
+        self.assertEqual(mock_plot.call_count, 1)
+
+        data.loc[3, "total"] = 9
+        data.to_csv(self.csv, index=False)
+        watcher.rebuild()
+        self.assertEqual(mock_plot.call_count, 2)
+        self.assertEqual(set(mock_batch.call_args[0][0]["name"]), {"Player B"})
+        # O gráfico combinado recebe os mesmos dados preparados de uma leitura completa.
+        pd.testing.assert_frame_equal(mock_plot.call_args[0][0],
+                                      calculate_cumulative_goals(clean_data(data)))
+
+    def test_all_players_removed(self):
+        """Sem jogadores no CSV, o gráfico combinado e a animação são apagados."""
+        plot = os.path.join(self.tmpdir.name, "c.png")
+        animation = os.path.join(self.tmpdir.name, "c.gif")
+        watcher = Watcher(self.csv, stages=("plot", "animate"), plot_output=plot,
+                          animation_output=animation)
+        with patch("goal500.visualization.plots._plot_prepared",
+                   side_effect=lambda data, path: open(path, "wb").close()), \
+                patch("goal500.visualization.plots._animate_prepared",
+                      side_effect=lambda data, path, *args: open(path, "wb").close()):
+            watcher.rebuild()
+            self.assertTrue(os.path.exists(plot) and os.path.exists(animation))
+
+            _sample_data().iloc[:0].to_csv(self.csv, index=False)
+            changed = watcher.rebuild()
+        self.assertEqual(changed["plot"], {"Player A", "Player B", "Player C"})
+        self.assertFalse(os.path.exists(plot))
+        self.assertFalse(os.path.exists(animation))
+
+    def test_unknown_stage(self):
+        """Etapas desconhecidas geram ValueError."""
+        with self.assertRaises(ValueError):
+            Watcher(self.csv, stages=("site", "deploy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
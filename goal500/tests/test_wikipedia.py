@@ -2,11 +2,19 @@
 Testes para o módulo de raspagem da Wikipedia.
 """
 
+import contextlib
+import io
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
+import requests
 
-from goal500.scrapers.wikipedia import get_active_players, wiki_url, extract_goals_by_year
+from goal500 import bench_fixtures
+from goal500.scrapers.wikipedia import (
+    get_active_players, wiki_url, extract_goals_by_year, fetch_page, get_player_datasets,
+    get_player_stats, parse_career_tables, parse_player_page,
+)
+from goal500.tests import FIXTURES_DIR
 
 
 class TestWikipedia(unittest.TestCase):
@@ -16,6 +24,10 @@ class TestWikipedia(unittest.TestCase):
         """Testa a função wiki_url."""
         self.assertEqual(wiki_url("/wiki/Test"), "https://en.wikipedia.org/wiki/Test")
         self.assertEqual(wiki_url(""), "https://en.wikipedia.org")
+        self.assertEqual(wiki_url("/wiki/Test", "http://127.0.0.1:8001/"),
+                         "http://127.0.0.1:8001/wiki/Test")
+        links = get_active_players("http://127.0.0.1:8001")["link"]
+        self.assertTrue(all(link.startswith("http://127.0.0.1:8001/wiki/") for link in links))
     
     def test_get_active_players(self):
         """Testa a função get_active_players."""
@@ -107,5 +119,119 @@ class TestWikipedia(unittest.TestCase):
         self.assertEqual(len(result), 3)
 
 
+class TestPlayerPage(unittest.TestCase):
+    """Testes para a extração de todos os dados da página numa leitura só."""
+
+    # Cabeçalhos como os da Wikipedia: grupo "League" com Division, notas no
+    # nome do grupo, copa nacional e copa da liga, empréstimo na mesma temporada.
+    HTML = """
+    <table class="infobox"><tr><th>Date of birth</th><td>
+      <span style="display:none">(<span class="bday">1993-07-28</span>)</span></td></tr></table>
+    <table class="wikitable">
+      <tr><th rowspan="2">Club</th><th rowspan="2">Season</th><th colspan="3">League</th>
+          <th colspan="2">National cup[a]</th><th colspan="2">League cup[b]</th>
+          <th colspan="2">Europe</th><th colspan="2">Other</th><th colspan="2">Total</th></tr>
+      <tr><th>Division</th><th>Apps</th><th>Goals</th><th>Apps</th><th>Goals</th><th>Apps</th>
+          <th>Goals</th><th>Apps</th><th>Goals</th><th>Apps</th><th>Goals</th><th>Apps</th><th>Goals</th></tr>
+      <tr><td>Spurs</td><td>2011–12</td><td>Premier League</td><td>0</td><td>0</td><td>0</td><td>0</td>
+          <td>0</td><td>0</td><td>6</td><td>1</td><td>—</td><td>—</td><td>6</td><td>1</td></tr>
+      <tr><td>Leyton Orient (loan)</td><td>2011–12</td><td>League One</td><td>18</td><td>5</td>
+          <td>0</td><td>0</td><td>0</td><td>0</td><td>—</td><td>—</td><td>—</td><td>—</td><td>18</td><td>5</td></tr>
+      <tr><td>Spurs</td><td>2014–15</td><td>Premier League</td><td>34</td><td>21[c]</td><td>1</td><td>1</td>
+          <td>6</td><td>3</td><td>10</td><td>6</td><td>0</td><td>0</td><td>51</td><td>31</td></tr>
+      <tr><th colspan="2">Career total</th><td></td><td>52</td><td>26</td><td>1</td><td>1</td><td>6</td>
+          <td>3</td><td>16</td><td>7</td><td>0</td><td>0</td><td>75</td><td>37</td></tr>
+    </table>
+    <table class="wikitable">
+      <tr><th>National team</th><th>Year</th><th>Apps</th><th>Goals</th></tr>
+      <tr><td>England</td><td>2015</td><td>9</td><td>7</td></tr>
+      <tr><th colspan="2">Total</th><td>9</td><td>7</td></tr>
+    </table>
+    """
+
+    def test_parse_player_page(self):
+        """Gols iguais aos de parse_career_tables, competições somadas por temporada e nascimento."""
+        page = parse_player_page(self.HTML)
+        pd.testing.assert_frame_equal(page["goals"], parse_career_tables(self.HTML))
+        self.assertEqual(page["birth_date"], "1993-07-28")
+
+        competitions = page["competitions"]
+        rows = [tuple(row) for row in competitions.astype(object).itertuples(index=False)]
+        self.assertEqual(rows, [
+            (2011, "club", "league", 18, 5),
+            (2011, "club", "continental", 6, 1),
+            (2014, "club", "league", 34, 21),
+            (2014, "club", "cup", 7, 4),
+            (2014, "club", "continental", 10, 6),
+            (2015, "international", "national_team", 9, 7),
+        ])
+        self.assertEqual(str(competitions["competition"].dtype), "category")
+
+        # Sem tabelas: tudo vazio, sem erro.
+        with contextlib.redirect_stdout(io.StringIO()):
+            empty = parse_player_page("<html><body><p>Sem tabelas</p></body></html>")
+        self.assertTrue(empty["goals"].empty and empty["competitions"].empty)
+        self.assertIsNone(empty["birth_date"])
+
+    def test_get_player_datasets(self):
+        """Uma busca por página; os gols batem com get_player_stats e com as competições."""
+        with bench_fixtures.running(bench_fixtures.load_fixtures(FIXTURES_DIR)) as wiki, \
+                contextlib.redirect_stdout(io.StringIO()):
+            datasets = get_player_datasets(base_url=wiki.base_url, workers=4)
+            self.assertEqual(wiki.stats()["requests"], 8)
+            stats = get_player_stats(base_url=wiki.base_url)
+
+        pd.testing.assert_frame_equal(datasets["goals"], stats)
+        goals = stats.astype({"year": int}).groupby(["name", "type"])["total"].sum()
+        by_competition = datasets["competitions"].groupby(["name", "type"], observed=True)["goals"].sum()
+        self.assertEqual(goals.to_dict(), by_competition.astype(int).to_dict())
+        birth_dates = dict(zip(datasets["players"]["name"], datasets["players"]["birth_date"]))
+        self.assertEqual(birth_dates["Kylian Mbappé"], "1998-12-20")
+
+
+class TestFetchPage(unittest.TestCase):
+    """Novas tentativas e revalidação pelo ETag, contra a Wikipedia local."""
+
+    def setUp(self):
+        self.context = bench_fixtures.running({"Test": "<p>v1</p>"})
+        self.wiki = self.context.__enter__()
+        self.url = f"{self.wiki.base_url}/wiki/Test"
+
+    def tearDown(self):
+        self.context.__exit__(None, None, None)
+
+    def test_etag_cache(self):
+        """Com cache, a segunda busca é um 304 e devolve o HTML guardado."""
+        cache = {}
+        self.assertEqual(fetch_page(self.url, cache=cache), "<p>v1</p>")
+        self.assertEqual(fetch_page(self.url, cache=cache), "<p>v1</p>")
+        self.assertEqual(self.wiki.stats()["status"], {200: 1, 304: 1})
+        self.wiki.set_page("Test", "<p>v2</p>")
+        self.assertEqual(fetch_page(self.url, cache=cache), "<p>v2</p>")
+
+    @patch("goal500.scrapers.wikipedia.time.sleep")
+    def test_retry_after(self, mock_sleep):
+        """429 espera o Retry-After; sem ele (503), backoff exponencial."""
+        self.wiki.error_rate, self.wiki.retry_after = 1.0, 7
+        with self.assertRaises(requests.HTTPError):
+            fetch_page(self.url, retries=2)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [7.0, 7.0])
+        self.assertEqual(self.wiki.stats()["requests"], 3)
+
+        mock_sleep.reset_mock()
+        self.wiki.error_rate, self.wiki.server_error_rate = 0.0, 1.0
+        with self.assertRaises(requests.HTTPError):
+            fetch_page(self.url, retries=2, backoff=0.5)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.5, 1.0])
+
+    @patch("goal500.scrapers.wikipedia.time.sleep")
+    def test_extract_gives_up(self, mock_sleep):
+        """Esgotadas as tentativas, extract_goals_by_year devolve um DataFrame vazio."""
+        self.wiki.server_error_rate = 1.0
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = extract_goals_by_year(self.url, retries=1)
+        self.assertTrue(result.empty)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,151 @@
+"""
+Testes para os escritores de animação.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from goal500.visualization.writers import (
+    animation_format, global_palette, write_apng, write_gif, write_mp4, write_webp,
+)
+
+
+class TestWriteGif(unittest.TestCase):
+    """Testes para write_gif."""
+
+    def setUp(self):
+        # Três frames: fundo branco com um quadrado que cresce; o último se repete.
+        self.frames = []
+        for size in (4, 8, 12, 12):
+            frame = np.full((32, 48, 3), 255, dtype=np.uint8)
+            frame[2:2 + size, 2:2 + size] = (42, 120, 214)
+            self.frames.append(frame)
+        self.palette = global_palette([self.frames[0], self.frames[-1]])
+
+    def _write(self, durations):
+        tmp = tempfile.mkdtemp()
+        out = os.path.join(tmp, "anim.gif")
+        written = write_gif(iter(self.frames), out, durations, self.palette)
+        self.addCleanup(lambda: (os.remove(out), os.rmdir(tmp)))
+        return out, written
+
+    def test_frames_are_reconstructed(self):
+        """Os frames diferenciais reconstroem exatamente as imagens originais."""
+        out, _ = self._write([100, 100, 100, 100])
+        with Image.open(out) as im:
+            decoded = [np.asarray(f.convert("RGB")) for f in ImageSequence.Iterator(im)]
+        for original, frame in zip(self.frames, decoded):
+            self.assertTrue((original == frame).all())
+
+    def test_identical_frames_are_merged(self):
+        """Frames repetidos viram um só, com a duração somada."""
+        out, written = self._write([100, 100, 100, 2000])
+        self.assertEqual(written, 3)
+        with Image.open(out) as im:
+            self.assertEqual(im.n_frames, 3)
+            durations = [f.info["duration"] for f in ImageSequence.Iterator(im)]
+        self.assertEqual(durations, [100, 100, 2100])
+
+    def test_single_global_palette(self):
+        """Os frames usam só a paleta global (sem tabelas de cor locais)."""
+        out, _ = self._write([100, 100, 100, 100])
+        with open(out, "rb") as fh:
+            data = fh.read()
+        # Flag de tabela global ligada no descritor lógico da tela.
+        self.assertTrue(data[10] & 0x80)
+        pos = 13 + 3 * (2 << (data[10] & 0x07))
+
+        def skip_sub_blocks(pos):
+            while data[pos]:
+                pos += data[pos] + 1
+            return pos + 1
+
+        local_tables = 0
+        images = 0
+        while data[pos] != 0x3B:
+            if data[pos] == 0x21:  # extensão
+                pos = skip_sub_blocks(pos + 2)
+            else:  # descritor de imagem (0x2C)
+                self.assertEqual(data[pos], 0x2C)
+                images += 1
+                local_tables += bool(data[pos + 9] & 0x80)
+                pos = skip_sub_blocks(pos + 11)
+        self.assertEqual(images, 3)
+        self.assertEqual(local_tables, 0)
+
+
+class TestOtherFormats(unittest.TestCase):
+    """Testes para APNG, WebP, MP4 e a escolha do formato."""
+
+    def setUp(self):
+        self.frames = []
+        for size in (4, 8, 12, 12):
+            frame = np.full((32, 48, 3), 255, dtype=np.uint8)
+            frame[2:2 + size, 2:2 + size] = (42, 120, 214)
+            self.frames.append(frame)
+        self.palette = global_palette([self.frames[0], self.frames[-1]])
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for name in os.listdir(self.tmp):
+            os.remove(os.path.join(self.tmp, name))
+        os.rmdir(self.tmp)
+
+    def test_apng(self):
+        """O APNG diferencial reconstrói os frames e mescla os repetidos."""
+        out = os.path.join(self.tmp, "anim.apng")
+        written = write_apng(iter(self.frames), out, [100, 100, 100, 2000], self.palette)
+        self.assertEqual(written, 3)
+        with Image.open(out) as im:
+            self.assertEqual(im.n_frames, 3)
+            decoded = [(np.asarray(f.convert("RGB")), f.info["duration"])
+                       for f in ImageSequence.Iterator(im)]
+        for original, (frame, _) in zip(self.frames, decoded):
+            self.assertTrue((original == frame).all())
+        self.assertEqual([d for _, d in decoded], [100, 100, 2100])
+
+    def test_webp(self):
+        """O WebP animado é legível e reconstrói os frames sem perdas."""
+        out = os.path.join(self.tmp, "anim.webp")
+        written = write_webp(iter(self.frames), out, [100, 100, 100, 2000], self.palette)
+        self.assertEqual(written, 3)
+        with Image.open(out) as im:
+            self.assertEqual(im.n_frames, 3)
+            decoded = [np.asarray(f.convert("RGB")) for f in ImageSequence.Iterator(im)]
+        for original, frame in zip(self.frames, decoded):
+            self.assertTrue((original == frame).all())
+
+    def test_webp_requires_webp_support(self):
+        """Sem suporte a WebP no Pillow, o WebP falha com uma mensagem clara."""
+        with patch("PIL.features.check", return_value=False):
+            with self.assertRaisesRegex(RuntimeError, "WebP"):
+                write_webp(iter(self.frames), os.path.join(self.tmp, "anim.webp"), [100] * 4)
+
+    def test_mp4_requires_ffmpeg(self):
+        """Sem imageio-ffmpeg, o MP4 falha com uma mensagem clara."""
+        try:
+            import imageio_ffmpeg  # noqa: F401
+        except ImportError:
+            with self.assertRaises(RuntimeError):
+                write_mp4(iter(self.frames), os.path.join(self.tmp, "anim.mp4"), [100] * 4, 10)
+        else:
+            self.skipTest("imageio-ffmpeg instalado")
+
+    def test_animation_format(self):
+        """A extensão define o formato; extensões desconhecidas geram ValueError."""
+        self.assertEqual(animation_format("a.GIF"), "gif")
+        self.assertEqual(animation_format("a.webp"), "webp")
+        self.assertEqual(animation_format("a.apng"), "apng")
+        self.assertEqual(animation_format("dir/a.mp4"), "mp4")
+        for name in ("a.avi", "a.png"):  # .png é o gráfico estático
+            with self.assertRaises(ValueError):
+                animation_format(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,10 @@ Módulo para processamento e manipulação de dados extraídos.
 import pandas as pd
 import numpy as np
 
+from goal500.utils import instrument
 
+
+@instrument.instrumented("clean_data")
 def clean_data(df):
     """
     Limpa e prepara os dados extraídos para análise.
@@ -34,6 +37,7 @@ def clean_data(df):
     return df
 
 
+@instrument.instrumented("calculate_cumulative_goals")
 def calculate_cumulative_goals(df):
     """
     Calcula os gols acumulados por jogador ao longo dos anos.
@@ -80,6 +84,77 @@ def calculate_cumulative_goals(df):
         return pd.DataFrame(columns=["name", "year", "total", "years_active", "cumulative_goals", "player_label"])
 
 
+# Colunas lidas por aggregate_csv (as demais não entram em nenhuma agregação).
+AGGREGATE_KEYS = ["name", "year", "type"]
+
+
+def _merge_partials(partials):
+    """Soma somas parciais por (name, year, type) numa única tabela."""
+    merged = pd.concat(partials, ignore_index=True)
+    return merged.groupby(AGGREGATE_KEYS, sort=False, dropna=False)["total"].sum().reset_index()
+
+
+@instrument.instrumented("aggregate_csv")
+def aggregate_csv(path, chunksize=500_000):
+    """
+    Lê um CSV grande em blocos e soma os gols por (name, year, type).
+
+    Cada bloco passa por clean_data e vira somas parciais. As parciais novas
+    são combinadas com a tabela acumulada quando passam de `chunksize` linhas
+    e do tamanho dessa tabela (cada linha é recombinada poucas vezes, mesmo com
+    muitas chaves distintas). A memória fica em torno do dobro do número de
+    chaves distintas mais um bloco, e não cresce com o tamanho do arquivo
+    (mais fontes ou snapshots das mesmas chaves).
+
+    O resultado pode substituir pd.read_csv(path) em qualquer etapa que some
+    gols por jogador e ano (calculate_cumulative_goals,
+    prepare_visualization_data, build_site_data, os gráficos): as saídas são
+    as mesmas da leitura inteira, inclusive os tipos de year e total —
+    inteiros se todos os blocos tiverem só inteiros válidos, float64 se algum
+    bloco tiver valores vazios, inválidos ou fracionários (como o pandas
+    faria com o arquivo inteiro).
+
+    Args:
+        path (str): arquivo CSV com as colunas name, year, total e type.
+        chunksize (int, optional): linhas por bloco.
+
+    Returns:
+        pd.DataFrame: colunas name, year, type e total, uma linha por chave, na
+        ordem em que as chaves aparecem no arquivo.
+    """
+    columns = set(AGGREGATE_KEYS) | {"total"}
+    partials = []
+    rows = merged_rows = 0
+    float_columns = set()
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=lambda col: col in columns):
+        if "type" not in chunk:
+            chunk["type"] = np.nan
+        clean = clean_data(chunk)
+        for column in ("year", "total"):
+            if clean[column].dtype.kind == "f":
+                float_columns.add(column)
+        partials.append(clean.groupby(AGGREGATE_KEYS, sort=False, dropna=False)["total"].sum().reset_index())
+        rows += len(partials[-1])
+        if rows > max(chunksize, 2 * merged_rows) and len(partials) > 1:
+            partials = [_merge_partials(partials)]
+            rows = merged_rows = len(partials[0])
+
+    if not partials:
+        return pd.DataFrame(columns=AGGREGATE_KEYS + ["total"])
+    result = _merge_partials(partials) if len(partials) > 1 else partials[0]
+    return result.astype({column: "float64" for column in float_columns})[AGGREGATE_KEYS + ["total"]]
+
+
+def cumulative_goals_from_csv(path, chunksize=500_000):
+    """
+    Gols acumulados de um CSV grande, em memória limitada (ver aggregate_csv).
+
+    Returns:
+        pd.DataFrame: o mesmo de prepare_visualization_data(pd.read_csv(path)).
+    """
+    return calculate_cumulative_goals(aggregate_csv(path, chunksize))
+
+
 def prepare_visualization_data(df):
     """
     Prepara os dados para visualização.
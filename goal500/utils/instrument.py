@@ -0,0 +1,173 @@
+"""
+Instrumentação leve das etapas: tempo de parede, tempo de CPU e pico de memória.
+
+As etapas são marcadas com o gerenciador de contexto `stage` ou o decorador
+`instrumented`. Enquanto a instrumentação está desligada (padrão), ambos não
+fazem nada além de chamar o código; com `enable()` cada execução de etapa é
+registrada, e `summary()` agrega os registros por nome (chamadas, somas de
+tempo e maior pico de memória).
+
+Os registros são do processo atual: etapas executadas em pools de processos
+(`--workers`, `--jobs`) não aparecem no resumo do processo principal.
+
+Etapas podem rodar em várias threads ao mesmo tempo: cada thread tem sua pilha
+de etapas abertas. O pico de memória do tracemalloc é um só para o processo,
+então só as etapas da thread principal o medem (incluindo o que as threads
+disparadas por elas alocam); nas demais, peak_mb fica None.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_enabled = False
+_started_tracing = False
+_records = []
+# Pilha das etapas abertas (por thread), para que etapas aninhadas não percam
+# o pico da externa.
+_local = threading.local()
+
+
+def _stack():
+    """Pilha das etapas abertas na thread atual."""
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def enable(memory=True):
+    """
+    Liga o registro das etapas.
+
+    Args:
+        memory (bool, optional): mede também o pico de memória com tracemalloc
+            (deixa o código mais lento; os tempos passam a incluir esse custo).
+    """
+    global _enabled, _started_tracing
+    _enabled = True
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+
+
+def disable():
+    """Desliga o registro (e o tracemalloc, se foi ligado por enable)."""
+    global _enabled, _started_tracing
+    _enabled = False
+    if _started_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _started_tracing = False
+
+
+def reset():
+    """Descarta os registros acumulados."""
+    _records.clear()
+
+
+def is_enabled():
+    return _enabled
+
+
+@contextmanager
+def stage(name):
+    """
+    Registra uma execução da etapa `name` (tempo de parede, CPU e pico de memória).
+
+    O pico é a memória alocada acima da que havia no início da etapa, medida
+    pelo tracemalloc (None se ele não estiver ligado ou fora da thread principal).
+    """
+    if not _enabled:
+        yield
+        return
+
+    stack = _stack()
+    tracing = tracemalloc.is_tracing() and threading.current_thread() is threading.main_thread()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        stack.append({"start": current, "peak": current})
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        record = {
+            "stage": name,
+            "wall_s": time.perf_counter() - wall,
+            "cpu_s": time.process_time() - cpu,
+            "peak_mb": None,
+        }
+        if tracing and tracemalloc.is_tracing():
+            frame = stack.pop()
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            record["peak_mb"] = (peak - frame["start"]) / 2**20
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+        elif tracing:
+            stack.pop()
+        _records.append(record)
+
+
+def instrumented(name):
+    """Decorador: registra cada chamada da função como uma execução da etapa `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def records():
+    """Retorna uma cópia dos registros individuais, na ordem em que terminaram."""
+    return list(_records)
+
+
+def summary():
+    """
+    Agrega os registros por etapa, na ordem em que cada etapa apareceu.
+
+    Returns:
+        list: dicionários com stage, calls, wall_s, cpu_s (somas) e peak_mb (máximo).
+    """
+    totals = {}
+    for record in _records:
+        entry = totals.setdefault(record["stage"], {
+            "stage": record["stage"], "calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_mb": None,
+        })
+        entry["calls"] += 1
+        entry["wall_s"] += record["wall_s"]
+        entry["cpu_s"] += record["cpu_s"]
+        if record["peak_mb"] is not None:
+            entry["peak_mb"] = max(entry["peak_mb"] or 0.0, record["peak_mb"])
+    return list(totals.values())
+
+
+def print_summary():
+    """Imprime a tabela de resumo por etapa."""
+    rows = summary()
+    if not rows:
+        print("Nenhuma etapa instrumentada foi executada.")
+        return
+    width = max(len("etapa"), *(len(row["stage"]) for row in rows))
+    print("Instrumentação por etapa:")
+    print(f"  {'etapa':<{width}}{'chamadas':>10}{'parede (s)':>12}{'CPU (s)':>10}{'pico (MB)':>11}")
+    for row in rows:
+        peak = f"{row['peak_mb']:.1f}" if row["peak_mb"] is not None else "-"
+        print(f"  {row['stage']:<{width}}{row['calls']:>10}{row['wall_s']:>12.3f}"
+              f"{row['cpu_s']:>10.3f}{peak:>11}")
+
+
+def write_json(output_file):
+    """Grava o resumo e os registros individuais em JSON."""
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as fh:
+        json.dump({"summary": summary(), "records": records()}, fh, indent=2)
+        fh.write("\n")
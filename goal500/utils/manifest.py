@@ -0,0 +1,183 @@
+"""
+Manifesto de build: evita regerar artefatos cujas entradas não mudaram.
+
+Cada artefato (data.json, o PNG, a animação) é registrado no manifesto com a
+impressão digital (hash) dos dados normalizados e dos parâmetros usados para
+gerá-lo. Se na próxima execução a impressão digital for a mesma e os arquivos
+existirem, a etapa é pulada. Todas as escritas são atômicas: o conteúdo vai
+para um arquivo temporário no mesmo diretório e entra no lugar com os.replace.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from goal500 import __version__
+from goal500.utils.data_processing import clean_data
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+# Colunas que definem o conteúdo dos dados para a impressão digital, com o
+# tipo de cada uma: 2020 e 2020.0, 10 e 10.0 geram o mesmo hash.
+DATA_COLUMNS = {"name": str, "year": int, "type": str, "total": float}
+
+
+def normalize_data(df, clean=False):
+    """
+    Normaliza os dados para que o mesmo conteúdo gere sempre o mesmo hash.
+
+    Aplica clean_data, mantém só as colunas relevantes e ordena as linhas, de
+    modo que a ordem do CSV e colunas extras não mudem a impressão digital.
+
+    Args:
+        df (pd.DataFrame): dados brutos (ou já limpos, com `clean=True`).
+        clean (bool, optional): os dados já passaram por clean_data.
+    """
+    if not clean:
+        df = clean_data(df.copy())
+    columns = [column for column in DATA_COLUMNS if column in df.columns]
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    data = df[columns].astype({column: DATA_COLUMNS[column] for column in columns})
+    return data.sort_values(columns, kind="stable").reset_index(drop=True)
+
+
+def data_fingerprint(df, clean=False):
+    """
+    Calcula a impressão digital só dos dados normalizados.
+
+    O pipeline calcula uma vez, a partir dos dados já limpos, e passa o
+    resultado a todas as etapas (ver fingerprint).
+
+    Args:
+        df (pd.DataFrame): dados brutos (ou já limpos, com `clean=True`).
+        clean (bool, optional): os dados já passaram por clean_data.
+
+    Returns:
+        str: SHA-256 (hexadecimal) das colunas e das linhas normalizadas.
+    """
+    data = normalize_data(df, clean)
+    digest = hashlib.sha256(",".join(data.columns).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint(df, data_key=None, **params):
+    """
+    Calcula a impressão digital de um artefato: dados normalizados + parâmetros.
+
+    Args:
+        df (pd.DataFrame): dados (brutos ou já limpos) usados pelo artefato;
+            ignorado com `data_key`.
+        data_key (str, optional): impressão digital dos dados já calculada
+            (ver data_fingerprint), para não normalizar os dados de novo.
+        **params: parâmetros que mudam o resultado (serializáveis em JSON).
+
+    Returns:
+        str: os 16 primeiros dígitos hexadecimais do SHA-256.
+    """
+    if data_key is None:
+        data_key = data_fingerprint(df)
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"version": __version__, **params}, sort_keys=True,
+                             default=str).encode("utf-8"))
+    digest.update(data_key.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Fornece um caminho temporário que substitui `path` atomicamente no final.
+
+    O temporário fica no mesmo diretório e mantém a extensão, para que quem
+    escreve (matplotlib, os escritores de animação) reconheça o formato. Se
+    a escrita falhar, o temporário é removido e `path` continua intacto.
+    """
+    directory, name = os.path.split(path)
+    os.makedirs(directory or ".", exist_ok=True)
+    # Nome único criado por quem escreve, com as permissões padrão (umask).
+    tmp = os.path.join(directory, f".{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}"
+                                  f"{os.path.splitext(name)[1]}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def atomic_write(path, data):
+    """Grava `data` (bytes ou str) em `path` de forma atômica."""
+    mode = "wb" if isinstance(data, bytes) else "w"
+    encoding = None if isinstance(data, bytes) else "utf-8"
+    with atomic_path(path) as tmp:
+        with open(tmp, mode, encoding=encoding) as fh:
+            fh.write(data)
+
+
+@contextmanager
+def _locked(manifest_path):
+    """Trava o manifesto entre processos (etapas em paralelo no pipeline)."""
+    if fcntl is None:
+        yield
+        return
+    with open(manifest_path + ".lock", "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def load_manifest(manifest_path):
+    """
+    Lê o manifesto.
+
+    Returns:
+        dict: caminho do artefato -> registro; vazio se o arquivo não existe.
+    """
+    try:
+        with open(manifest_path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+
+def is_up_to_date(manifest_path, outputs, key):
+    """
+    Verifica se um artefato pode ser reaproveitado.
+
+    Args:
+        manifest_path (str): caminho do manifesto.
+        outputs (list): arquivos gerados pela etapa; o primeiro é a chave no manifesto.
+        key (str): impressão digital atual (ver fingerprint).
+
+    Returns:
+        bool: True se o registro bate com `key` e todos os arquivos existem.
+    """
+    entry = load_manifest(manifest_path).get(os.path.normpath(outputs[0]))
+    return (entry is not None and entry.get("fingerprint") == key
+            and all(os.path.exists(path) for path in outputs))
+
+
+def record(manifest_path, output, key, stage):
+    """Registra no manifesto a impressão digital do artefato recém-gerado."""
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with _locked(manifest_path):
+        manifest = load_manifest(manifest_path)
+        manifest[os.path.normpath(output)] = {
+            "stage": stage,
+            "fingerprint": key,
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        atomic_write(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
@@ -2,183 +2,584 @@
 Módulo para visualização dos dados de gols acumulados.
 """
 
-import matplotlib.pyplot as plt
+import os
+import re
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import matplotlib
 import numpy as np
 import pandas as pd
-from matplotlib.colors import LinearSegmentedColormap
-import imageio
-import os
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 from matplotlib.ticker import MaxNLocator
 
+from goal500.utils import instrument
 from goal500.utils.data_processing import prepare_visualization_data
+from goal500.utils.manifest import atomic_path, fingerprint, is_up_to_date, record
+from goal500.visualization.writers import animation_format, write_animation
 
 
-def plot_cumulative_goals(data, output_file=None, title="Cumulative goals", subtitle="Active players with most goals"):
+def _new_figure(figsize=(12, 8), dpi=100):
     """
-    Cria um gráfico de gols acumulados por anos ativos.
-    
+    Cria uma figura com canvas Agg próprio, fora do pyplot.
+
+    A figura não entra no registro global do pyplot: é liberada quando sai
+    de escopo e pode ser desenhada em qualquer thread.
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# A partir de quantos jogadores o gráfico estático usa o modo para muitos jogadores.
+LARGE_N_THRESHOLD = 50
+
+
+def _player_segments(plot_data):
+    """
+    Separa os dados preparados em uma sequência de pontos por jogador, sem laço em Python.
+
+    Returns:
+        tuple: (segmentos, rótulos) — lista de arrays (n, 2) com (anos ativos, gols
+        acumulados) na ordem alfabética dos jogadores e array com o rótulo de cada um.
+    """
+    ordered = plot_data.sort_values(["name", "years_active"], kind="stable")
+    codes, _ = pd.factorize(ordered["name"], sort=True)
+    points = ordered[["years_active", "cumulative_goals"]].to_numpy(dtype=float)
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    last = np.append(bounds - 1, len(ordered) - 1)
+    return np.split(points, bounds), ordered["player_label"].to_numpy()[last]
+
+
+def _declutter_labels(anchors, sizes, priority, max_labels=None):
+    """
+    Escolhe, de forma gulosa, os rótulos que cabem sem se sobrepor.
+
+    Os candidatos são visitados do mais para o menos prioritário; cada caixa
+    aceita é guardada numa grade de células do tamanho da maior caixa, de modo
+    que cada teste de colisão só olha as células vizinhas.
+
     Args:
-        data (pd.DataFrame): DataFrame com os dados extraídos.
-        output_file (str, optional): Caminho para salvar o gráfico. Se None, apenas exibe.
-        title (str, optional): Título do gráfico.
-        subtitle (str, optional): Subtítulo do gráfico.
-        
+        anchors (np.ndarray): canto inferior esquerdo de cada rótulo (N x 2), em pixels.
+        sizes (np.ndarray): largura e altura estimadas de cada rótulo (N x 2), em pixels.
+        priority (np.ndarray): prioridade de cada rótulo (maior primeiro).
+        max_labels (int, optional): número máximo de rótulos mantidos.
+
     Returns:
-        matplotlib.figure.Figure: Objeto figura do matplotlib.
+        list: índices dos rótulos mantidos, em ordem de prioridade.
     """
-    # Preparar dados para visualização
-    plot_data = prepare_visualization_data(data)
-    
-    if plot_data.empty:
-        print("Sem dados para visualizar.")
-        return None
-    
-    # Criar figura
-    plt.figure(figsize=(12, 8))
-    
+    if len(anchors) == 0:
+        return []
+    cell_w, cell_h = np.maximum(sizes.max(axis=0), 1.0)
+    grid = {}
+    kept = []
+    for i in np.argsort(-priority, kind="stable"):
+        if max_labels is not None and len(kept) >= max_labels:
+            break
+        x0, y0 = anchors[i]
+        x1, y1 = x0 + sizes[i, 0], y0 + sizes[i, 1]
+        cx, cy = int(x0 // cell_w), int(y0 // cell_h)
+        # Caixas que podem colidir começam no máximo uma célula antes ou depois.
+        collides = any(
+            x0 < anchors[j, 0] + sizes[j, 0] and anchors[j, 0] < x1
+            and y0 < anchors[j, 1] + sizes[j, 1] and anchors[j, 1] < y1
+            for gx in (cx - 1, cx, cx + 1)
+            for gy in (cy - 1, cy, cy + 1)
+            for j in grid.get((gx, gy), ())
+        )
+        if not collides:
+            kept.append(i)
+            grid.setdefault((cx, cy), []).append(i)
+    return kept
+
+
+def _draw_collection(ax, plot_data, colors, markers=True):
+    """
+    Desenha todos os jogadores de uma vez: um LineCollection e, opcionalmente, um scatter.
+
+    Returns:
+        tuple: (pontos finais N x 2, rótulos) de cada jogador, para o posicionamento dos rótulos.
+    """
+    segments, labels = _player_segments(plot_data)
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=1, alpha=0.8))
+    if markers:
+        points = np.concatenate(segments)
+        lengths = [len(segment) for segment in segments]
+        ax.scatter(points[:, 0], points[:, 1], s=9, c=np.repeat(colors, lengths, axis=0),
+                   linewidths=0)
+    ax.autoscale_view()
+    return np.array([segment[-1] for segment in segments]), labels
+
+
+def _place_labels(ax, ends, labels, max_labels, fontsize=10):
+    """
+    Coloca os rótulos finais que não se sobrepõem, priorizando quem tem mais gols.
+
+    O tamanho de cada rótulo é estimado pelo número de caracteres, sem medir o
+    texto, então o custo não depende do renderizador.
+    """
+    scale = fontsize * ax.figure.dpi / 72
+    anchors = ax.transData.transform(ends)
+    sizes = np.column_stack([[len(label) * 0.6 * scale for label in labels],
+                             np.full(len(labels), 1.2 * scale)])
+    for i in _declutter_labels(anchors, sizes, ends[:, 1], max_labels):
+        ax.text(ends[i, 0], ends[i, 1], labels[i], fontsize=fontsize)
+
+
+@instrument.instrumented("plot.draw")
+def _draw_cumulative(fig, plot_data, title, subtitle, large=None, max_labels=30, markers=True):
+    """
+    Desenha o gráfico de gols acumulados numa figura vazia.
+
+    Com muitos jogadores (`large`), as linhas viram um único LineCollection, os
+    marcadores um único scatter e só entram os rótulos que não se sobrepõem.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figura onde desenhar.
+        plot_data (pd.DataFrame): Dados preparados (prepare_visualization_data).
+        title (str): Título do gráfico.
+        subtitle (str): Subtítulo do gráfico.
+        large (bool, optional): Força (ou desliga) o modo para muitos jogadores. Se
+            None, é usado acima de LARGE_N_THRESHOLD jogadores.
+        max_labels (int, optional): Máximo de rótulos no modo para muitos jogadores.
+        markers (bool, optional): Desenha os marcadores no modo para muitos jogadores.
+    """
+    ax = fig.add_subplot()
+    n_players = plot_data["name"].nunique()
+    if large is None:
+        large = n_players > LARGE_N_THRESHOLD
+
     # Criar um colormap personalizado baseado no viridis
-    colors = plt.cm.viridis(np.linspace(0, 0.9, len(plot_data["name"].unique())))
-    
-    # Plotar dados para cada jogador
-    for i, (name, group) in enumerate(plot_data.groupby("name")):
-        plt.plot(group["years_active"], group["cumulative_goals"], 
-                 marker="o", markersize=5, linewidth=2, 
-                 color=colors[i], label=group["player_label"].iloc[0])
-        
-        # Adicionar rótulo no último ponto
-        last_point = group.iloc[-1]
-        plt.text(last_point["years_active"], last_point["cumulative_goals"], 
-                 last_point["player_label"], fontsize=10)
-    
+    colors = matplotlib.colormaps["viridis"](np.linspace(0, 0.9, n_players))
+
+    if large:
+        ends, labels = _draw_collection(ax, plot_data, colors, markers)
+    else:
+        # Plotar dados para cada jogador
+        for i, (name, group) in enumerate(plot_data.groupby("name")):
+            ax.plot(group["years_active"], group["cumulative_goals"],
+                    marker="o", markersize=5, linewidth=2,
+                    color=colors[i], label=group["player_label"].iloc[0])
+
+            # Adicionar rótulo no último ponto
+            last_point = group.iloc[-1]
+            ax.text(last_point["years_active"], last_point["cumulative_goals"],
+                    last_point["player_label"], fontsize=10)
+
     # Configurar eixos
-    plt.xlabel("Anos ativos", fontsize=12)
-    plt.ylabel("Gols", fontsize=12)
-    
+    ax.set_xlabel("Anos ativos", fontsize=12)
+    ax.set_ylabel("Gols", fontsize=12)
+
     # Configurar ticks dos eixos
-    plt.gca().xaxis.set_major_locator(MaxNLocator(integer=True))
-    plt.gca().yaxis.set_major_locator(MaxNLocator(integer=True))
-    
+    ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+
     # Adicionar grade
-    plt.grid(True, linestyle="--", alpha=0.7)
-    
+    ax.grid(True, linestyle="--", alpha=0.7)
+
     # Adicionar título e subtítulo
-    plt.title(f"{title}\n{subtitle}", fontsize=16)
-    
+    ax.set_title(f"{title}\n{subtitle}", fontsize=16)
+
     # Adicionar fonte
-    plt.figtext(0.5, 0.01, "Fonte: Wikipedia", ha="center", fontsize=10)
-    
+    fig.text(0.5, 0.01, "Fonte: Wikipedia", ha="center", fontsize=10)
+
     # Ajustar layout
-    plt.tight_layout()
-    
-    # Salvar ou exibir
-    if output_file:
-        plt.savefig(output_file, dpi=300, bbox_inches="tight")
-        print(f"Gráfico salvo em: {output_file}")
-    
-    return plt.gcf()
+    fig.tight_layout()
+
+    # Os rótulos são posicionados depois do layout, com as transformações finais.
+    if large:
+        _place_labels(ax, ends, labels, max_labels)
 
 
-def create_animation(data, output_file="animation.gif", fps=2, duration=5):
+def plot_cumulative_goals(data, output_file=None, title="Cumulative goals", subtitle="Active players with most goals",
+                          large=None, max_labels=30, markers=True, manifest=None):
     """
-    Cria uma animação GIF dos gols acumulados ao longo dos anos.
+    Cria um gráfico de gols acumulados por anos ativos.
+
+    A figura é criada fora do pyplot (sem estado global), então a função pode
+    ser chamada repetidamente ou de várias threads sem acumular figuras.
     
     Args:
         data (pd.DataFrame): DataFrame com os dados extraídos.
-        output_file (str, optional): Caminho para salvar a animação.
-        fps (int, optional): Frames por segundo.
-        duration (int, optional): Duração em segundos da pausa no final.
+        output_file (str, optional): Caminho para salvar o gráfico. Se None, apenas retorna a figura.
+        title (str, optional): Título do gráfico.
+        subtitle (str, optional): Subtítulo do gráfico.
+        large (bool, optional): Modo para muitos jogadores (um LineCollection,
+            rótulos sem sobreposição). Se None, é ativado acima de
+            LARGE_N_THRESHOLD jogadores.
+        max_labels (int, optional): Máximo de rótulos no modo para muitos jogadores.
+        markers (bool, optional): Desenha os marcadores no modo para muitos jogadores.
+        manifest (str, optional): Manifesto de build. Se os dados e parâmetros
+            forem os mesmos da última vez, o arquivo existente é mantido.
         
     Returns:
-        str: Caminho do arquivo GIF criado.
+        matplotlib.figure.Figure: Objeto figura do matplotlib (None se não há
+        dados ou se o arquivo foi mantido pelo manifesto).
     """
+    key = None
+    if manifest and output_file:
+        key = _plot_key(data, output_file, title, subtitle, large, max_labels, markers)
     # Preparar dados para visualização
     plot_data = prepare_visualization_data(data)
-    
+    return _plot_prepared(plot_data, output_file, title, subtitle, large, max_labels, markers,
+                          manifest, key)
+
+
+def _plot_key(data, output_file, title="Cumulative goals", subtitle="Active players with most goals",
+              large=None, max_labels=30, markers=True, data_key=None):
+    """Impressão digital do gráfico estático para o manifesto de build."""
+    return fingerprint(data, data_key, stage="plot", format=os.path.splitext(output_file)[1], title=title,
+                       subtitle=subtitle, large=large, max_labels=max_labels, markers=markers)
+
+
+def _plot_prepared(plot_data, output_file=None, title="Cumulative goals",
+                   subtitle="Active players with most goals", large=None, max_labels=30, markers=True,
+                   manifest=None, key=None):
+    """
+    Desenha (e salva) o gráfico estático a partir de dados já preparados.
+
+    Com `manifest` e `key` (ver _plot_key), o gráfico é pulado se o manifesto
+    já registra a mesma impressão digital para `output_file`.
+    """
+    if manifest and key and output_file and is_up_to_date(manifest, [output_file], key):
+        print(f"Gráfico sem mudanças, mantido: {output_file}")
+        return None
+
     if plot_data.empty:
         print("Sem dados para visualizar.")
         return None
     
-    # Criar diretório temporário para os frames
-    temp_dir = "temp_frames"
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Obter anos únicos
-    years_active = sorted(plot_data["years_active"].unique())
+    fig = _new_figure()
+    _draw_cumulative(fig, plot_data, title, subtitle, large, max_labels, markers)
     
-    # Criar um colormap personalizado baseado no viridis
-    colors = plt.cm.viridis(np.linspace(0, 0.9, len(plot_data["name"].unique())))
-    
-    # Criar frames
-    frames = []
+    if output_file:
+        with instrument.stage("plot.save"), atomic_path(output_file) as tmp:
+            fig.savefig(tmp, dpi=300, bbox_inches="tight")
+        if manifest and key:
+            record(manifest, output_file, key, "plot")
+        print(f"Gráfico salvo em: {output_file}")
     
-    for i, year in enumerate(years_active):
-        # Filtrar dados até o ano atual
-        current_data = plot_data[plot_data["years_active"] <= year]
-        
-        # Criar figura
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Plotar dados para cada jogador
-        for j, (name, group) in enumerate(current_data.groupby("name")):
-            # Filtrar grupo até o ano atual
-            group = group[group["years_active"] <= year]
-            
-            if not group.empty:
-                ax.plot(group["years_active"], group["cumulative_goals"], 
-                        marker="o", markersize=5, linewidth=2, 
-                        color=colors[j], label=group["player_label"].iloc[0])
-                
-                # Adicionar rótulo no último ponto
-                last_point = group.iloc[-1]
-                ax.text(last_point["years_active"], last_point["cumulative_goals"], 
-                        last_point["player_label"], fontsize=10)
-        
-        # Configurar eixos
+    return fig
+
+
+def _slugify(value):
+    """Converte um nome (ex.: "Kylian Mbappé") num nome de arquivo seguro ("kylian-mbappe")."""
+    text = unicodedata.normalize("NFKD", str(value)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "grafico"
+
+
+def _render_chart(job):
+    """
+    Desenha e salva um gráfico do lote; roda numa thread ou num processo do pool.
+
+    A figura vive só dentro desta chamada e é limpa logo após o savefig, então
+    a memória não cresce com o número de gráficos.
+    """
+    data, output_file, title, subtitle, dpi = job
+    plot_data = prepare_visualization_data(data)
+    if plot_data.empty:
+        return None
+    fig = _new_figure()
+    _draw_cumulative(fig, plot_data, title, subtitle)
+    fig.savefig(output_file, dpi=dpi, bbox_inches="tight")
+    fig.clear()
+    return output_file
+
+
+def plot_batch(data, output_dir, by="name", fmt="png", workers=4, processes=False,
+               dpi=150, title="Cumulative goals"):
+    """
+    Cria um gráfico de gols acumulados para cada grupo dos dados, em paralelo.
+
+    Cada grupo (ex.: cada jogador, ou cada tipo de gol) vira um arquivo
+    `<output_dir>/<grupo>.<fmt>`. Os gráficos são desenhados num pool de
+    threads (padrão) ou de processos, cada um na sua própria figura.
+
+    Args:
+        data (pd.DataFrame): DataFrame com os dados extraídos.
+        output_dir (str): Diretório de saída (criado se não existir).
+        by (str, optional): Coluna usada para separar os gráficos ("name" ou "type").
+        fmt (str, optional): Formato das imagens (extensão aceita pelo matplotlib).
+        workers (int, optional): Número de threads/processos.
+        processes (bool, optional): Se True, usa processos em vez de threads.
+        dpi (int, optional): Resolução das imagens.
+        title (str, optional): Título dos gráficos; o subtítulo é o nome do grupo.
+
+    Returns:
+        dict: Caminho do arquivo criado para cada grupo (None se o grupo não tinha dados).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    groups = list(data.groupby(by, sort=True))
+    jobs = [
+        (group, os.path.join(output_dir, f"{_slugify(key)}.{fmt}"), title, str(key), dpi)
+        for key, group in groups
+    ]
+
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=max(1, workers)) as executor:
+        paths = list(executor.map(_render_chart, jobs))
+
+    print(f"{sum(p is not None for p in paths)} gráficos salvos em: {output_dir}")
+    return {key: path for (key, _), path in zip(groups, paths)}
+
+
+def _player_series(plot_data):
+    """
+    Separa os dados preparados em arrays por jogador, na ordem alfabética do groupby.
+
+    Returns:
+        list: tuplas (years_active, cumulative_goals, player_label) com arrays NumPy.
+    """
+    return [
+        (group["years_active"].to_numpy(), group["cumulative_goals"].to_numpy(),
+         group["player_label"].iloc[0])
+        for _, group in plot_data.groupby("name")
+    ]
+
+
+def _tween_frames(plot_data, tween=0):
+    """
+    Calcula, numa única passada NumPy, a posição de todos os frames e a ponta
+    interpolada da linha de cada jogador em cada frame.
+
+    Os frames seguem os anos ativos; com `tween=N` entram N frames extras,
+    igualmente espaçados, entre cada par de anos consecutivos. Os acumulados
+    vêm de uma matriz jogadores x anos (lacunas internas preenchidas por
+    interpolação linear), e a ponta de cada linha em cada frame é obtida por
+    interpolação vetorizada entre as colunas vizinhas — sem laço por frame.
+
+    Args:
+        plot_data (pd.DataFrame): dados preparados (prepare_visualization_data).
+        tween (int, optional): frames interpolados entre anos consecutivos.
+
+    Returns:
+        tuple: (posições, pontas) — array (F,) com o "ano ativo" de cada frame e
+        array (jogadores x F) com o acumulado interpolado (NaN fora da carreira).
+    """
+    dense = plot_data.pivot_table(index="name", columns="years_active",
+                                  values="cumulative_goals", aggfunc="last")
+    grid = dense.columns.to_numpy(dtype=float)
+    values = dense.interpolate(method="index", axis=1, limit_area="inside").to_numpy(dtype=float)
+    if len(grid) == 1:
+        return grid, values
+
+    steps = np.arange(tween + 1) / (tween + 1)
+    positions = np.append((grid[:-1, None] + np.diff(grid)[:, None] * steps).ravel(), grid[-1])
+    k = np.minimum(np.searchsorted(grid, positions, side="right") - 1, len(grid) - 2)
+    frac = (positions - grid[k]) / (grid[k + 1] - grid[k])
+    left = values[:, k]
+    # Em cima de um ano da grade vale o próprio ponto (mesmo no último ano da carreira).
+    heads = np.where(frac == 0, left, left + frac * (values[:, k + 1] - left))
+    return positions, heads
+
+
+class _FrameRenderer:
+    """
+    Desenha os frames da animação reaproveitando uma única figura.
+
+    Linhas e rótulos de cada jogador são criados uma vez; a cada frame só os
+    dados dos artistas mudam e o canvas Agg é redesenhado. O frame sai direto
+    do buffer RGBA do canvas, sem passar por arquivos PNG.
+    """
+
+    def __init__(self, plot_data, dpi=100, tween=0):
+        self.series = _player_series(plot_data)
+        self.positions, self.heads = _tween_frames(plot_data, tween)
+        colors = matplotlib.colormaps["viridis"](np.linspace(0, 0.9, len(self.series)))
+
+        self.fig = _new_figure(dpi=dpi)
+        self.canvas = self.fig.canvas
+        ax = self.fig.add_subplot()
+
+        self.lines = []
+        self.labels = []
+        for (_, _, label), color in zip(self.series, colors):
+            line, = ax.plot([], [], marker="o", markersize=5, linewidth=2,
+                            color=color, label=label)
+            self.lines.append(line)
+            self.labels.append(ax.text(0, 0, label, fontsize=10, visible=False))
+
+        # Configurar eixos (limites fixos para todos os frames)
         ax.set_xlabel("Anos ativos", fontsize=12)
         ax.set_ylabel("Gols", fontsize=12)
-        
-        # Configurar limites dos eixos
-        ax.set_xlim(0, max(years_active) + 1)
+        ax.set_xlim(0, self.positions[-1] + 1)
         ax.set_ylim(0, plot_data["cumulative_goals"].max() * 1.1)
-        
-        # Configurar ticks dos eixos
         ax.xaxis.set_major_locator(MaxNLocator(integer=True))
         ax.yaxis.set_major_locator(MaxNLocator(integer=True))
-        
-        # Adicionar grade
         ax.grid(True, linestyle="--", alpha=0.7)
+
+        self.title = ax.set_title(self._title(self.positions[-1]), fontsize=16)
+        self.fig.text(0.5, 0.01, "Fonte: Wikipedia", ha="center", fontsize=10)
+        self.fig.tight_layout()
+
+    def __len__(self):
+        return len(self.positions)
+
+    @staticmethod
+    def _title(position):
+        return f"Gols acumulados\nJogadores ativos com mais gols (Ano ativo: {int(position)})"
+
+    @instrument.instrumented("animation.frame")
+    def render(self, index):
+        """
+        Desenha o frame de número `index`.
+
+        Cada linha vai até o último ano já alcançado e, nos frames
+        interpolados, ganha uma ponta na posição intermediária.
+
+        Returns:
+            np.ndarray: imagem RGB (altura x largura x 3) do frame.
+        """
+        position = self.positions[index]
+        for (x, y, _), head, line, label in zip(self.series, self.heads[:, index],
+                                                self.lines, self.labels):
+            n = np.searchsorted(x, position, side="right")
+            if n and np.isfinite(head) and position > x[n - 1]:
+                xs, ys = np.append(x[:n], position), np.append(y[:n], head)
+            else:
+                xs, ys = x[:n], y[:n]
+            line.set_data(xs, ys)
+            label.set_visible(n > 0)
+            if n:
+                label.set_position((xs[-1], ys[-1]))
+        self.title.set_text(self._title(position))
+        self.canvas.draw()
+        # O buffer é reaproveitado no próximo draw: copia só os canais RGB.
+        return np.array(self.canvas.buffer_rgba())[..., :3]
+
+
+# Renderizador de cada processo do pool, criado uma única vez pelo initializer.
+_worker_renderer = None
+
+
+def _init_frame_worker(plot_data, dpi, tween):
+    """Initializer do pool: recebe os dados preparados uma vez e monta a figura do processo."""
+    global _worker_renderer
+    _worker_renderer = _FrameRenderer(plot_data, dpi, tween)
+
+
+def _render_frame_range(indices):
+    """Desenha, no processo do pool, um intervalo contíguo de frames."""
+    return [_worker_renderer.render(i) for i in indices]
+
+
+def _iter_frames(plot_data, indices, workers=1, dpi=100, renderer=None, tween=0):
+    """
+    Gera os frames da animação, em ordem.
+
+    Com `workers > 1` os frames são divididos em intervalos contíguos e
+    distribuídos num pool de processos, cada um com sua própria figura. No
+    máximo `2 * workers` intervalos ficam em andamento ao mesmo tempo, o que
+    mantém a memória limitada mesmo com muitos frames.
+    """
+    if workers <= 1:
+        renderer = renderer or _FrameRenderer(plot_data, dpi, tween)
+        for i in indices:
+            yield renderer.render(i)
+        return
+
+    # Intervalos pequenos o bastante para balancear a carga entre processos.
+    size = max(1, -(-len(indices) // (workers * 4)))
+    ranges = [indices[i:i + size] for i in range(0, len(indices), size)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_frame_worker,
+                             initargs=(plot_data, dpi, tween)) as executor:
+        pending = deque()
+        for frame_range in ranges:
+            pending.append(executor.submit(_render_frame_range, frame_range))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def create_animation(data, output_file="animation.gif", fps=2, duration=5, workers=1, tween=0,
+                     manifest=None):
+    """
+    Cria uma animação dos gols acumulados ao longo dos anos.
+
+    O formato é escolhido pela extensão de `output_file`: GIF (.gif), WebP
+    animado (.webp), APNG (.apng) ou MP4 (.mp4, requer imageio[ffmpeg]).
+
+    Os frames são desenhados em memória numa única figura e enviados um a um
+    ao escritor, sem arquivos temporários. Todos os formatos gravam só o que
+    muda entre frames; a pausa no final é um único frame com duração estendida.
+
+    Args:
+        data (pd.DataFrame): DataFrame com os dados extraídos.
+        output_file (str, optional): Caminho para salvar a animação (.gif, .webp,
+            .apng ou .mp4).
+        fps (int, optional): Frames por segundo.
+        duration (int, optional): Duração em segundos da pausa no final.
+        workers (int, optional): Número de processos para desenhar os frames.
+            Com 1 (padrão), tudo roda no processo atual.
+        tween (int, optional): Frames interpolados entre anos consecutivos,
+            para uma animação mais suave. Cada ano continua durando 1/fps s.
+        manifest (str, optional): Manifesto de build. Se os dados e parâmetros
+            forem os mesmos da última vez, a animação existente é mantida.
         
-        # Adicionar título e subtítulo
-        ax.set_title(f"Gols acumulados\nJogadores ativos com mais gols (Ano ativo: {year})", fontsize=16)
-        
-        # Adicionar fonte
-        plt.figtext(0.5, 0.01, "Fonte: Wikipedia", ha="center", fontsize=10)
-        
-        # Ajustar layout
-        plt.tight_layout()
-        
-        # Salvar frame
-        frame_file = f"{temp_dir}/frame_{i:03d}.png"
-        plt.savefig(frame_file, dpi=100, bbox_inches="tight")
-        frames.append(frame_file)
-        
-        plt.close(fig)
-    
-    # Adicionar frames extras no final para pausa
-    last_frame = frames[-1]
-    for _ in range(fps * duration):
-        frames.append(last_frame)
-    
-    # Criar GIF
-    with imageio.get_writer(output_file, mode="I", fps=fps) as writer:
-        for frame in frames:
-            image = imageio.imread(frame)
-            writer.append_data(image)
-    
-    # Limpar frames temporários
-    for frame in set(frames):
-        os.remove(frame)
-    os.rmdir(temp_dir)
-    
+    Returns:
+        str: Caminho do arquivo criado.
+    """
+    # Validar os parâmetros antes de qualquer trabalho pesado
+    _check_animation_args(output_file, tween)
+    key = _animation_key(data, output_file, fps, duration, tween) if manifest else None
+
+    # Preparar dados para visualização
+    plot_data = prepare_visualization_data(data)
+    return _animate_prepared(plot_data, output_file, fps, duration, workers, tween, manifest, key)
+
+
+def _animation_key(data, output_file, fps=2, duration=5, tween=0, data_key=None):
+    """Impressão digital da animação para o manifesto (`workers` não muda o resultado)."""
+    return fingerprint(data, data_key, stage="animate", format=os.path.splitext(output_file)[1].lower(),
+                       fps=fps, duration=duration, tween=tween)
+
+
+def _check_animation_args(output_file, tween):
+    """Valida o formato de saída e o número de frames interpolados."""
+    animation_format(output_file)
+    if tween < 0:
+        raise ValueError("tween deve ser >= 0.")
+
+
+def _animate_prepared(plot_data, output_file="animation.gif", fps=2, duration=5, workers=1, tween=0,
+                      manifest=None, key=None):
+    """
+    Cria a animação a partir de dados já preparados (ver create_animation).
+
+    Com `manifest` e `key` (ver _animation_key), a animação é pulada se o
+    manifesto já registra a mesma impressão digital para `output_file`.
+    """
+    _check_animation_args(output_file, tween)
+    if manifest and key and is_up_to_date(manifest, [output_file], key):
+        print(f"Animação sem mudanças, mantida: {output_file}")
+        return output_file
+
+    if plot_data.empty:
+        print("Sem dados para visualizar.")
+        return None
+
+    # A paleta global (GIF/APNG/WebP) vem do primeiro e do último frame, que
+    # juntos têm todas as cores do gráfico. A pausa final é um único frame
+    # com duração longa.
+    renderer = _FrameRenderer(plot_data, tween=tween)
+    n_frames = len(renderer)
+    palette_frames = [renderer.render(0), renderer.render(n_frames - 1)]
+    frame_fps = fps * (tween + 1)
+    frame_ms = 1000 / frame_fps
+    durations = [frame_ms] * (n_frames - 1) + [frame_ms + duration * 1000]
+
+    frames = _iter_frames(plot_data, list(range(n_frames)), workers,
+                          renderer=renderer if workers <= 1 else None, tween=tween)
+    # Inclui o desenho dos frames, que são gerados sob demanda pelo escritor.
+    with instrument.stage("animation.write"):
+        write_animation(frames, output_file, durations, frame_fps, palette_frames)
+    if manifest and key:
+        record(manifest, output_file, key, "animate")
+
     print(f"Animação salva em: {output_file}")
     return output_file
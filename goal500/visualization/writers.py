@@ -0,0 +1,363 @@
+"""
+Escritores de animação usados por goal500.visualization.plots.create_animation.
+
+Recebem os frames (arrays RGB) de um iterador e gravam o arquivo em streaming,
+sem guardar a animação inteira em memória (exceto o WebP, ver `write_webp`).
+O formato é escolhido pela
+extensão do arquivo de saída (ver `write_animation`).
+"""
+
+import os
+import struct
+import zlib
+
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+from goal500.utils.manifest import atomic_path
+
+# Índice da paleta reservado para "pixel igual ao do frame anterior".
+TRANSPARENT_INDEX = 255
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def global_palette(frames):
+    """
+    Calcula uma paleta única para todos os frames da animação.
+
+    Usa 255 cores (o índice 255 fica reservado para transparência) extraídas
+    de frames representativos — tipicamente o primeiro e o último, que juntos
+    contêm todas as cores do gráfico.
+
+    Args:
+        frames (list): arrays RGB (altura x largura x 3).
+
+    Returns:
+        PIL.Image.Image: imagem em modo "P" cuja paleta deve ser usada na quantização.
+    """
+    montage = Image.fromarray(np.concatenate(list(frames), axis=0))
+    return montage.quantize(colors=TRANSPARENT_INDEX, method=Image.Quantize.MAXCOVERAGE,
+                            dither=Image.Dither.NONE)
+
+
+def _quantize(frame, palette):
+    """Converte um frame RGB em índices da paleta global (sem dithering)."""
+    return np.asarray(Image.fromarray(frame).quantize(palette=palette, dither=Image.Dither.NONE))
+
+
+def _delta_frames(frames, durations, palette):
+    """
+    Quantiza os frames e gera só o que precisa ser gravado, em ordem.
+
+    O primeiro frame sai inteiro. Os seguintes saem recortados no retângulo
+    que mudou em relação ao anterior, com os pixels inalterados trocados por
+    TRANSPARENT_INDEX. Frames idênticos ao anterior não são gerados: a duração
+    deles é somada à do último frame pendente.
+
+    Yields:
+        tuple: (índices, (x, y), duração em ms, usa_transparência).
+    """
+    previous = None
+    pending = None
+
+    for frame, duration in zip(frames, durations):
+        indices = _quantize(frame, palette)
+
+        if previous is None:
+            pending = [indices, (0, 0), duration, False]
+            previous = indices
+            continue
+
+        changed = indices != previous
+        if not changed.any():
+            pending[2] += duration
+            continue
+
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        top, bottom = rows[0], rows[-1] + 1
+        left, right = cols[0], cols[-1] + 1
+        patch = np.where(changed[top:bottom, left:right],
+                         indices[top:bottom, left:right],
+                         TRANSPARENT_INDEX).astype(np.uint8)
+
+        yield tuple(pending)
+        pending = [patch, (int(left), int(top)), duration, True]
+        previous = indices
+
+    if pending is not None:
+        yield tuple(pending)
+
+
+def _write_gif_frame(fp, indices, offset, duration, transparent, palette_bytes):
+    """Grava um frame (ou um recorte dele) usando a paleta global do arquivo."""
+    im = Image.fromarray(indices)
+    im.putpalette(palette_bytes)
+    params = {"duration": duration, "disposal": 1}
+    if transparent:
+        params["transparency"] = TRANSPARENT_INDEX
+    for chunk in GifImagePlugin.getdata(im, offset=offset, **params):
+        fp.write(chunk)
+
+
+def write_gif(frames, output_file, durations, palette, loop=0):
+    """
+    Grava um GIF animado em streaming, com paleta global e frames diferenciais.
+
+    - Todos os frames são quantizados para a mesma paleta, gravada uma vez no
+      cabeçalho (sem tabelas de cor locais).
+    - Cada frame guarda só o retângulo que mudou em relação ao anterior, e os
+      pixels inalterados dentro dele viram transparentes (disposal 1 mantém o
+      frame anterior por baixo), o que comprime muito melhor no LZW.
+    - Frames idênticos ao anterior não são gravados: a duração deles é somada
+      à do frame anterior.
+
+    Args:
+        frames (iterable): arrays RGB (altura x largura x 3), na ordem.
+        output_file (str): caminho do GIF.
+        durations (iterable): duração de cada frame, em milissegundos.
+        palette (PIL.Image.Image): paleta global, ver `global_palette`.
+        loop (int, optional): número de repetições (0 = infinito).
+
+    Returns:
+        int: número de frames efetivamente gravados.
+    """
+    palette_bytes = palette.getpalette()[:3 * TRANSPARENT_INDEX]
+    written = 0
+
+    with open(output_file, "wb") as fp:
+        for indices, offset, duration, transparent in _delta_frames(frames, durations, palette):
+            if not written:
+                first = Image.fromarray(indices)
+                first.putpalette(palette_bytes)
+                header, _ = GifImagePlugin.getheader(first, info={"loop": loop, "duration": duration})
+                for chunk in header:
+                    fp.write(chunk)
+            _write_gif_frame(fp, indices, offset, duration, transparent, palette_bytes)
+            written += 1
+        fp.write(b";")
+
+    return written
+
+
+def _png_chunk(fp, tag, data):
+    """Grava um chunk PNG (tamanho, tipo, dados e CRC)."""
+    fp.write(struct.pack(">I", len(data)) + tag + data
+             + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+
+def _png_image_data(indices):
+    """Comprime as linhas de uma imagem indexada (filtro 0, o indicado para paletas)."""
+    height, width = indices.shape
+    raw = np.zeros((height, width + 1), dtype=np.uint8)
+    raw[:, 1:] = indices
+    return zlib.compress(raw.tobytes(), 9)
+
+
+def write_apng(frames, output_file, durations, palette, loop=0):
+    """
+    Grava um PNG animado (APNG) em streaming, com paleta global e frames diferenciais.
+
+    Usa o mesmo esquema do GIF (`_delta_frames`): o índice transparente é
+    marcado no chunk tRNS e os recortes são compostos sobre o frame anterior
+    (blend OVER). Como o número de frames só é conhecido no fim, o chunk acTL
+    é reescrito ao fechar o arquivo.
+
+    Args:
+        frames (iterable): arrays RGB (altura x largura x 3), na ordem.
+        output_file (str): caminho do arquivo .apng.
+        durations (iterable): duração de cada frame, em milissegundos.
+        palette (PIL.Image.Image): paleta global, ver `global_palette`.
+        loop (int, optional): número de repetições (0 = infinito).
+
+    Returns:
+        int: número de frames efetivamente gravados.
+    """
+    palette_bytes = bytes(palette.getpalette()[:3 * TRANSPARENT_INDEX]) + b"\x00\x00\x00"
+    alpha = b"\xff" * TRANSPARENT_INDEX + b"\x00"
+    written = 0
+    sequence = 0
+
+    with open(output_file, "wb") as fp:
+        for indices, (x, y), duration, transparent in _delta_frames(frames, durations, palette):
+            height, width = indices.shape
+            if not written:
+                fp.write(PNG_SIGNATURE)
+                _png_chunk(fp, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+                _png_chunk(fp, b"PLTE", palette_bytes)
+                _png_chunk(fp, b"tRNS", alpha)
+                actl_pos = fp.tell()
+                _png_chunk(fp, b"acTL", struct.pack(">II", 0, loop))
+
+            # dispose_op 0 (mantém), blend_op 1 (OVER) nos recortes diferenciais.
+            fctl = struct.pack(">IIIIIHHBB", sequence, width, height, x, y,
+                               min(int(round(duration)), 0xFFFF), 1000, 0, 1 if transparent else 0)
+            _png_chunk(fp, b"fcTL", fctl)
+            sequence += 1
+            data = _png_image_data(indices)
+            if not written:
+                _png_chunk(fp, b"IDAT", data)
+            else:
+                _png_chunk(fp, b"fdAT", struct.pack(">I", sequence) + data)
+                sequence += 1
+            written += 1
+
+        _png_chunk(fp, b"IEND", b"")
+        if written:
+            fp.seek(actl_pos)
+            _png_chunk(fp, b"acTL", struct.pack(">II", written, loop))
+
+    return written
+
+
+def write_webp(frames, output_file, durations, palette=None, lossless=True, quality=80,
+               method=4, loop=0):
+    """
+    Grava um WebP animado com o Image.save do Pillow (save_all/append_images).
+
+    O codificador de animação do libwebp guarda só as sub-regiões que mudam
+    entre frames. Frames idênticos ao anterior são descartados antes e
+    estendem a duração do anterior. Diferente dos outros formatos, o Pillow
+    precisa de todos os frames de uma vez: eles ficam em memória (na paleta
+    global, com `palette`: 1 byte por pixel) até o arquivo ser gravado.
+
+    Com `palette`, os frames são antes reduzidos à paleta global (as mesmas
+    cores do GIF); no modo lossless o libwebp passa então a usar indexação de
+    cores, o que deixa o arquivo bem menor que o GIF equivalente.
+
+    Args:
+        frames (iterable): arrays RGB (altura x largura x 3), na ordem.
+        output_file (str): caminho do arquivo .webp.
+        durations (iterable): duração de cada frame, em milissegundos.
+        palette (PIL.Image.Image, optional): paleta global, ver `global_palette`.
+        lossless (bool, optional): compressão sem perdas (padrão: True, ideal
+            para gráficos com cores chapadas).
+        quality (int, optional): qualidade (0-100); no modo lossless controla
+            o esforço de compressão.
+        method (int, optional): esforço do codificador (0 = rápido, 6 = menor arquivo).
+        loop (int, optional): número de repetições (0 = infinito).
+
+    Returns:
+        int: número de frames efetivamente gravados.
+
+    Raises:
+        RuntimeError: Pillow sem suporte a WebP.
+    """
+    from PIL import features
+
+    if not features.check("webp"):
+        raise RuntimeError("Saída WebP requer Pillow com suporte a WebP (libwebp).")
+
+    images, kept_durations = [], []
+    previous = None
+    for frame, duration in zip(frames, durations):
+        image = Image.fromarray(frame)
+        if palette is not None:
+            image = image.quantize(palette=palette, dither=Image.Dither.NONE)
+        current = np.asarray(image)
+        if previous is not None and np.array_equal(current, previous):
+            kept_durations[-1] += duration
+            continue
+        images.append(image)
+        kept_durations.append(duration)
+        previous = current
+
+    if not images:
+        raise ValueError("Nenhum frame para gravar.")
+    images[0].save(output_file, format="WEBP", save_all=True, append_images=images[1:],
+                   duration=[round(d) for d in kept_durations], loop=loop, lossless=lossless,
+                   quality=quality, method=method)
+    return len(images)
+
+
+def write_mp4(frames, output_file, durations, fps):
+    """
+    Grava um vídeo MP4 (H.264) com o plugin ffmpeg do imageio.
+
+    O vídeo tem taxa de quadros constante, então frames com duração maior
+    (como a pausa final) são repetidos; o codificador comprime as repetições
+    como quadros de diferença praticamente vazios.
+
+    Requer o extra opcional `imageio[ffmpeg]` (pacote imageio-ffmpeg).
+
+    Args:
+        frames (iterable): arrays RGB (altura x largura x 3), na ordem.
+        output_file (str): caminho do arquivo .mp4.
+        durations (iterable): duração de cada frame, em milissegundos.
+        fps (float): quadros por segundo do vídeo.
+
+    Returns:
+        int: número de quadros gravados.
+    """
+    try:
+        import imageio_ffmpeg  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "Saída MP4 requer o plugin ffmpeg do imageio: pip install 'imageio[ffmpeg]'"
+        ) from e
+    import imageio
+
+    frame_ms = 1000 / fps
+    written = 0
+    with imageio.get_writer(output_file, format="FFMPEG", mode="I", fps=fps,
+                            codec="libx264", pixelformat="yuv420p",
+                            macro_block_size=2, ffmpeg_log_level="error") as writer:
+        for frame, duration in zip(frames, durations):
+            for _ in range(max(1, int(round(duration / frame_ms)))):
+                writer.append_data(frame)
+                written += 1
+    return written
+
+
+# Extensão do arquivo -> formato da animação.
+FORMATS = {
+    ".gif": "gif",
+    ".webp": "webp",
+    # Só .apng: .png é a saída estática de plot (e um PNG sem animação).
+    ".apng": "apng",
+    ".mp4": "mp4",
+}
+
+
+def animation_format(output_file):
+    """
+    Descobre o formato da animação pela extensão do arquivo.
+
+    Raises:
+        ValueError: se a extensão não for suportada.
+    """
+    ext = os.path.splitext(output_file)[1].lower()
+    if ext not in FORMATS:
+        supported = ", ".join(sorted(FORMATS))
+        raise ValueError(f"Formato de animação não suportado: '{ext}' (use {supported}).")
+    return FORMATS[ext]
+
+
+def write_animation(frames, output_file, durations, fps, palette_frames):
+    """
+    Grava a animação no formato indicado pela extensão de `output_file`.
+
+    A escrita é atômica: o arquivo é gravado num temporário ao lado e só
+    substitui `output_file` quando está completo.
+
+    Args:
+        frames (iterable): arrays RGB (altura x largura x 3), na ordem.
+        output_file (str): caminho de saída (.gif, .webp, .apng ou .mp4).
+        durations (list): duração de cada frame, em milissegundos.
+        fps (float): quadros por segundo (usado pelo MP4).
+        palette_frames (list): frames representativos para a paleta global
+            (usada por GIF, APNG e WebP).
+
+    Returns:
+        int: número de frames (ou quadros, no MP4) gravados.
+    """
+    fmt = animation_format(output_file)
+    with atomic_path(output_file) as tmp:
+        if fmt == "gif":
+            return write_gif(frames, tmp, durations, global_palette(palette_frames))
+        if fmt == "apng":
+            return write_apng(frames, tmp, durations, global_palette(palette_frames))
+        if fmt == "webp":
+            return write_webp(frames, tmp, durations, global_palette(palette_frames))
+        return write_mp4(frames, tmp, durations, fps)
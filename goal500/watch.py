@@ -0,0 +1,221 @@
+"""
+Modo watch (`goal500 watch`): reconstrói as saídas quando o CSV muda.
+
+A cada mudança no arquivo de entrada os dados são relidos e comparados com a
+leitura anterior por jogador, por meio de um hash das somas de gols de cada
+jogador. Há dois níveis de comparação:
+
+- site: somas por (ano, tipo). Só as entradas dos jogadores alterados são
+  recalculadas (goal500.site.player_entries); o resto do JSON é remontado a
+  partir das entradas guardadas;
+- gráficos: somas por ano (o que os gráficos mostram). Uma correção que só
+  troca gols entre clube e seleção no mesmo ano não redesenha nada. Os dados
+  preparados (calculate_cumulative_goals) também são guardados por jogador,
+  e no diretório de gráficos individuais só os dos jogadores afetados são
+  redesenhados.
+
+O gráfico combinado e a animação mostram todos os jogadores, então são
+refeitos sempre que algum jogador muda nos gráficos.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from goal500.site import _site_data_from_entries, _write_site, player_entries
+from goal500.utils.data_processing import calculate_cumulative_goals, clean_data
+
+# Saídas que podem ser mantidas atualizadas.
+STAGES = ("site", "plot", "charts", "animate")
+
+
+def player_hashes(clean, keys=("year", "type")):
+    """
+    Hash por jogador das somas de gols agrupadas por `keys`.
+
+    Dois carregamentos com o mesmo hash para um jogador têm as mesmas somas
+    (a menos de colisões de 64 bits), independentemente da ordem das linhas no
+    CSV ou de como os gols de uma temporada estão repartidos em linhas.
+
+    Args:
+        clean (pd.DataFrame): DataFrame já passado por clean_data.
+        keys (tuple, optional): colunas, além do nome, que definem cada soma.
+
+    Returns:
+        dict: nome -> hash (int).
+    """
+    if clean.empty:
+        return {}
+    keys = list(keys)
+    # Tipos fixos: uma linha inválida que vire o ano em float não muda todos os hashes.
+    normalized = clean.assign(year=clean["year"].astype(np.int64),
+                              total=clean["total"].astype(np.float64))
+    grouped = normalized.groupby(["name", *keys])["total"].sum().reset_index()
+    rows = pd.util.hash_pandas_object(grouped[[*keys, "total"]], index=False).to_numpy()
+    names = grouped["name"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+    # Soma com estouro (módulo 2**64): a ordem das linhas não importa.
+    sums = np.add.reduceat(rows, starts)
+    return dict(zip(names[starts].tolist(), sums.tolist()))
+
+
+def changed_players(old, new):
+    """Jogadores incluídos, removidos ou com hash diferente entre dois carregamentos."""
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+
+class Watcher:
+    """
+    Estado do modo watch: hashes e resultados por jogador da última leitura.
+
+    Args:
+        input_file (str): CSV observado.
+        stages (iterable, optional): saídas mantidas (subconjunto de STAGES).
+        site_output (str, optional): JSON de dados da página estática.
+        plot_output (str, optional): gráfico combinado.
+        charts_dir (str, optional): diretório dos gráficos individuais.
+        animation_output (str, optional): arquivo da animação.
+        fps (int, optional): frames por segundo da animação.
+        duration (int, optional): pausa em segundos no final da animação.
+    """
+
+    def __init__(self, input_file, stages=("site", "plot"), site_output="docs/data.json",
+                 plot_output="images/cumulative_goals.png", charts_dir="images/players",
+                 animation_output="images/cumulative_goals.gif", fps=2, duration=5):
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Etapas desconhecidas: {', '.join(sorted(unknown))}.")
+        self.input_file = input_file
+        self.stages = [stage for stage in STAGES if stage in set(stages)]
+        self.site_output = site_output
+        self.plot_output = plot_output
+        self.charts_dir = charts_dir
+        self.animation_output = animation_output
+        self.fps = fps
+        self.duration = duration
+
+        self._site_hashes = {}
+        self._plot_hashes = {}
+        self._entries = {}
+        self._frames = {}
+
+    def rebuild(self):
+        """
+        Relê o CSV e refaz só o que mudou desde a leitura anterior.
+
+        Na primeira chamada todos os jogadores contam como alterados.
+
+        Returns:
+            dict: {"site": jogadores recalculados, "plot": jogadores afetados
+            nos gráficos}, como conjuntos de nomes.
+        """
+        start = time.perf_counter()
+        clean = clean_data(pd.read_csv(self.input_file))
+        site_hashes = player_hashes(clean, ("year", "type"))
+        plot_hashes = player_hashes(clean, ("year",))
+        site_changed = changed_players(self._site_hashes, site_hashes)
+        plot_changed = changed_players(self._plot_hashes, plot_hashes)
+
+        done = []
+        if site_changed and "site" in self.stages:
+            self._update_site(clean, site_changed)
+            done.append(f"site ({_count(site_changed)})")
+        if plot_changed and {"plot", "charts", "animate"} & set(self.stages):
+            done.extend(self._update_charts(clean, plot_changed))
+
+        self._site_hashes, self._plot_hashes = site_hashes, plot_hashes
+        if done:
+            print(f"Atualizado em {time.perf_counter() - start:.3f} s: {', '.join(done)}")
+        else:
+            print("Nenhuma mudança nos dados.")
+        return {"site": site_changed, "plot": plot_changed}
+
+    def _update_site(self, clean, names):
+        for name in names:
+            self._entries.pop(name, None)
+        self._entries.update(player_entries(clean[clean["name"].isin(names)]))
+        _write_site(_site_data_from_entries(self._entries.values()), self.site_output)
+
+    def _update_charts(self, clean, names):
+        from goal500.visualization.plots import _animate_prepared, _plot_prepared, _slugify, plot_batch
+
+        subset = clean[clean["name"].isin(names)]
+        for name in names:
+            self._frames.pop(name, None)
+        prepared = calculate_cumulative_goals(subset)
+        if not prepared.empty:
+            self._frames.update({name: frame for name, frame in prepared.groupby("name", sort=False)})
+        # Mesma ordem (alfabética) e índice de calculate_cumulative_goals sobre todos os dados.
+        plot_data = (pd.concat([self._frames[name] for name in sorted(self._frames)], ignore_index=True)
+                     if self._frames else prepared)
+
+        done = []
+        if plot_data.empty:
+            # Sem jogadores: gráfico e animação antigos mostrariam os removidos.
+            for stage, path, label in (("plot", self.plot_output, "gráfico removido"),
+                                       ("animate", self.animation_output, "animação removida")):
+                if stage in self.stages and os.path.exists(path):
+                    os.remove(path)
+                    done.append(label)
+        if "plot" in self.stages and not plot_data.empty:
+            os.makedirs(os.path.dirname(self.plot_output) or ".", exist_ok=True)
+            _plot_prepared(plot_data, self.plot_output)
+            done.append("gráfico")
+        if "charts" in self.stages:
+            if not subset.empty:
+                plot_batch(subset, self.charts_dir, workers=1)
+            for name in names - set(self._frames):
+                path = os.path.join(self.charts_dir, f"{_slugify(name)}.png")
+                if os.path.exists(path):
+                    os.remove(path)
+            done.append(f"gráficos individuais ({_count(names)})")
+        if "animate" in self.stages and not plot_data.empty:
+            os.makedirs(os.path.dirname(self.animation_output) or ".", exist_ok=True)
+            _animate_prepared(plot_data, self.animation_output, self.fps, self.duration)
+            done.append("animação")
+        return done
+
+
+def _count(names):
+    return f"{len(names)} jogador{'es' if len(names) != 1 else ''}"
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch(input_file="data/player_stats.csv", stages=("site", "plot"), site_output="docs/data.json",
+          plot_output="images/cumulative_goals.png", charts_dir="images/players",
+          animation_output="images/cumulative_goals.gif", interval=0.5, fps=2, duration=5):
+    """
+    Observa o CSV e mantém as saídas atualizadas até Ctrl+C.
+
+    O arquivo é verificado (mtime e tamanho) a cada `interval` segundos. Se a
+    leitura falhar (ex.: o editor ainda está gravando), o erro é mostrado e a
+    próxima gravação dispara uma nova tentativa. Os demais argumentos são os
+    de Watcher.
+    """
+    watcher = Watcher(input_file, stages, site_output, plot_output, charts_dir,
+                      animation_output, fps, duration)
+    signature = _signature(input_file)
+    watcher.rebuild()
+    print(f"Observando {input_file} (Ctrl+C para sair)...")
+    try:
+        while True:
+            time.sleep(interval)
+            try:
+                current = _signature(input_file)
+            except FileNotFoundError:
+                continue
+            if current == signature:
+                continue
+            signature = current
+            try:
+                watcher.rebuild()
+            except (ValueError, KeyError, pd.errors.ParserError) as exc:
+                print(f"Erro ao ler {input_file}: {exc}")
+    except KeyboardInterrupt:
+        print("\nEncerrando o modo watch.")